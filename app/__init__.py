@@ -1,6 +1,8 @@
-from flask import Flask
-
 def create_app():
+    # Flask загружается только при создании веб-приложения: пакет app
+    # импортируется и рабочими процессами решателей (app.algorithms, app.exact)
+    from flask import Flask
+
     app = Flask(__name__)
     from app.routes import main as main_blueprint
     app.register_blueprint(main_blueprint)
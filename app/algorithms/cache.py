@@ -0,0 +1,52 @@
+import hashlib
+from array import array
+from collections import OrderedDict, namedtuple
+from typing import Callable, Iterable, Optional
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def chromosome_key(indices: Iterable[int]) -> bytes:
+    """
+    Компактный ключ хромосомы: 16-байтовый BLAKE2b-хеш упакованной
+    последовательности индексов вершин.
+    """
+    return hashlib.blake2b(array("l", indices).tobytes(), digest_size=16).digest()
+
+
+class FitnessCache:
+    """
+    Кэш значений целевой функции с вытеснением давно не использованных (LRU).
+
+    Args:
+        maxsize: Максимальное число хранимых значений (None — без ограничения)
+    """
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get_or_compute(self, key: bytes, compute: Callable[[], float]) -> float:
+        """Возвращает значение по ключу, вычисляя его при промахе."""
+        data = self._data
+        value = data.get(key)
+        if value is not None:
+            self.hits += 1
+            data.move_to_end(key)
+            return value
+        self.misses += 1
+        value = compute()
+        data[key] = value
+        if self.maxsize is not None and len(data) > self.maxsize:
+            data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+from array import array
+from typing import TYPE_CHECKING, Dict, Hashable, List, Sequence, Tuple
+
+# networkx и numpy загружаются при первом использовании: модуль входит
+# в путь импорта рабочих процессов решателей
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+class CompactGraph:
+    """
+    Компактное представление графа для алгоритмов раскраски.
+
+    Вершины перенумерованы целыми числами 0..n-1 (в порядке graph.nodes),
+    смежность хранится в формате CSR:
+    - indptr[i]..indptr[i + 1] — границы списка соседей вершины i
+    - indices — конкатенация списков соседей всех вершин
+
+    Петли отбрасываются: они не влияют на последовательную раскраску.
+    Массивы CSR компактно сериализуются (pickle), поэтому граф можно один раз
+    передать в рабочие процессы. Списки смежности для быстрых обходов на Python
+    строятся лениво и в сериализацию не попадают.
+    """
+    __slots__ = ("nodes", "index", "indptr", "indices", "_adj")
+
+    def __init__(self, nodes: Sequence[Hashable], indptr: array, indices: array):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self._adj = None
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "CompactGraph":
+        """
+        Строит компактное представление по графу NetworkX.
+
+        Если вершины — целые 0..n-1 в порядке graph.nodes, списки соседей
+        копируются без перенумерации. Списки смежности строятся попутно и
+        сохраняются в adj.
+        """
+        nodes = list(graph.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        relabel = not all(type(node) is int and node == i for i, node in enumerate(nodes))
+        indptr = array("l", [0])
+        indices = array("l")
+        adj = []
+        for i, (node, neighbors) in enumerate(graph.adj.items()):
+            row = list(map(index.__getitem__, neighbors)) if relabel else list(neighbors)
+            if node in neighbors:
+                row.remove(i)
+            adj.append(row)
+            indices.extend(row)
+            indptr.append(len(indices))
+        compact = cls(nodes, indptr, indices)
+        compact._adj = adj
+        return compact
+
+    def __getstate__(self) -> Tuple[List[Hashable], array, array]:
+        return self.nodes, self.indptr, self.indices
+
+    def __setstate__(self, state: Tuple[List[Hashable], array, array]) -> None:
+        self.__init__(*state)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def adj(self) -> List[List[int]]:
+        """Списки смежности (индексы соседей) для каждой вершины."""
+        if self._adj is None:
+            indptr, indices = self.indptr, self.indices
+            self._adj = [indices[indptr[i]:indptr[i + 1]].tolist() for i in range(len(self.nodes))]
+        return self._adj
+
+    def degree(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def to_networkx(self) -> nx.Graph:
+        """Строит граф NetworkX с исходными метками вершин."""
+        import networkx as nx
+
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        nodes, indptr, indices = self.nodes, self.indptr, self.indices
+        graph.add_edges_from((nodes[i], nodes[j])
+                             for i in range(len(nodes))
+                             for j in indices[indptr[i]:indptr[i + 1]] if i < j)
+        return graph
+
+    def to_labels(self, colors: Sequence[int]) -> Dict[Hashable, int]:
+        """Переводит раскраску по индексам вершин в словарь (вершина: цвет)."""
+        return {node: colors[i] for i, node in enumerate(self.nodes)}
+
+
+def canonical_nodes(graph: nx.Graph) -> List[Hashable]:
+    """Вершины графа в каноническом порядке (по типу и значению метки)."""
+    return sorted(graph.nodes, key=lambda node: (type(node).__name__, node))
+
+
+def graph_fingerprint(graph: nx.Graph) -> str:
+    """
+    Отпечаток графа: SHA-256 от меток вершин в каноническом порядке
+    и отсортированного списка ребер (пар канонических индексов).
+
+    Отпечаток не зависит от порядка добавления вершин и ребер, поэтому
+    одинаковые графы (в том числе сгенерированные с одним зерном) дают
+    одинаковый отпечаток.
+    """
+    import numpy as np
+
+    nodes = canonical_nodes(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    n = max(len(nodes), 1)
+    keys = np.fromiter((min(index[u], index[v]) * n + max(index[u], index[v])
+                        for u, v in graph.edges if u != v),
+                       dtype=np.int64, count=-1)
+    digest = hashlib.sha256(repr(nodes).encode("utf-8"))
+    digest.update(np.unique(keys).tobytes())
+    return digest.hexdigest()
@@ -1,18 +1,36 @@
+from __future__ import annotations
+
+import logging
 import random
-import networkx as nx
-from typing import List, Dict, Tuple
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, NamedTuple, Optional, Tuple
+
+from app import metrics
+from app.algorithms.cache import CacheInfo, FitnessCache, chromosome_key
+from app.algorithms.compact import CompactGraph
+from app.algorithms.greedy import GREEDY_RESTARTS, best_greedy
+from app.exact import clique_lower_bound
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+logger = logging.getLogger(__name__)
 
+# Меметический шаг genetic_coloring по умолчанию: бюджет ходов TabuCol и период в поколениях
+LOCAL_SEARCH_ITERATIONS = 500
+LOCAL_SEARCH_INTERVAL = 10
 
 Chromosome = List[int]
 Population = List[Chromosome]
 
 
-def exact_coloring(graph: nx.Graph) -> Dict[int, int]:
-    """
-    Реализация точного алгоритма раскраски графа с использованием жадного алгоритма.
-    """
-    coloring = nx.greedy_color(graph, strategy='largest_first')
-    return coloring
+class Progress(NamedTuple):
+    """Состояние поиска после очередного поколения (0 — начальная популяция)."""
+    generation: int
+    best_colors: int
+    best_fitness: float
+    mean_fitness: float
+    elapsed: float
 
 
 class GeneticAlgorithm:
@@ -35,13 +53,81 @@ class GeneticAlgorithm:
     Целевая функция:
     - Отношение количества использованных цветов к количеству вершин графа
     - Задача алгоритма - минимизация целевой функции
+
+    Граф один раз компилируется в CompactGraph (целочисленные вершины, CSR),
+    поэтому декодирование хромосомы выполняется за O(n + m).
+
+    Значения целевой функции кэшируются (LRU) по хешу хромосомы. За поколение
+    в кэш попадает до двух ключей на потомка (после кроссинговера и после
+    мутации) и особь меметического шага; ёмкость по умолчанию рассчитана
+    на все такие ключи, поэтому каждая различная перестановка декодируется
+    не более одного раза за запуск.
+
+    Случайность берется из собственного генератора (seed), поэтому запуск
+    воспроизводим. Готовый CompactGraph можно передать через compact — тогда
+    граф NetworkX не нужен: начальная популяция строится по лучшей из жадных
+    раскрасок (app.algorithms.greedy.best_greedy) компактного графа.
+
+    Известную раскраску (например, из кэша решений) можно передать через
+    initial_coloring: она заменяет жадную раскраску при построении начальной
+    популяции. Словарь может покрывать и больше вершин, чем граф (раскраска
+    всего графа при решении отдельной компоненты).
+
+    Критерии остановки: generations — предельное число поколений;
+    lower_bound — поиск завершается, как только число цветов лучшего решения
+    не больше нижней оценки (размер клики, результат точного алгоритма);
+    patience — число поколений без улучшения; time_limit — лимит времени
+    в секундах. Причина остановки сохраняется в stop_reason.
+
+    Режим эволюции mode:
+    - "generational" — каждое поколение полностью заменяет популяцию (evolve)
+    - "steady_state" — за поколение создается offspring потомков, которые
+      вытесняют худших особей; лучшая особь не теряется (элитизм), значения
+      целевой функции хранятся вместе с особями и не пересчитываются
+
+    Меметический шаг: при local_search_iterations > 0 лучшая раскраска каждые
+    local_search_interval поколений улучшается локальным поиском TabuCol
+    (уменьшение числа цветов от текущего), и результат замещает худшую особь.
+
+    Показатели (app.metrics): счетчики genetic.generations, genetic.decoded
+    (декодированные хромосомы), genetic.cache_hits и таймеры этапов
+    genetic.initial_population, genetic.evolution, genetic.local_search.
     """
-    def __init__(self, graph: nx.Graph, population_size: int, generations: int):
+    def __init__(self, graph: Optional[nx.Graph], population_size: int, generations: int,
+                 cache_size: Optional[int] = None, seed: Optional[int] = None,
+                 compact: Optional[CompactGraph] = None,
+                 initial_coloring: Optional[Dict[int, int]] = None,
+                 lower_bound: Optional[int] = None, patience: Optional[int] = None,
+                 time_limit: Optional[float] = None, mode: str = "generational",
+                 offspring: Optional[int] = None, local_search_iterations: int = 0,
+                 local_search_interval: int = 10):
+        if mode not in ("generational", "steady_state"):
+            raise ValueError(f"Неизвестный режим эволюции: {mode}")
         self.graph = graph
+        self.mode = mode
+        self.offspring = offspring if offspring is not None else max(1, population_size // 2)
+        self.initial_coloring = initial_coloring
+        self.lower_bound = lower_bound
+        self.patience = patience
+        self.time_limit = time_limit
+        self.best_solution: Optional[Chromosome] = None
+        self.stop_reason: Optional[str] = None
         self.population_size = population_size
         self.generations = generations
-        self.nodes = list(graph.nodes)
+        self.random = random.Random(seed)
+        self.compact = compact if compact is not None else CompactGraph.from_networkx(graph)
+        self.nodes = self.compact.nodes
         self.num_nodes = len(self.nodes)
+        if cache_size is None:
+            children = population_size if mode == "generational" else self.offspring
+            cache_size = population_size + (2 * children + 1) * generations
+        self.cache = FitnessCache(cache_size)
+        self.local_search_iterations = local_search_iterations
+        self.local_search_interval = max(1, local_search_interval)
+        self.local_search = None
+        if local_search_iterations > 0 and self.num_nodes >= 2:
+            from app.algorithms.tabucol import TabuCol
+            self.local_search = TabuCol(self.compact, seed=self.random.randrange(2 ** 32))
     
     def initial_population(self) -> Population:
                 # """Создает начальную популяцию (дробовик)."""
@@ -49,10 +135,15 @@ class GeneticAlgorithm:
         """Создает начальную популяцию на основе жадного алгоритма."""
         population = []
         
-        # Создаем первую хромосому с помощью жадного алгоритма
-        coloring = exact_coloring(self.graph)
+        # Создаем первую хромосому с помощью жадного алгоритма (или известной раскраски)
+        coloring = self.initial_coloring
+        if coloring is None:
+            colors, _ = best_greedy(self.compact.adj, restarts=GREEDY_RESTARTS,
+                                    seed=self.random.randrange(2 ** 32))
+            # Жадная раскраска строится один раз (популяции островов используют ее повторно)
+            coloring = self.initial_coloring = self.compact.to_labels(colors)
         # Сортируем узлы по их цветам
-        sorted_nodes = sorted(self.nodes, key=lambda node: coloring[node])
+        sorted_nodes = self.chromosome_from_coloring(coloring)
         population.append(sorted_nodes)
         
         # Создаем вариации начальной популяции
@@ -60,12 +151,38 @@ class GeneticAlgorithm:
             # Комбинируем жадное решение со случайными перестановками
             new_chromosome = sorted_nodes.copy()
             # Вносим случайное возмущение
-            idx1, idx2 = random.sample(range(self.num_nodes), 2)
+            idx1, idx2 = self.random.sample(range(self.num_nodes), 2)
             new_chromosome[idx1], new_chromosome[idx2] = new_chromosome[idx2], new_chromosome[idx1]
             population.append(new_chromosome)
             
         return population
     
+    def chromosome_from_coloring(self, coloring: Dict[int, int]) -> Chromosome:
+        """
+        Хромосома, декодируемая не более чем в столько же цветов, сколько
+        в раскраске: вершины упорядочены по цветам.
+        """
+        return sorted(self.nodes, key=lambda node: coloring[node])
+
+    def memetic_step(self, chromosome: Chromosome) -> Optional[Chromosome]:
+        """
+        Улучшает декодированную раскраску хромосомы локальным поиском TabuCol.
+
+        Returns:
+            Хромосома с меньшим числом цветов или None, если улучшить не удалось
+        """
+        coloring = self.decode_chromosome(chromosome)
+        colors = [coloring[node] for node in self.nodes]
+        used = max(colors) + 1
+        lower_bound = self.lower_bound or 1
+        if used <= lower_bound:
+            return None
+        with metrics.phase("genetic.local_search"):
+            improved = self.local_search.minimize(colors, lower_bound, self.local_search_iterations)
+        if max(improved) + 1 >= used:
+            return None
+        return self.chromosome_from_coloring(self.compact.to_labels(improved))
+
     def decode_chromosome(self, chromosome: Chromosome) -> Dict[int, int]:
         """
         Декодирует хромосому в раскраску графа.
@@ -80,16 +197,33 @@ class GeneticAlgorithm:
             Словарь с раскраской графа (вершина: цвет)
         """
         color_assignment = {}
+        index = self.compact.index
+        adj = self.compact.adj
+        # marks[i] == current_color <=> вершина i смежна с текущим цветовым классом
+        marks = [-1] * self.num_nodes
         current_color = 0
         for node in chromosome:
-            if all(not self.graph.has_edge(node, colored_node)
-                   or color_assignment[colored_node] != current_color
-                   for colored_node in color_assignment):
-                color_assignment[node] = current_color
-            else:
+            i = index[node]
+            if marks[i] == current_color:
                 current_color += 1
-                color_assignment[node] = current_color
+            color_assignment[node] = current_color
+            for j in adj[i]:
+                marks[j] = current_color
         return color_assignment
+
+    def count_colors(self, chromosome: Chromosome) -> int:
+        """Число цветов в декодированной хромосоме (без построения словаря)."""
+        index = self.compact.index
+        adj = self.compact.adj
+        marks = [-1] * self.num_nodes
+        current_color = 0
+        for node in chromosome:
+            i = index[node]
+            if marks[i] == current_color:
+                current_color += 1
+            for j in adj[i]:
+                marks[j] = current_color
+        return current_color + 1 if chromosome else 0
     
     def fitness(self, chromosome: Chromosome) -> float:
         """
@@ -101,26 +235,39 @@ class GeneticAlgorithm:
         Returns:
             Значение целевой функции (число цветов / число вершин)
         """
-        colors = self.decode_chromosome(chromosome)
-        num_colors = len(set(colors.values()))
-        return num_colors / self.num_nodes
+        index = self.compact.index
+        key = chromosome_key(index[node] for node in chromosome)
+        return self.cache.get_or_compute(
+            key, lambda: self.count_colors(chromosome) / self.num_nodes)
+
+    def cache_info(self) -> CacheInfo:
+        """Статистика кэша целевой функции (попадания, промахи, размер)."""
+        return self.cache.info()
     
     def selection(self, population: Population) -> Tuple[Chromosome, Chromosome]:
         """Турнирная селекция с размером турнира 2."""
-        participants = random.sample(population, 4)
+        participants = self.random.sample(population, 4)
         participants.sort(key=self.fitness)
         return participants[0], participants[1]
     
     def crossover(self, parent1: Chromosome, parent2: Chromosome) -> Chromosome:
-        """Упорядоченный кроссинговер."""
-        point = random.randint(1, self.num_nodes - 2)
-        child = parent1[:point] + [node for node in parent2 if node not in parent1[:point]]
-        return child
+        """
+        Упорядоченный кроссинговер за O(n): вершины головы первого родителя
+        отмечаются в битовой карте позиций, остальные берутся из второго
+        родителя в его порядке.
+        """
+        point = self.random.randint(1, self.num_nodes - 2)
+        index = self.compact.index
+        taken = bytearray(self.num_nodes)
+        head = parent1[:point]
+        for node in head:
+            taken[index[node]] = 1
+        return head + [node for node in parent2 if not taken[index[node]]]
     
     def mutate(self, chromosome: Chromosome, mutation_rate: float = 0.05) -> Chromosome:
         """Оператор мутации, аналогичный модели Де Фриза (мутация с глобальным изменением)."""
-        if random.random() < mutation_rate:
-            idx1, idx2 = random.sample(range(self.num_nodes), 2)
+        if self.random.random() < mutation_rate:
+            idx1, idx2 = self.random.sample(range(self.num_nodes), 2)
             chromosome[idx1], chromosome[idx2] = chromosome[idx2], chromosome[idx1]
         return chromosome
     
@@ -142,35 +289,136 @@ class GeneticAlgorithm:
             new_population.append(child)
         
         return new_population
+
+    def evolve_steady(self, population: Population,
+                      fitnesses: List[float]) -> Tuple[Population, List[float]]:
+        """
+        Шаг стационарной (steady-state) эволюции с элитизмом.
+
+        Родители выбираются турниром по сохраненным значениям целевой функции,
+        offspring потомков оцениваются один раз (повторная оценка после мутации
+        берется из кэша, если мутации не было) и вытесняют худших особей;
+        при равных значениях предпочтение отдается потомку.
+
+        Returns:
+            Новая популяция и значения целевой функции ее особей
+        """
+        best_fitness = min(fitnesses)
+        children, child_fitnesses = [], []
+        for _ in range(self.offspring):
+            tournament = sorted(self.random.sample(range(len(population)), 4),
+                                key=fitnesses.__getitem__)
+            child = self.crossover(population[tournament[0]], population[tournament[1]])
+            # Де Фриз при отсутствии улучшения, иначе Дарвин
+            rate = 0.2 if self.fitness(child) >= best_fitness else 0.05
+            child = self.mutate(child, mutation_rate=rate)
+            children.append(child)
+            child_fitnesses.append(self.fitness(child))
+
+        candidates = children + population
+        candidate_fitnesses = child_fitnesses + fitnesses
+        survivors = sorted(range(len(candidates)),
+                           key=candidate_fitnesses.__getitem__)[:len(population)]
+        return ([candidates[i] for i in survivors],
+                [candidate_fitnesses[i] for i in survivors])
+
+    def step(self, population: Population,
+             fitnesses: List[float]) -> Tuple[Population, List[float]]:
+        """Одно поколение в выбранном режиме; возвращает популяцию и ее оценки."""
+        if self.mode == "steady_state":
+            return self.evolve_steady(population, fitnesses)
+        population = self.evolve(population)
+        return population, [self.fitness(chromosome) for chromosome in population]
     
-    def solve(self) -> Dict[int, int]:
+    def stop_reason_for(self, generation: int, best_colors: int, stagnant: int,
+                        elapsed: float) -> Optional[str]:
+        """Проверяет критерии остановки; возвращает причину или None."""
+        if self.lower_bound is not None and best_colors <= self.lower_bound:
+            return "lower_bound"
+        if generation >= self.generations:
+            return "generations"
+        if self.patience is not None and stagnant >= self.patience:
+            return "stagnation"
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return "time_limit"
+        return None
+
+    def run(self) -> Iterator[Progress]:
+        """
+        Запускает эволюцию в виде генератора.
+
+        После начальной популяции и после каждого поколения выдает Progress
+        (лучшее число цветов, лучшее и среднее значение целевой функции).
+        Лучшая хромосома доступна в best_solution на любом шаге, поэтому
+        вызывающий код может прервать поиск, просто перестав итерировать.
+        """
+        start = time.perf_counter()
+        with metrics.phase("genetic.initial_population"):
+            population = self.initial_population()
+            fitnesses = [self.fitness(chromosome) for chromosome in population]
+        best = min(range(len(population)), key=fitnesses.__getitem__)
+        self.best_solution, best_fitness = population[best], fitnesses[best]
+        generation = stagnant = 0
+        self.stop_reason = None
+
+        while True:
+            if self.local_search is not None and generation % self.local_search_interval == 0:
+                improved = self.memetic_step(self.best_solution)
+                if improved is not None:
+                    worst = max(range(len(population)), key=fitnesses.__getitem__)
+                    population[worst], fitnesses[worst] = improved, self.fitness(improved)
+                    if fitnesses[worst] < best_fitness:
+                        self.best_solution, best_fitness = improved, fitnesses[worst]
+                        stagnant = 0
+            best_colors = round(best_fitness * self.num_nodes)
+            elapsed = time.perf_counter() - start
+            yield Progress(generation, best_colors, best_fitness,
+                           sum(fitnesses) / len(fitnesses), elapsed)
+            self.stop_reason = self.stop_reason_for(generation, best_colors, stagnant, elapsed)
+            if self.stop_reason is not None:
+                return
+
+            with metrics.phase("genetic.evolution"):
+                population, fitnesses = self.step(population, fitnesses)
+            generation += 1
+            metrics.count("genetic.generations")
+            current = min(range(len(population)), key=fitnesses.__getitem__)
+            if fitnesses[current] < best_fitness:
+                self.best_solution, best_fitness = population[current], fitnesses[current]
+                stagnant = 0
+            else:
+                stagnant += 1
+
+    def solve(self, progress: Optional[Callable[[Progress], Optional[bool]]] = None) -> Dict[int, int]:
         """
         Основной метод для запуска генетического алгоритма.
         
         Алгоритм:
         1. Создание начальной популяции
         2. Поиск лучшего решения в текущей популяции
-        3. Эволюция популяции через указанное число поколений:
+        3. Эволюция популяции до срабатывания критерия остановки:
            - Отбор родителей (турнирная селекция)
            - Кроссинговер (создание потомков)
            - Мутация (внесение случайных изменений)
            - Отбор лучших особей для следующего поколения
         4. Возврат лучшего найденного решения
         
+        Args:
+            progress: Функция, вызываемая с Progress после каждого поколения;
+                если она вернет False, поиск прерывается
+
         Returns:
             Словарь с оптимальной раскраской графа (вершина: цвет)
         """
-        population = self.initial_population()
-        best_solution = min(population, key=self.fitness)
-        
-        for _ in range(self.generations):
-            population = self.evolve(population)
-            current_best = min(population, key=self.fitness)
-            
-            if self.fitness(current_best) < self.fitness(best_solution):
-                best_solution = current_best
-        
-        return self.decode_chromosome(best_solution)
+        hits, misses = self.cache.hits, self.cache.misses
+        for state in self.run():
+            if progress is not None and progress(state) is False:
+                self.stop_reason = "cancelled"
+                break
+        # Каждый промах кэша — одно декодирование хромосомы
+        metrics.count("genetic.decoded", self.cache.misses - misses)
+        metrics.count("genetic.cache_hits", self.cache.hits - hits)
+        return self.decode_chromosome(self.best_solution)
 
 
 # Основная точка входа
@@ -187,7 +435,24 @@ def genetic_coloring(graph: nx.Graph, params: Dict) -> Dict[int, int]:
     
     Args:
         graph: Граф NetworkX для раскраски
-        params: Словарь с параметрами (размер популяции и число поколений)
+        params: Словарь с параметрами (размер популяции, число поколений,
+            ёмкость кэша целевой функции cache_size, движок engine:
+            "python" — поштучная обработка хромосом, "numpy" — пакетная
+            обработка популяции в VectorizedGeneticAlgorithm; зерно seed;
+            число островов islands > 1 включает островную модель на пуле
+            процессов, см. island_coloring; известная раскраска
+            initial_coloring для начальной популяции; критерии остановки
+            lower_bound (по умолчанию — размер найденной клики), patience,
+            time_limit; режим эволюции mode и число потомков offspring
+            для режима "steady_state" (движок python); бюджет ходов
+            меметического шага TabuCol local_search_iterations (0 — без
+            локального поиска) и его период local_search_interval;
+            функция progress, получающая Progress после каждого
+            поколения)
+    
+    Статистика кэша целевой функции передается счетчиками genetic.cache_hits
+    и genetic.decoded (app.metrics, возвращаются run_solver) и в журнал
+    (уровень DEBUG).
     
     Returns:
         Словарь (вершина: цвет) с оптимальной раскраской графа
@@ -196,11 +461,46 @@ def genetic_coloring(graph: nx.Graph, params: Dict) -> Dict[int, int]:
         RuntimeError: При возникновении ошибок в процессе работы алгоритма
     """
     try:
-        ga = GeneticAlgorithm(
-            graph=graph,
-            population_size=params.get("population_size", 50),
-            generations=params.get("generations", 100)
-        )
-        return ga.solve()
+        if "lower_bound" not in params:
+            params = {**params, "lower_bound": clique_lower_bound(graph)}
+        if params.get("islands", 1) > 1:
+            from app.algorithms.islands import island_coloring
+            return island_coloring(graph, params)
+        options = {
+            "lower_bound": params["lower_bound"],
+            "patience": params.get("patience"),
+            "time_limit": params.get("time_limit"),
+            "local_search_iterations": params.get("local_search_iterations", LOCAL_SEARCH_ITERATIONS),
+            "local_search_interval": params.get("local_search_interval", LOCAL_SEARCH_INTERVAL),
+        }
+        engine = params.get("engine", "python")
+        if engine == "numpy":
+            from app.algorithms.vectorized import VectorizedGeneticAlgorithm
+            ga = VectorizedGeneticAlgorithm(
+                graph=graph,
+                population_size=params.get("population_size", 50),
+                generations=params.get("generations", 100),
+                seed=params.get("seed"),
+                initial_coloring=params.get("initial_coloring"),
+                **options
+            )
+        elif engine == "python":
+            ga = GeneticAlgorithm(
+                graph=graph,
+                population_size=params.get("population_size", 50),
+                generations=params.get("generations", 100),
+                cache_size=params.get("cache_size"),
+                seed=params.get("seed"),
+                initial_coloring=params.get("initial_coloring"),
+                mode=params.get("mode", "generational"),
+                offspring=params.get("offspring"),
+                **options
+            )
+        else:
+            raise ValueError(f"Неизвестный движок: {engine}")
+        coloring = ga.solve(params.get("progress"))
+        logger.debug("Генетический алгоритм остановлен (%s), кэш целевой функции: %s",
+                     ga.stop_reason, ga.cache_info())
+        return coloring
     except Exception as e:
         raise RuntimeError(f"Ошибка при выполнении генетического алгоритма: {e}")
@@ -0,0 +1,293 @@
+import heapq
+import random
+import time
+from itertools import chain
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app import metrics
+
+# Стратегии последовательной раскраски (см. best_greedy)
+STRATEGIES = ("largest_first", "smallest_last", "dsatur", "rlf")
+# Стратегии по умолчанию: first_fit за O(n + m); DSATUR (O((n + m) log n)
+# на куче Python) и RLF включаются явно
+DEFAULT_STRATEGIES = ("largest_first", "smallest_last")
+# RLF квадратичен по числу вершин: на больших графах best_greedy его пропускает
+RLF_MAX_NODES = 2000
+# Число случайных перезапусков начальной раскраски метаэвристик
+GREEDY_RESTARTS = 20
+
+
+def first_fit(adj: Sequence[Sequence[int]], order: Iterable[int]) -> List[int]:
+    """
+    Последовательная раскраска: вершины в порядке order получают
+    наименьший цвет, не занятый соседями, за O(n + m).
+
+    Args:
+        adj: Списки смежности (по индексам вершин)
+        order: Порядок обхода всех вершин
+
+    Returns:
+        Цвет каждой вершины (по индексам)
+    """
+    n = len(adj)
+    colors = [-1] * n
+    # marks[c] == v <=> цвет c занят соседом вершины v
+    marks = [-1] * (n + 1)
+    for v in order:
+        for u in adj[v]:
+            color = colors[u]
+            if color >= 0:
+                marks[color] = v
+        color = 0
+        while marks[color] == v:
+            color += 1
+        colors[v] = color
+    return colors
+
+
+def largest_first_order(adj: Sequence[Sequence[int]]) -> List[int]:
+    """Вершины по убыванию степени."""
+    return sorted(range(len(adj)), key=lambda v: len(adj[v]), reverse=True)
+
+
+def smallest_last_order(adj: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Порядок вырожденности (smallest last): вершина наименьшей степени
+    в оставшемся подграфе удаляется и ставится в конец порядка. Корзины
+    по степеням дают время O(n + m): при уменьшении степени вершина
+    дописывается в новую корзину, а устаревшие записи пропускаются при
+    извлечении.
+    """
+    n = len(adj)
+    degree = [len(neighbors) for neighbors in adj]
+    buckets = [[] for _ in range(max(degree, default=0) + 1)]
+    for v, d in enumerate(degree):
+        buckets[d].append(v)
+    removed = [False] * n
+    order = []
+    low = 0
+    for _ in range(n):
+        while True:
+            bucket = buckets[low]
+            while bucket:
+                v = bucket.pop()
+                # Степень только убывает, поэтому запись актуальна, если совпадает с корзиной
+                if not removed[v] and degree[v] == low:
+                    break
+            else:
+                low += 1
+                continue
+            break
+        removed[v] = True
+        order.append(v)
+        for u in adj[v]:
+            if not removed[u]:
+                d = degree[u] - 1
+                degree[u] = d
+                buckets[d].append(u)
+        # Степень соседей уменьшилась не более чем на 1
+        low = max(low - 1, 0)
+    order.reverse()
+    return order
+
+
+def dsatur(adj: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Жадная раскраска DSATUR: очередной раскрашивается вершина с наибольшим
+    числом различных цветов среди соседей (при равенстве — наибольшей
+    степени). Вершины выбираются из кучи с ленивым удалением устаревших
+    записей, время O((n + m) log n).
+
+    Returns:
+        Цвет каждой вершины (по индексам)
+    """
+    n = len(adj)
+    colors = [-1] * n
+    neighbor_colors = [set() for _ in range(n)]
+    heap = [(0, -len(adj[v]), v) for v in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        saturation, _, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -saturation != len(neighbor_colors[v]):
+            continue
+        used = neighbor_colors[v]
+        color = 0
+        while color in used:
+            color += 1
+        colors[v] = color
+        for u in adj[v]:
+            if colors[u] < 0 and color not in neighbor_colors[u]:
+                neighbor_colors[u].add(color)
+                heapq.heappush(heap, (-len(neighbor_colors[u]), -len(adj[u]), u))
+    return colors
+
+
+def rlf(adj: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Раскраска RLF (Recursive Largest First, Leighton): цветовые классы
+    строятся по одному. Первая вершина класса — с наибольшей степенью среди
+    нераскрашенных; следующие выбираются из кандидатов (нераскрашенных
+    вершин, не смежных с классом) по наибольшему числу соседей среди
+    исключенных вершин, при равенстве — по наименьшему числу соседей среди
+    кандидатов.
+
+    Множество кандидатов — булев массив NumPy, счетчики соседей обновляются
+    векторно по CSR-смежности вершин, покинувших кандидатов, а выбор
+    вершины — одна операция над массивом, поэтому время O(n^2 + k * m)
+    выполняется в основном внутри NumPy.
+
+    Returns:
+        Цвет каждой вершины (по индексам)
+    """
+    import numpy as np
+
+    n = len(adj)
+    degree = np.fromiter(map(len, adj), dtype=np.int64, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    indices = np.fromiter(chain.from_iterable(adj), dtype=np.int64, count=int(indptr[-1]))
+
+    def neighbor_counts(vertices):
+        # Число соседей из vertices у каждой вершины графа
+        starts = indptr[vertices]
+        lengths = indptr[vertices + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.bincount(indices[positions], minlength=n)
+
+    colors = np.full(n, -1, dtype=np.int64)
+    uncolored = np.ones(n, dtype=bool)
+    # Степень вершины в подграфе нераскрашенных вершин
+    uncolored_degree = degree.copy()
+    lowest = np.iinfo(np.int64).min
+    color = 0
+    while uncolored.any():
+        candidates = uncolored.copy()
+        # Соседи среди исключенных вершин и среди кандидатов
+        excluded = np.zeros(n, dtype=np.int64)
+        within = uncolored_degree.copy()
+        v = int(np.where(candidates, uncolored_degree, -1).argmax())
+        while True:
+            colors[v] = color
+            candidates[v] = uncolored[v] = False
+            neighbors = indices[indptr[v]:indptr[v + 1]]
+            uncolored_degree[neighbors] -= 1
+            within[neighbors] -= 1
+            moved = neighbors[candidates[neighbors]]
+            if len(moved):
+                candidates[moved] = False
+                counts = neighbor_counts(moved)
+                excluded += counts
+                within -= counts
+            if not candidates.any():
+                break
+            # Лексикографически: больше исключенных соседей, затем меньше соседей-кандидатов
+            score = excluded * (n + 1) - within
+            v = int(np.where(candidates, score, lowest).argmax())
+        color += 1
+    return colors.tolist()
+
+
+def _classes(colors: Sequence[int]) -> List[List[int]]:
+    classes = [[] for _ in range(max(colors, default=-1) + 1)]
+    for v, color in enumerate(colors):
+        classes[color].append(v)
+    return classes
+
+
+def iterated_greedy(adj: Sequence[Sequence[int]], colors: List[int], restarts: int,
+                    rng: random.Random, deadline: Optional[float] = None) -> List[int]:
+    """
+    Случайные перезапуски итеративной жадной раскраски (Culberson).
+
+    Каждый перезапуск упорядочивает вершины по цветовым классам текущей
+    раскраски в случайном порядке классов и раскрашивает их first_fit;
+    такая раскраска использует не больше цветов, чем исходная, поэтому
+    перезапуски только улучшают результат. Выполненные перезапуски
+    учитываются счетчиком greedy.restarts (app.metrics).
+
+    Args:
+        adj: Списки смежности
+        colors: Корректная раскраска (по индексам)
+        restarts: Число перезапусков
+        rng: Генератор случайных чисел
+        deadline: Момент (time.perf_counter), после которого перезапуски прекращаются
+
+    Returns:
+        Раскраска с числом цветов не больше исходного
+    """
+    best, best_count = colors, max(colors, default=-1) + 1
+    executed = 0
+    for _ in range(restarts):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        executed += 1
+        classes = _classes(best)
+        rng.shuffle(classes)
+        candidate = first_fit(adj, (v for members in classes for v in members))
+        count = max(candidate, default=-1) + 1
+        if count <= best_count:
+            best, best_count = candidate, count
+    metrics.count("greedy.restarts", executed)
+    return best
+
+
+def best_greedy(adj: Sequence[Sequence[int]], strategies: Sequence[str] = DEFAULT_STRATEGIES,
+                restarts: int = 0, seed: Optional[int] = None,
+                time_limit: Optional[float] = None) -> Tuple[List[int], str]:
+    """
+    Лучшая из последовательных раскрасок по нескольким стратегиям.
+
+    Стратегии: "largest_first" и "smallest_last" — first_fit в порядке
+    убывания степени и в порядке вырожденности (DEFAULT_STRATEGIES), "dsatur",
+    "rlf" (пропускается на графах больше RLF_MAX_NODES вершин, если есть
+    другие стратегии). Лучшая раскраска затем улучшается restarts случайными
+    перезапусками (iterated_greedy). При заданном time_limit первая стратегия
+    выполняется всегда, а остальные стратегии и перезапуски — пока не истек
+    бюджет. Число выполненных стратегий и перезапусков учитывается счетчиками
+    greedy.strategies и greedy.restarts (app.metrics).
+
+    Args:
+        adj: Списки смежности (по индексам вершин, например CompactGraph.adj)
+        strategies: Стратегии из STRATEGIES
+        restarts: Наибольшее число случайных перезапусков
+        seed: Зерно перезапусков
+        time_limit: Бюджет времени в секундах
+
+    Returns:
+        Лучшая раскраска (по индексам) и имя давшей ее стратегии
+        ("restarts", если ее улучшили перезапуски)
+
+    Raises:
+        ValueError: Неизвестная стратегия или пустой список стратегий
+    """
+    builders = {
+        "largest_first": lambda: first_fit(adj, largest_first_order(adj)),
+        "smallest_last": lambda: first_fit(adj, smallest_last_order(adj)),
+        "dsatur": lambda: dsatur(adj),
+        "rlf": lambda: rlf(adj),
+    }
+    if not strategies:
+        raise ValueError("Не задано ни одной стратегии")
+    unknown = [strategy for strategy in strategies if strategy not in builders]
+    if unknown:
+        raise ValueError(f"Неизвестная стратегия: {', '.join(unknown)}")
+    if len(adj) > RLF_MAX_NODES and len(strategies) > 1:
+        strategies = [strategy for strategy in strategies if strategy != "rlf"]
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    best, best_count, best_strategy = None, None, None
+    executed = 0
+    for strategy in strategies:
+        if best is not None and deadline is not None and time.perf_counter() >= deadline:
+            break
+        with metrics.phase(f"greedy.{strategy}"):
+            colors = builders[strategy]()
+        executed += 1
+        count = max(colors, default=-1) + 1
+        if best is None or count < best_count:
+            best, best_count, best_strategy = colors, count, strategy
+    metrics.count("greedy.strategies", executed)
+    if restarts > 0 and best_count > 1:
+        improved = iterated_greedy(adj, best, restarts, random.Random(seed), deadline)
+        if max(improved) + 1 < best_count:
+            best, best_strategy = improved, "restarts"
+    return best, best_strategy
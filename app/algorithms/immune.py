@@ -1,7 +1,304 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from app import metrics
+from app.algorithms.compact import CompactGraph
+from app.algorithms.greedy import GREEDY_RESTARTS, best_greedy
+from app.exact import clique_lower_bound
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+class Antibody:
+    """
+    Антитело — раскраска вершин (по индексам) с инкрементально поддерживаемыми
+    показателями:
+    - conf[v] — число соседей v того же цвета
+    - conflicts — число конфликтных ребер
+    - sizes[c] и used — размеры цветовых классов и число использованных цветов
+
+    Перекраска вершины обновляет показатели за O(deg).
+    """
+    __slots__ = ("colors", "conf", "conflicts", "sizes", "used")
+
+    def __init__(self, colors: List[int], conf: List[int], conflicts: int, sizes: List[int], used: int):
+        self.colors = colors
+        self.conf = conf
+        self.conflicts = conflicts
+        self.sizes = sizes
+        self.used = used
+
+    @classmethod
+    def from_colors(cls, adj: List[List[int]], colors: List[int], palette: int) -> "Antibody":
+        """Создает антитело по раскраске, вычисляя показатели за O(n + m)."""
+        conf = [sum(colors[u] == colors[v] for u in adj[v]) for v in range(len(adj))]
+        sizes = [0] * palette
+        for color in colors:
+            sizes[color] += 1
+        used = sum(size > 0 for size in sizes)
+        return cls(colors, conf, sum(conf) // 2, sizes, used)
+
+    def copy(self) -> "Antibody":
+        return Antibody(self.colors.copy(), self.conf.copy(), self.conflicts, self.sizes.copy(), self.used)
+
+    @property
+    def affinity(self) -> int:
+        """Аффинность (минимизируется): число конфликтов плюс число цветов."""
+        return self.conflicts + self.used
+
+    def recolor(self, adj: List[List[int]], v: int, color: int) -> None:
+        """Перекрашивает вершину v, обновляя показатели за O(deg(v))."""
+        colors, conf = self.colors, self.conf
+        old = colors[v]
+        if old == color:
+            return
+        delta = 0
+        for u in adj[v]:
+            neighbor_color = colors[u]
+            if neighbor_color == old:
+                conf[u] -= 1
+                delta -= 1
+            elif neighbor_color == color:
+                conf[u] += 1
+                delta += 1
+        conf[v] += delta
+        self.conflicts += delta
+        colors[v] = color
+        sizes = self.sizes
+        sizes[old] -= 1
+        if sizes[old] == 0:
+            self.used -= 1
+        sizes[color] += 1
+        if sizes[color] == 1:
+            self.used += 1
+
+
+class ImmuneAlgorithm:
+    """
+    Алгоритм искусственной иммунной системы (CLONALG / aiNet) для раскраски графа.
+
+    Антитело — раскраска вершин не более чем palette цветами. Аффинность —
+    число конфликтных ребер плюс число использованных цветов (минимизируется).
+
+    Шаг алгоритма:
+    1. Антитела упорядочиваются по аффинности, лучшая половина клонируется:
+       число клонов обратно пропорционально рангу антитела.
+    2. Клоны подвергаются гипермутации: число перекрашиваемых вершин растет с
+       ухудшением аффинности родителя. Перекрашиваются в первую очередь
+       конфликтные вершины — в цвет с наименьшим числом конфликтов или
+       в случайный цвет. Показатели антитела обновляются за O(deg).
+    3. Лучший клон замещает родителя, если он не хуже.
+    4. Подавление (aiNet): из пар похожих антител (доля совпадающих цветов
+       выше порога) остается лучшее, остальные заменяются новыми.
+
+    Как только антитело становится бесконфликтным, оно сохраняется как лучшее
+    решение, а палитра уменьшается на единицу. Начальное решение — лучшая
+    из жадных раскрасок (best_greedy) или переданная корректная раскраска
+    initial_coloring, поэтому результат всегда корректен.
+
+    Меметический шаг: при local_search_iterations > 0 лучшее конфликтное
+    антитело поколения улучшается локальным поиском TabuCol с текущей
+    палитрой. При заданном time_limit (секунды) поиск прерывается по
+    времени, результатом остается лучшая найденная корректная раскраска.
+
+    Показатели (app.metrics): счетчики immune.generations, immune.improvements
+    (уменьшения палитры) и таймеры этапов immune.clonal_selection,
+    immune.local_search.
+    """
+    def __init__(self, graph: nx.Graph, population_size: int = 20, generations: int = 100,
+                 clone_factor: float = 1.0, max_mutations: int = 5,
+                 suppression_threshold: float = 0.9, seed: Optional[int] = None,
+                 local_search_iterations: int = 0, time_limit: Optional[float] = None,
+                 initial_coloring: Optional[Dict[int, int]] = None):
+        self.graph = graph
+        self.compact = CompactGraph.from_networkx(graph)
+        self.adj = self.compact.adj
+        self.num_nodes = self.compact.num_nodes
+        self.population_size = population_size
+        self.generations = generations
+        self.clone_factor = clone_factor
+        self.max_mutations = max_mutations
+        self.suppression_threshold = suppression_threshold
+        self.random = random.Random(seed)
+        self.local_search_iterations = local_search_iterations
+        self.time_limit = time_limit
+        self.initial_coloring = initial_coloring
+        self.local_search = None
+        if local_search_iterations > 0 and self.num_nodes >= 2:
+            from app.algorithms.tabucol import TabuCol
+            self.local_search = TabuCol(self.compact, seed=self.random.randrange(2 ** 32))
+
+    def best_color(self, antibody: Antibody, v: int, palette: int) -> int:
+        """Цвет из палитры с наименьшим числом соседей этого цвета (за O(deg + palette))."""
+        counts = [0] * palette
+        colors = antibody.colors
+        for u in self.adj[v]:
+            color = colors[u]
+            if color < palette:
+                counts[color] += 1
+        return min(range(palette), key=counts.__getitem__)
+
+    def random_antibody(self, palette: int, size: int) -> Antibody:
+        """Новое антитело: вершины в случайном порядке получают наименее конфликтный цвет."""
+        order = list(range(self.num_nodes))
+        self.random.shuffle(order)
+        colors = [-1] * self.num_nodes
+        for v in order:
+            counts = [0] * palette
+            for u in self.adj[v]:
+                if colors[u] >= 0:
+                    counts[colors[u]] += 1
+            colors[v] = min(range(palette), key=counts.__getitem__)
+        return Antibody.from_colors(self.adj, colors, size)
+
+    def shrink_palette(self, antibody: Antibody, palette: int) -> None:
+        """Перекрашивает вершины с цветами вне палитры."""
+        for v, color in enumerate(antibody.colors):
+            if color >= palette:
+                antibody.recolor(self.adj, v, self.best_color(antibody, v, palette))
+
+    def hypermutate(self, antibody: Antibody, mutations: int, palette: int) -> None:
+        """Гипермутация: перекраска mutations вершин (предпочтительно конфликтных)."""
+        n = self.num_nodes
+        rng = self.random
+        for _ in range(mutations):
+            v = rng.randrange(n)
+            for _ in range(10):
+                if antibody.conf[v] > 0:
+                    break
+                v = rng.randrange(n)
+            if rng.random() < 0.5:
+                color = self.best_color(antibody, v, palette)
+            else:
+                color = rng.randrange(palette)
+            antibody.recolor(self.adj, v, color)
+
+    def similarity(self, first: Antibody, second: Antibody) -> float:
+        """Доля вершин, окрашенных в антителах одинаково."""
+        return sum(a == b for a, b in zip(first.colors, second.colors)) / self.num_nodes
+
+    def suppress(self, population: List[Antibody], palette: int, size: int) -> List[Antibody]:
+        """Подавление похожих антител (population упорядочена по аффинности)."""
+        survivors = []
+        for antibody in population:
+            if all(self.similarity(antibody, kept) < self.suppression_threshold for kept in survivors):
+                survivors.append(antibody)
+        while len(survivors) < self.population_size:
+            survivors.append(self.random_antibody(palette, size))
+        return survivors
+
+    def clonal_step(self, population: List[Antibody], palette: int) -> List[Antibody]:
+        """Клонирование, гипермутация и отбор (шаги 1–3)."""
+        population.sort(key=lambda antibody: antibody.affinity)
+        best, worst = population[0].affinity, population[-1].affinity
+        spread = max(1, worst - best)
+        selected = max(1, len(population) // 2)
+        for rank in range(selected):
+            parent = population[rank]
+            clones = max(1, round(self.clone_factor * self.population_size / (rank + 1)))
+            mutations = 1 + round(self.max_mutations * (parent.affinity - best) / spread)
+            best_clone = None
+            for _ in range(clones):
+                clone = parent.copy()
+                self.hypermutate(clone, mutations, palette)
+                if best_clone is None or clone.affinity < best_clone.affinity:
+                    best_clone = clone
+            if best_clone.affinity <= parent.affinity:
+                population[rank] = best_clone
+        population.sort(key=lambda antibody: antibody.affinity)
+        return population
+
+    def solve(self) -> Dict[int, int]:
+        """
+        Основной метод запуска алгоритма.
+
+        Returns:
+            Словарь с лучшей найденной корректной раскраской (вершина: цвет)
+        """
+        if self.num_nodes == 0:
+            return {}
+        if self.initial_coloring is None:
+            best_colors, _ = best_greedy(self.adj, restarts=GREEDY_RESTARTS,
+                                         seed=self.random.randrange(2 ** 32))
+        else:
+            greedy = self.initial_coloring
+            renumber = {color: i for i, color in enumerate(sorted(set(greedy.values())))}
+            best_colors = [renumber[greedy[node]] for node in self.compact.nodes]
+        size = max(best_colors) + 1
+        lower_bound = max(1, clique_lower_bound(self.graph))
+
+        palette = size - 1
+        population = []
+        if palette >= lower_bound:
+            start = Antibody.from_colors(self.adj, best_colors.copy(), size)
+            self.shrink_palette(start, palette)
+            population = [start] + [self.random_antibody(palette, size)
+                                    for _ in range(self.population_size - 1)]
+
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        for _ in range(self.generations):
+            if palette < lower_bound:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            with metrics.phase("immune.clonal_selection"):
+                population = self.clonal_step(population, palette)
+            metrics.count("immune.generations")
+            leader = population[0]
+            if leader.conflicts > 0 and self.local_search is not None:
+                with metrics.phase("immune.local_search"):
+                    colors, conflicts = self.local_search.search(leader.colors, palette,
+                                                                 self.local_search_iterations)
+                if conflicts < leader.conflicts:
+                    leader = population[0] = Antibody.from_colors(self.adj, colors, size)
+            if leader.conflicts == 0:
+                metrics.count("immune.improvements")
+                best_colors = leader.colors.copy()
+                palette = leader.used - 1
+                for antibody in population:
+                    self.shrink_palette(antibody, palette)
+                continue
+            population = self.suppress(population, palette, size)
+
+        # Нормализация номеров цветов в 0..k-1
+        renumber = {color: i for i, color in enumerate(sorted(set(best_colors)))}
+        return self.compact.to_labels([renumber[color] for color in best_colors])
+
+
 def immune_coloring(graph, params):
     """
-    Заглушка для алгоритма иммунной сети.
-    Здесь можно использовать параметры из params (например, количество антител, скорость мутации и т.д.)
+    Раскраска графа алгоритмом искусственной иммунной сети (см. ImmuneAlgorithm).
+
+    Args:
+        graph: Граф NetworkX для раскраски
+        params: Словарь с параметрами (population_size, generations,
+            clone_factor, max_mutations, suppression_threshold, seed,
+            бюджет ходов TabuCol на поколение local_search_iterations,
+            лимит времени time_limit, начальная раскраска initial_coloring)
+
+    Returns:
+        Словарь (вершина: цвет) с лучшей найденной раскраской графа
+
+    Raises:
+        RuntimeError: При возникновении ошибок в процессе работы алгоритма
     """
-    # Имитация вычислений: возвращаем раскраску, где все узлы получают цвет 0.
-    return {node: 0 for node in graph.nodes}
+    try:
+        algorithm = ImmuneAlgorithm(
+            graph=graph,
+            population_size=params.get("population_size", 20),
+            generations=params.get("generations", 100),
+            clone_factor=params.get("clone_factor", 1.0),
+            max_mutations=params.get("max_mutations", 5),
+            suppression_threshold=params.get("suppression_threshold", 0.9),
+            seed=params.get("seed"),
+            local_search_iterations=params.get("local_search_iterations", 200),
+            time_limit=params.get("time_limit"),
+            initial_coloring=params.get("initial_coloring")
+        )
+        return algorithm.solve()
+    except Exception as e:
+        raise RuntimeError(f"Ошибка при выполнении иммунного алгоритма: {e}")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from app import metrics
+from app.algorithms.compact import CompactGraph
+from app.algorithms.genetic import (LOCAL_SEARCH_INTERVAL, LOCAL_SEARCH_ITERATIONS, Chromosome,
+                                    GeneticAlgorithm, Population)
+from app.parallel import _get_context
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+# Экземпляр алгоритма в рабочем процессе: создается один раз при старте процесса
+_worker_ga: Optional[GeneticAlgorithm] = None
+
+
+def _init_worker(compact: CompactGraph, population_size: int, generations: int, cache_size: Optional[int],
+                 mode: str = "generational", offspring: Optional[int] = None) -> None:
+    """
+    Инициализация рабочего процесса: граф передается один раз в компактном виде.
+    Кэш целевой функции живет весь запуск, поэтому его ёмкость по умолчанию
+    рассчитывается на полное число поколений.
+    """
+    global _worker_ga
+    _worker_ga = GeneticAlgorithm(None, population_size, generations, cache_size=cache_size, compact=compact,
+                                  mode=mode, offspring=offspring)
+
+
+def _run_epoch(population: Population, rng_state: tuple,
+               generations: int) -> Tuple[Population, tuple, Chromosome]:
+    """
+    Эволюция одного острова в течение эпохи.
+
+    Состояние генератора случайных чисел передается вместе с популяцией,
+    поэтому результат не зависит от того, какой процесс обработал остров.
+
+    Returns:
+        Популяция, упорядоченная по целевой функции (лучшие в начале),
+        новое состояние генератора и лучшая хромосома за эпоху
+    """
+    ga = _worker_ga
+    ga.random.setstate(rng_state)
+    fitnesses = [ga.fitness(chromosome) for chromosome in population]
+    best_solution = min(population, key=ga.fitness)
+    for _ in range(generations):
+        population, fitnesses = ga.step(population, fitnesses)
+        current_best = min(population, key=ga.fitness)
+        if ga.fitness(current_best) < ga.fitness(best_solution):
+            best_solution = current_best
+    population.sort(key=ga.fitness)
+    return population, ga.random.getstate(), best_solution
+
+
+def _migrate(populations: List[Population], migrants: int) -> None:
+    """Кольцевая миграция: лучшие особи острова k замещают худших на острове k + 1."""
+    if migrants <= 0 or len(populations) < 2:
+        return
+    emigrants = [[chromosome.copy() for chromosome in population[:migrants]]
+                 for population in populations]
+    for k, population in enumerate(populations):
+        population[-migrants:] = emigrants[k - 1]
+
+
+def island_coloring(graph: nx.Graph, params: Dict) -> Dict[int, int]:
+    """
+    Островная модель генетического алгоритма на пуле процессов.
+
+    K независимых популяций (островов) эволюционируют в ProcessPoolExecutor.
+    Каждые migration_interval поколений лучшие хромосомы мигрируют на соседний
+    остров по кольцу. Граф передается рабочим процессам один раз при их запуске
+    (CompactGraph), между эпохами пересылаются только популяции. Остров k
+    использует зерно seed + k, главный процесс (меметический шаг) — seed + islands,
+    поэтому при заданном seed результат воспроизводим.
+    Критерии остановки (lower_bound, patience, time_limit) проверяются между
+    эпохами. Меметический шаг (local_search_iterations, local_search_interval)
+    выполняется в главном процессе между эпохами: улучшенная лучшая хромосома
+    замещает худшую особь очередного острова. Поддерживается только движок
+    python. Показатели (app.metrics) собираются только в главном процессе:
+    genetic.generations и genetic.epochs.
+
+    Args:
+        graph: Граф NetworkX для раскраски
+        params: Параметры genetic_coloring, а также islands (число островов),
+            migration_interval (поколений между миграциями), migrants (число
+            мигрантов), workers (число процессов), seed и критерии остановки
+
+    Returns:
+        Словарь (вершина: цвет) с лучшей найденной раскраской
+
+    Raises:
+        ValueError: Если задан движок, отличный от python
+    """
+    if params.get("engine", "python") != "python":
+        raise ValueError(f"Островная модель не поддерживает движок {params['engine']}")
+    islands = params.get("islands", os.cpu_count() or 1)
+    population_size = params.get("population_size", 50)
+    generations = params.get("generations", 100)
+    migration_interval = max(1, params.get("migration_interval", 10))
+    migrants = min(params.get("migrants", 2), population_size // 2)
+    cache_size = params.get("cache_size")
+    seed = params.get("seed")
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    compact = CompactGraph.from_networkx(graph)
+    # Зерно seed + islands не совпадает с зернами островов: от него зависит TabuCol
+    master = GeneticAlgorithm(graph, population_size, generations, cache_size=cache_size, compact=compact,
+                              seed=seed + islands, initial_coloring=params.get("initial_coloring"),
+                              lower_bound=params.get("lower_bound"), patience=params.get("patience"),
+                              time_limit=params.get("time_limit"),
+                              mode=params.get("mode", "generational"), offspring=params.get("offspring"),
+                              local_search_iterations=params.get("local_search_iterations",
+                                                                 LOCAL_SEARCH_ITERATIONS),
+                              local_search_interval=params.get("local_search_interval", LOCAL_SEARCH_INTERVAL))
+    start = time.perf_counter()
+
+    populations, states = [], []
+    for k in range(islands):
+        master.random.seed(seed + k)
+        populations.append(master.initial_population())
+        states.append(master.random.getstate())
+    best_solution = min((min(population, key=master.fitness) for population in populations),
+                        key=master.fitness)
+
+    workers = params.get("workers") or min(islands, os.cpu_count() or 1)
+    # Как и процессы решателей, пул не использует fork: островная модель
+    # может запускаться из потока пула задач
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_get_context(), initializer=_init_worker,
+                             initargs=(compact, population_size, generations, cache_size, master.mode,
+                                       master.offspring)) as pool:
+        generation = stagnant = 0
+        next_local_search = 0
+        while True:
+            if master.local_search is not None and generation >= next_local_search:
+                next_local_search = generation + master.local_search_interval
+                refined = master.memetic_step(best_solution)
+                if refined is not None:
+                    best_solution = refined
+                    # До первой эпохи популяции не упорядочены: замещаем худшую особь явно
+                    population = populations[(generation // master.local_search_interval) % islands]
+                    worst = max(range(len(population)), key=lambda i: master.fitness(population[i]))
+                    population[worst] = refined.copy()
+            master.stop_reason = master.stop_reason_for(
+                generation, master.count_colors(best_solution), stagnant, time.perf_counter() - start)
+            if master.stop_reason is not None:
+                break
+            if generation > 0:
+                _migrate(populations, migrants)
+            epoch = min(migration_interval, generations - generation)
+            results = list(pool.map(_run_epoch, populations, states, [epoch] * islands))
+            populations = [population for population, _, _ in results]
+            states = [state for _, state, _ in results]
+            improved = False
+            for _, _, island_best in results:
+                if master.fitness(island_best) < master.fitness(best_solution):
+                    best_solution, improved = island_best, True
+            generation += epoch
+            stagnant = 0 if improved else stagnant + epoch
+            metrics.count("genetic.generations", epoch)
+            metrics.count("genetic.epochs")
+
+    return master.decode_chromosome(best_solution)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app import metrics
+from app.algorithms.genetic import GeneticAlgorithm, Progress
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+class VectorizedGeneticAlgorithm(GeneticAlgorithm):
+    """
+    Генетический алгоритм раскраски графа с пакетной обработкой популяции на NumPy.
+
+    Кодирование, декодирование и операторы совпадают с GeneticAlgorithm, но
+    популяция хранится как двумерный массив индексов вершин (особь — строка),
+    а кроссинговер, мутация и декодирование выполняются сразу для всех особей:
+    - смежность хранится битовыми масками (по 64 вершины в слове uint64)
+    - при декодировании для каждой особи поддерживается маска вершин, смежных
+      с текущим цветовым классом; шаг по позиции хромосомы — несколько
+      векторных операций над всей популяцией
+    - упорядоченный кроссинговер строится через обратные перестановки без
+      поэлементной проверки принадлежности
+    """
+    def __init__(self, graph: nx.Graph, population_size: int, generations: int,
+                 seed: Optional[int] = None, initial_coloring: Optional[Dict[int, int]] = None,
+                 lower_bound: Optional[int] = None, patience: Optional[int] = None,
+                 time_limit: Optional[float] = None, local_search_iterations: int = 0,
+                 local_search_interval: int = 10):
+        super().__init__(graph, population_size, generations, cache_size=0, seed=seed,
+                         initial_coloring=initial_coloring, lower_bound=lower_bound,
+                         patience=patience, time_limit=time_limit,
+                         local_search_iterations=local_search_iterations,
+                         local_search_interval=local_search_interval)
+        self.rng = np.random.default_rng(seed)
+        n = self.num_nodes
+        words = max(1, (n + 63) // 64)
+        indptr = np.asarray(self.compact.indptr, dtype=np.int64)
+        indices = np.asarray(self.compact.indices, dtype=np.int64)
+        dense = np.zeros((n, words * 64), dtype=bool)
+        dense[np.repeat(np.arange(n), np.diff(indptr)), indices] = True
+        self.adj_bits = np.packbits(dense, axis=1, bitorder="little").view("<u8")
+
+    def initial_population_array(self) -> np.ndarray:
+        """Начальная популяция (см. GeneticAlgorithm.initial_population) в виде массива индексов."""
+        index = self.compact.index
+        return np.array([[index[node] for node in chromosome]
+                         for chromosome in self.initial_population()], dtype=np.int64)
+
+    def count_colors_batch(self, population: np.ndarray) -> np.ndarray:
+        """Число цветов для каждой особи популяции (пакетное декодирование)."""
+        size, n = population.shape
+        if n == 0:
+            return np.zeros(size, dtype=np.int64)
+        metrics.count("genetic.decoded", size)
+        rows = np.arange(size)
+        words = population >> 6
+        bits = (population & 63).astype(np.uint64)
+        forbidden = np.zeros((size, self.adj_bits.shape[1]), dtype=np.uint64)
+        colors = np.zeros(size, dtype=np.int64)
+        for t in range(n):
+            conflict = ((forbidden[rows, words[:, t]] >> bits[:, t]) & np.uint64(1)).astype(bool)
+            colors += conflict
+            forbidden[conflict] = 0
+            forbidden |= self.adj_bits[population[:, t]]
+        return colors + 1
+
+    def selection_batch(self, colors: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Турнирная селекция (4 участника, 2 лучших) для count пар родителей."""
+        participants = self.rng.random((count, len(colors))).argsort(axis=1)[:, :4]
+        order = np.argsort(colors[participants], axis=1, kind="stable")
+        ranked = np.take_along_axis(participants, order, axis=1)
+        return ranked[:, 0], ranked[:, 1]
+
+    def crossover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """Упорядоченный кроссинговер для всех пар родителей сразу."""
+        size, n = parents1.shape
+        points = self.rng.integers(1, n - 1, size=size)[:, None]
+        positions = np.empty_like(parents1)
+        positions[np.arange(size)[:, None], parents1] = np.arange(n)
+        # Вершины второго родителя, не попавшие в префикс первого, в исходном порядке
+        keep = np.take_along_axis(positions, parents2, axis=1) >= points
+        tail = np.take_along_axis(parents2, np.argsort(~keep, axis=1, kind="stable"), axis=1)
+        columns = np.arange(n)
+        from_tail = np.take_along_axis(tail, np.maximum(columns - points, 0), axis=1)
+        return np.where(columns < points, parents1, from_tail)
+
+    def mutate_batch(self, population: np.ndarray, mutation_rates: np.ndarray) -> np.ndarray:
+        """Перестановка двух случайных генов у особей, выбранных с заданной вероятностью."""
+        size, n = population.shape
+        mutated = np.flatnonzero(self.rng.random(size) < mutation_rates)
+        idx1 = self.rng.integers(0, n, size=len(mutated))
+        idx2 = (idx1 + self.rng.integers(1, n, size=len(mutated))) % n
+        genes1 = population[mutated, idx1]
+        population[mutated, idx1] = population[mutated, idx2]
+        population[mutated, idx2] = genes1
+        return mutated
+
+    def evolve_batch(self, population: np.ndarray, colors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Эволюционный шаг (см. GeneticAlgorithm.evolve) для всей популяции.
+
+        Returns:
+            Новая популяция и число цветов каждой её особи
+        """
+        best_colors = colors.min()
+        first, second = self.selection_batch(colors, self.population_size)
+        children = self.crossover_batch(population[first], population[second])
+        child_colors = self.count_colors_batch(children)
+        # Де Фриз при отсутствии улучшения, иначе Дарвин
+        rates = np.where(child_colors >= best_colors, 0.2, 0.05)
+        mutated = self.mutate_batch(children, rates)
+        if len(mutated):
+            child_colors[mutated] = self.count_colors_batch(children[mutated])
+        return children, child_colors
+
+    def run(self) -> Iterator[Progress]:
+        """Эволюция в виде генератора (см. GeneticAlgorithm.run)."""
+        if self.num_nodes < 3:
+            yield from super().run()
+            return
+        start = time.perf_counter()
+        with metrics.phase("genetic.initial_population"):
+            population = self.initial_population_array()
+            colors = self.count_colors_batch(population)
+        best = int(colors.argmin())
+        best_colors = int(colors[best])
+        self.best_solution = [self.nodes[i] for i in population[best]]
+        generation = stagnant = 0
+        self.stop_reason = None
+
+        while True:
+            if self.local_search is not None and generation % self.local_search_interval == 0:
+                improved = self.memetic_step(self.best_solution)
+                if improved is not None:
+                    worst = int(colors.argmax())
+                    population[worst] = [self.compact.index[node] for node in improved]
+                    colors[worst] = self.count_colors(improved)
+                    if colors[worst] < best_colors:
+                        best_colors, self.best_solution = int(colors[worst]), improved
+                        stagnant = 0
+            elapsed = time.perf_counter() - start
+            yield Progress(generation, best_colors, best_colors / self.num_nodes,
+                           float(colors.mean()) / self.num_nodes, elapsed)
+            self.stop_reason = self.stop_reason_for(generation, best_colors, stagnant, elapsed)
+            if self.stop_reason is not None:
+                return
+
+            with metrics.phase("genetic.evolution"):
+                population, colors = self.evolve_batch(population, colors)
+            generation += 1
+            metrics.count("genetic.generations")
+            current = int(colors.argmin())
+            if colors[current] < best_colors:
+                best_colors = int(colors[current])
+                self.best_solution = [self.nodes[i] for i in population[current]]
+                stagnant = 0
+            else:
+                stagnant += 1
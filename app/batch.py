@@ -0,0 +1,312 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from app.algorithms.genetic import genetic_coloring
+from app.algorithms.immune import immune_coloring
+from app.exact import (clique_lower_bound, count_conflicts, edge_array, exact_search, get_count_colors,
+                       greedy_coloring, solution_accuracy)
+from app.parallel import _get_context, run_solver
+from app.portfolio import portfolio_search
+
+# Ограничения одного пакетного запроса
+MAX_BATCH_GRAPHS = 10000
+MAX_GENERATED_NODES = 100000
+# Ребер в одном графе (для генераторов — ожидаемое число) и во всем запросе:
+# граф строится в процессе общего пула, и нехватка памяти в нем ломает пул
+# для всех запросов
+MAX_GRAPH_EDGES = 1000000
+MAX_BATCH_EDGES = 5000000
+MAX_TIME_LIMIT = 60.0
+# Лимит времени каждого алгоритма на граф по умолчанию (секунды)
+DEFAULT_TIME_LIMIT = 1.0
+# Алгоритмы по умолчанию — те же, что на странице раскраски
+DEFAULT_SOLVERS = ("portfolio", "genetic", "immune")
+
+# Число процессов общего пула пакетной раскраски
+BATCH_WORKERS = int(os.environ.get("GAAAIS_BATCH_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def _greedy(graph, time_limit, seed):
+    return greedy_coloring(graph), False
+
+
+def _exact(graph, time_limit, seed):
+    return exact_search(graph, time_limit)
+
+
+def _portfolio(graph, time_limit, seed):
+    report = portfolio_search(graph, time_limit, seed)
+    return report["coloring"], report["proven"]
+
+
+def _genetic(graph, time_limit, seed):
+    return genetic_coloring(graph, {"seed": seed, "time_limit": time_limit}), False
+
+
+def _immune(graph, time_limit, seed):
+    return immune_coloring(graph, {"seed": seed, "time_limit": time_limit}), False
+
+
+# Алгоритмы пакетного API: solver(graph, time_limit, seed) -> (раскраска, доказана ли оптимальность)
+SOLVERS = {
+    "greedy": _greedy,
+    "exact": _exact,
+    "portfolio": _portfolio,
+    "genetic": _genetic,
+    "immune": _immune,
+}
+
+
+def _gnp(spec):
+    import networkx as nx
+
+    # O(n + m) вместо перебора всех n * (n - 1) / 2 пар: n достигает MAX_GENERATED_NODES
+    return nx.fast_gnp_random_graph(spec["n"], spec.get("p", 0.3), seed=spec.get("seed"))
+
+
+def _gnm(spec):
+    import networkx as nx
+
+    return nx.gnm_random_graph(spec["n"], spec["m"], seed=spec.get("seed"))
+
+
+# Генераторы случайных графов: имя -> функция от описания графа
+GENERATORS = {"gnp": _gnp, "gnm": _gnm}
+
+
+def build_graph(spec):
+    """
+    Строит граф по описанию из пакетного запроса.
+
+    Args:
+        spec (dict): Список ребер edges ([[u, v], ...]) и, необязательно,
+            вершины nodes (список или число n — вершины 0..n-1, в том числе
+            изолированные), либо генератор generator ("gnp" с параметрами
+            n, p или "gnm" с параметрами n, m) и зерно seed.
+
+    Returns:
+        networkx.Graph: Граф.
+    """
+    import networkx as nx
+
+    if "generator" in spec:
+        return GENERATORS[spec["generator"]](spec)
+    graph = nx.Graph()
+    nodes = spec.get("nodes", ())
+    graph.add_nodes_from(range(nodes) if isinstance(nodes, int) else nodes)
+    graph.add_edges_from(tuple(edge) for edge in spec["edges"])
+    return graph
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _graph_edges(position, spec):
+    """
+    Проверяет описание графа пакетного запроса.
+
+    Returns:
+        float: Число ребер графа (для gnp — ожидаемое).
+
+    Raises:
+        ValueError: Если описание некорректно или граф превышает ограничения.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Граф {position}: ожидается объект")
+    if "generator" in spec:
+        if spec["generator"] not in GENERATORS:
+            raise ValueError(f"Граф {position}: неизвестный генератор {spec['generator']}")
+        n = spec.get("n")
+        if not _is_int(n) or not 0 <= n <= MAX_GENERATED_NODES:
+            raise ValueError(f"Граф {position}: n должно быть целым от 0 до {MAX_GENERATED_NODES}")
+        pairs = n * (n - 1) // 2
+        if spec["generator"] == "gnm":
+            m = spec.get("m")
+            if not _is_int(m) or not 0 <= m <= pairs:
+                raise ValueError(f"Граф {position}: для генератора gnm требуется целое m от 0 до {pairs}")
+            edges = m
+        else:
+            p = spec.get("p", 0.3)
+            if not _is_number(p) or not 0 <= p <= 1:
+                raise ValueError(f"Граф {position}: p должно быть числом от 0 до 1")
+            edges = pairs * p
+    else:
+        if not isinstance(spec.get("edges"), list):
+            raise ValueError(f"Граф {position}: требуется список ребер edges или генератор generator")
+        if not all(isinstance(edge, list) and len(edge) == 2 for edge in spec["edges"]):
+            raise ValueError(f"Граф {position}: ребро задается парой вершин [u, v]")
+        nodes = spec.get("nodes", [])
+        if _is_int(nodes):
+            if not 0 <= nodes <= MAX_GENERATED_NODES:
+                raise ValueError(f"Граф {position}: nodes должно быть целым от 0 до {MAX_GENERATED_NODES}")
+        elif not isinstance(nodes, list) or len(nodes) > MAX_GENERATED_NODES:
+            raise ValueError(f"Граф {position}: nodes должно быть числом или списком "
+                             f"не более чем из {MAX_GENERATED_NODES} вершин")
+        edges = len(spec["edges"])
+    if edges > MAX_GRAPH_EDGES:
+        raise ValueError(f"Граф {position}: не более {MAX_GRAPH_EDGES} ребер (ожидается {int(edges)})")
+    return edges
+
+
+def parse_batch(payload):
+    """
+    Проверяет пакетный запрос.
+
+    Args:
+        payload (dict): Тело запроса: graphs — список описаний графов (см.
+            build_graph, необязательное поле id возвращается в результате;
+            не более MAX_GRAPH_EDGES ребер в графе — для генераторов
+            ожидаемое число n * (n - 1) / 2 * p или m — и MAX_BATCH_EDGES
+            во всем запросе),
+            solvers — имена алгоритмов из SOLVERS, time_limit — лимит
+            времени каждого алгоритма на граф, seed — зерно алгоритмов,
+            include_coloring — возвращать ли раскраски (по умолчанию да).
+
+    Returns:
+        dict: Нормализованный запрос (graphs, solvers, time_limit, seed,
+            include_coloring).
+
+    Raises:
+        ValueError: Если запрос некорректен.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Ожидается объект JSON")
+    graphs = payload.get("graphs")
+    if not isinstance(graphs, list) or not graphs:
+        raise ValueError("Поле graphs должно быть непустым списком")
+    if len(graphs) > MAX_BATCH_GRAPHS:
+        raise ValueError(f"Не более {MAX_BATCH_GRAPHS} графов в одном запросе")
+    total_edges = sum(_graph_edges(position, spec) for position, spec in enumerate(graphs))
+    if total_edges > MAX_BATCH_EDGES:
+        raise ValueError(f"Не более {MAX_BATCH_EDGES} ребер в одном запросе (ожидается {int(total_edges)})")
+
+    solvers = payload.get("solvers", list(DEFAULT_SOLVERS))
+    if not isinstance(solvers, list) or not solvers:
+        raise ValueError("Поле solvers должно быть непустым списком")
+    unknown = [name for name in solvers if name not in SOLVERS]
+    if unknown:
+        raise ValueError(f"Неизвестные алгоритмы: {', '.join(map(str, unknown))}")
+
+    time_limit = payload.get("time_limit", DEFAULT_TIME_LIMIT)
+    if not _is_number(time_limit) or not 0 < time_limit <= MAX_TIME_LIMIT:
+        raise ValueError(f"time_limit должно быть числом от 0 до {MAX_TIME_LIMIT}")
+    return {
+        "graphs": graphs,
+        "solvers": list(dict.fromkeys(solvers)),
+        "time_limit": float(time_limit),
+        "seed": payload.get("seed"),
+        "include_coloring": bool(payload.get("include_coloring", True)),
+    }
+
+
+def color_graph(spec, solvers, time_limit, seed=None, include_coloring=True):
+    """
+    Раскрашивает один граф пакета выбранными алгоритмами (без отрисовки
+    и сохранения истории).
+
+    Как и на странице раскраски, каждое решение проверяется (count_conflicts),
+    а точность считается относительно нижней границы: числа цветов
+    доказанно оптимальной раскраски или размера найденной клики.
+
+    Returns:
+        dict: nodes, edges, lower_bound и results — по именам алгоритмов
+            status, time, а для успешных запусков colors, conflicts,
+            accuracy, proven и coloring (вершина: цвет).
+    """
+    graph = build_graph(spec)
+    edges = edge_array(graph)
+    lower_bound = clique_lower_bound(graph)
+
+    results = {}
+    for name in solvers:
+        result = run_solver(partial(SOLVERS[name], time_limit=time_limit, seed=seed), graph)
+        entry = {"status": result["status"], "time": round(result["time"], 4)}
+        if result["status"] == "ok":
+            coloring, proven = result["solution"]
+            entry["colors"] = get_count_colors(coloring)
+            entry["conflicts"] = count_conflicts(graph, coloring, edges)
+            entry["proven"] = proven and not entry["conflicts"]
+            if entry["proven"]:
+                lower_bound = max(lower_bound, entry["colors"])
+            if include_coloring:
+                entry["coloring"] = coloring
+        else:
+            entry["error"] = result["error"]
+        results[name] = entry
+
+    for entry in results.values():
+        if entry["status"] == "ok":
+            entry["accuracy"] = solution_accuracy(entry["colors"], lower_bound, entry["conflicts"])
+            entry["proven"] = entry["proven"] or (not entry["conflicts"] and entry["colors"] <= lower_bound)
+    return {
+        "nodes": graph.number_of_nodes(),
+        "edges": len(edges),
+        "lower_bound": lower_bound,
+        "results": results,
+    }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Общий для всех запросов пул процессов пакетной раскраски (создается при первом запросе)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, mp_context=_get_context())
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_batch(batch):
+    """
+    Раскрашивает графы пакета на общем пуле процессов.
+
+    Args:
+        batch (dict): Запрос, проверенный parse_batch.
+
+    Yields:
+        dict: Результат color_graph для каждого графа по мере готовности
+            (не в порядке запроса) с полями index (позиция в запросе) и id,
+            либо поле error, если граф не удалось раскрасить. Если потребитель
+            прекращает итерацию, невыполненные графы снимаются с очереди.
+    """
+    pool = shared_pool()
+    futures = {
+        pool.submit(color_graph, spec, batch["solvers"], batch["time_limit"], batch["seed"],
+                    batch["include_coloring"]): position
+        for position, spec in enumerate(batch["graphs"])
+    }
+    try:
+        for future in as_completed(futures):
+            position = futures[future]
+            line = {"index": position, "id": batch["graphs"][position].get("id")}
+            try:
+                line.update(future.result())
+            except BrokenProcessPool:
+                # Пул непригоден (процесс завершился аварийно): следующий запрос создаст новый
+                _discard_pool(pool)
+                line["error"] = "Процесс пакетной раскраски завершился аварийно"
+            except Exception as error:
+                line["error"] = f"Ошибка раскраски графа: {error}"
+            yield line
+    finally:
+        for future in futures:
+            future.cancel()
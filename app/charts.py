@@ -0,0 +1,79 @@
+import threading
+
+from app.plotting import generate_custom_line_chart
+
+# Заголовки графиков истории: показатель -> (заголовок, подпись оси Y)
+CHARTS = {
+    'time': ("Execution Time History", "Time (s)"),
+    'accuracy': ("Accuracy History", "Accuracy (%)"),
+    'colors': ("Colors History", "Count"),
+}
+
+
+def downsample(xs, ys, max_points):
+    """
+    Прореживает ряд до max_points точек усреднением по равным группам
+    соседних точек.
+    """
+    if max_points <= 0 or len(xs) <= max_points:
+        return list(xs), list(ys)
+    sampled_xs, sampled_ys = [], []
+    for bucket in range(max_points):
+        start = bucket * len(xs) // max_points
+        end = (bucket + 1) * len(xs) // max_points
+        sampled_xs.append(sum(xs[start:end]) / (end - start))
+        sampled_ys.append(sum(ys[start:end]) / (end - start))
+    return sampled_xs, sampled_ys
+
+
+class ChartCache:
+    """
+    Кэш графиков истории.
+
+    Изображения строятся по требованию и хранятся до появления новых
+    результатов: версия кэша — номер последнего запуска в хранилище
+    (ResultStore.revision). Версия же служит ETag для условных запросов.
+    """
+    def __init__(self, store):
+        self.store = store
+        self._images = {}
+        self._lock = threading.Lock()
+
+    def etag(self, metric, revision):
+        return f"{metric}-{revision}"
+
+    def png(self, metric):
+        """
+        Возвращает график показателя.
+
+        Returns:
+            tuple: ETag и изображение PNG.
+        """
+        if metric not in CHARTS:
+            raise KeyError(metric)
+        revision = self.store.revision()
+        with self._lock:
+            cached = self._images.get(metric)
+        if cached is not None and cached[0] == revision:
+            return self.etag(metric, revision), cached[1]
+        title, ylabel = CHARTS[metric]
+        image = generate_custom_line_chart(self.store.history(metric), title, "Number of Nodes", ylabel)
+        with self._lock:
+            self._images[metric] = (revision, image)
+        return self.etag(metric, revision), image
+
+    def series(self, metric, max_points=200):
+        """
+        Возвращает ряды показателя для построения графика на стороне клиента.
+
+        Returns:
+            tuple: ETag и словарь (алгоритм: {"x": [...], "y": [...]}).
+        """
+        if metric not in CHARTS:
+            raise KeyError(metric)
+        revision = self.store.revision()
+        data = {}
+        for algo, (xs, ys) in self.store.history(metric).items():
+            xs, ys = downsample(xs, ys, max_points)
+            data[algo] = {"x": xs, "y": ys}
+        return self.etag(metric, revision), data
@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.exact import clique_lower_bound
+from app.parallel import _get_context
+
+# Компоненты меньшего размера раскрашиваются в текущем процессе:
+# накладные расходы на передачу в пул для них больше выигрыша
+PARALLEL_MIN_SIZE = 32
+
+
+def peel_low_degree(graph, lower_bound):
+    """
+    Последовательно удаляет вершины со степенью меньше нижней границы.
+
+    Степень считается в графе, оставшемся после предыдущих удалений, поэтому
+    при обратной вставке каждой удаленной вершине хватает одного из первых
+    lower_bound цветов, и хроматическое число не увеличивается.
+
+    Args:
+        graph (networkx.Graph): Исходный граф.
+        lower_bound (int): Нижняя граница хроматического числа.
+
+    Returns:
+        tuple: Множество оставшихся вершин (ядро) и список удаленных вершин
+            в порядке удаления.
+    """
+    degree = {node: len(graph.adj[node]) for node in graph}
+    queue = [node for node, value in degree.items() if value < lower_bound]
+    removed = []
+    removed_set = set(queue)
+    while queue:
+        node = queue.pop()
+        removed.append(node)
+        for neighbor in graph.adj[node]:
+            if neighbor not in removed_set:
+                degree[neighbor] -= 1
+                if degree[neighbor] < lower_bound:
+                    removed_set.add(neighbor)
+                    queue.append(neighbor)
+    core = set(graph) - removed_set
+    return core, removed
+
+
+def reinsert_peeled(graph, coloring, removed):
+    """Раскрашивает удаленные вершины в обратном порядке наименьшим свободным цветом."""
+    for node in reversed(removed):
+        used = {coloring[neighbor] for neighbor in graph.adj[node] if neighbor in coloring}
+        color = 0
+        while color in used:
+            color += 1
+        coloring[node] = color
+    return coloring
+
+
+def split_components(graph, lower_bound):
+    """
+    Удаляет вершины низкой степени (peel_low_degree) и разбивает оставшийся
+    граф на компоненты связности.
+
+    Args:
+        graph (networkx.Graph): Исходный граф.
+        lower_bound (int): Нижняя граница хроматического числа.
+
+    Returns:
+        tuple: Список компонент (копии подграфов) и список удаленных вершин
+            в порядке удаления (для reinsert_peeled).
+    """
+    import networkx as nx
+
+    core, removed = peel_low_degree(graph, lower_bound)
+    components = [graph.subgraph(component).copy()
+                  for component in nx.connected_components(graph.subgraph(core))]
+    return components, removed
+
+
+def decomposed_coloring(graph, solver, max_workers=None):
+    """
+    Предварительная декомпозиция графа перед запуском алгоритма раскраски.
+
+    Этапы:
+    1. Оценка нижней границы хроматического числа (размер клики).
+    2. Удаление вершин со степенью меньше нижней границы (peel_low_degree).
+    3. Разбиение оставшегося графа на компоненты связности и их раскраска
+       алгоритмом solver; крупные компоненты раскрашиваются параллельно
+       на пуле процессов.
+    4. Обратная вставка удаленных вершин (reinsert_peeled).
+
+    Число цветов итоговой раскраски равно максимуму по компонентам (но не
+    меньше нижней границы), поэтому точный алгоритм остается точным, а
+    экспоненциальный перебор ведется по нескольким меньшим подграфам.
+
+    Args:
+        graph (networkx.Graph): Граф, который необходимо раскрасить.
+        solver (callable): Алгоритм раскраски solver(graph) -> dict. Для
+            параллельного запуска должен сериализоваться (функция модуля
+            или functools.partial от нее).
+        max_workers (int, optional): Число процессов пула.
+
+    Returns:
+        dict: Словарь, где ключ — вершина, а значение — назначенный ей цвет.
+    """
+    components, removed = split_components(graph, clique_lower_bound(graph))
+
+    large = [component for component in components if len(component) >= PARALLEL_MIN_SIZE]
+    small = [component for component in components if len(component) < PARALLEL_MIN_SIZE]
+    solutions = [solver(component) for component in small]
+    if len(large) > 1:
+        workers = max_workers or min(len(large), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_get_context()) as pool:
+            solutions.extend(pool.map(solver, large))
+    else:
+        solutions.extend(solver(component) for component in large)
+
+    coloring = {}
+    for solution in solutions:
+        coloring.update(solution)
+    return reinsert_peeled(graph, coloring, removed)
@@ -1,38 +1,299 @@
-from itertools import permutations
-import networkx as nx
+import time
 
-def compare_solutions(exact, test):
+from app import metrics
+from app.algorithms.compact import CompactGraph
+from app.algorithms.greedy import DEFAULT_STRATEGIES, best_greedy, dsatur
+
+def edge_array(graph):
+    """
+    Ребра графа в виде массива (m, 2) индексов вершин в порядке graph.nodes;
+    петли отбрасываются. Массив строится один раз за запуск и используется
+    для проверки раскрасок всех алгоритмов.
+
+    Массив собирается векторно из CSR-представления (CompactGraph): каждая
+    строка indptr разворачивается в индекс вершины, и остаются пары u < v.
+
+    Args:
+        graph (networkx.Graph or CompactGraph): Граф; готовое компактное
+            представление используется без повторного построения.
+    """
+    import numpy as np
+
+    compact = graph if isinstance(graph, CompactGraph) else CompactGraph.from_networkx(graph)
+    indptr = np.asarray(compact.indptr, dtype=np.int64)
+    indices = np.asarray(compact.indices, dtype=np.int64)
+    rows = np.repeat(np.arange(compact.num_nodes, dtype=np.int64), np.diff(indptr))
+    upper = rows < indices
+    return np.column_stack((rows[upper], indices[upper]))
+
+def count_conflicts(graph, coloring, edges=None):
+    """
+    Проверяет корректность раскраски за один векторный проход по ребрам.
+
+    Args:
+        graph (networkx.Graph): Граф.
+        coloring (dict): Раскраска (вершина: цвет).
+        edges (numpy.ndarray, optional): Массив ребер (см. edge_array).
+
+    Returns:
+        int: Число конфликтных ребер (концы одного цвета) плюс число
+            нераскрашенных вершин; 0 — раскраска корректна.
+    """
+    import numpy as np
+
+    if edges is None:
+        edges = edge_array(graph)
+    colors = np.fromiter((coloring.get(node, -1) for node in graph.nodes),
+                         dtype=np.int64, count=graph.number_of_nodes())
+    uncolored = int(np.count_nonzero(colors < 0))
+    ends = colors[edges]
+    conflicts = int(np.count_nonzero((ends[:, 0] == ends[:, 1]) & (ends[:, 0] >= 0)))
+    return conflicts + uncolored
+
+def solution_accuracy(colors, lower_bound, conflicts=0):
     """
-    Возвращает точность тестового решения как отношение минимального числа цветов,
-    использованных алгоритмами, к максимальному числу цветов, умноженное на 100.
-    Результат округляется до двух знаков после запятой.
+    Точность раскраски относительно нижней границы хроматического числа:
+    lower_bound / colors * 100 (100 — раскраска доказанно оптимальна).
+    Некорректная раскраска получает точность 0.
     """
+    if conflicts:
+        return 0
+    if colors == 0:
+        return 100
+    return round(min(lower_bound, colors) / colors * 100, 2)
+
+def compare_solutions(exact, test, graph=None):
+    """
+    Возвращает точность тестового решения как отношение числа цветов
+    эталонного решения к числу цветов тестового, умноженное на 100
+    (не больше 100). Результат округляется до двух знаков после запятой.
+
+    Если передан граф, некорректное тестовое решение получает точность 0:
+    меньшее число цветов за счет конфликтов не считается улучшением.
+    """
+    if graph is not None and count_conflicts(graph, test):
+        return 0
     exact_colors = len(set(exact.values()))
     test_colors = len(set(test.values()))
-    min_colors = min(exact_colors, test_colors)
-    max_colors = max(exact_colors, test_colors)
-    return round((min_colors / max_colors) * 100, 2) if max_colors != 0 else 0
+    if test_colors == 0:
+        return 100 if exact_colors == 0 else 0
+    return round(min(exact_colors / test_colors, 1) * 100, 2)
 
-def get_count_colors(graph):
-    return len(set(graph.values()))
+def get_count_colors(coloring):
+    """Число различных цветов раскраски (корректность не проверяется, см. count_conflicts)."""
+    return len(set(coloring.values()))
 
 def null_coloring(graph):
     return {node: 0 for node in graph.nodes}
 
-def exact_coloring(graph):
+def _iter_bits(bits):
+    """Перебирает номера установленных битов целого числа."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _greedy_clique(adj, starts=64):
+    """
+    Эвристический поиск большой клики (нижняя граница хроматического числа).
+
+    Из каждой из starts вершин наибольшей степени клика жадно расширяется
+    вершиной, у которой больше всего соседей среди оставшихся кандидатов.
+    Множества соседей хранятся битовыми масками (целые числа Python).
+
+    Returns:
+        list: Вершины найденной клики.
+    """
+    n = len(adj)
+    bits = [0] * n
+    for v in range(n):
+        mask = 0
+        for u in adj[v]:
+            mask |= 1 << u
+        bits[v] = mask
+    best = []
+    for start in sorted(range(n), key=lambda v: len(adj[v]), reverse=True)[:starts]:
+        if len(adj[start]) < len(best):
+            continue
+        clique = [start]
+        candidates = bits[start]
+        while candidates:
+            v = max(_iter_bits(candidates), key=lambda u: (candidates & bits[u]).bit_count())
+            clique.append(v)
+            candidates &= bits[v]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def clique_lower_bound(graph):
+    """
+    Нижняя граница хроматического числа — размер эвристически найденной клики.
+
+    Args:
+        graph (networkx.Graph): Исследуемый граф.
+
+    Returns:
+        int: Размер найденной клики (0 для пустого графа).
+    """
+    return len(_greedy_clique(CompactGraph.from_networkx(graph).adj))
+
+
+def exact_search(graph, time_limit=None, initial_coloring=None):
     """
-    Реализация точного переборного алгоритма раскраски графа для нахождения минимальной
-    расскраски. Алгоритм перебирает возможные варианты раскраски с 1 до N цветов (где N —
-    количество вершин) с использованием рекурсивного алгоритма backtracking.
+    Точный алгоритм раскраски графа методом ветвей и границ (DSATUR).
 
     Алгоритм работает следующим образом:
-    1. Использует рекурсивную функцию backtracking для назначения цвета каждой вершине.
-    2. Проверяет, что выбранный цвет не конфликтует с цветами соседних вершин.
-    3. Итеративно увеличивает количество используемых цветов, пока не будет найдено
-       корректное решение с минимальным числом цветов.
+    1. Верхняя граница — жадная раскраска DSATUR, нижняя — размер эвристически
+       найденной клики. Если границы совпали, раскраска сразу оптимальна.
+    2. Вершины клики заранее получают цвета 0..q-1 (устранение симметрии).
+    3. Поиск с возвратом выбирает вершину с наибольшей насыщенностью (числом
+       различных цветов соседей), при равенстве — с наибольшей степенью.
+       Насыщенность поддерживается инкрементально: назначение и отмена цвета
+       обновляют счетчики соседей за O(deg).
+    4. Вершине пробуются только цвета, не занятые соседями, и не более одного
+       нового цвета (номера цветов взаимозаменяемы). Ветви, в которых число
+       цветов достигает лучшего найденного решения, отсекаются.
+    5. Поиск завершается, когда решение достигло нижней границы или дерево
+       перебора исчерпано.
+
+    Показатели (app.metrics): счетчики exact.nodes (узлы дерева перебора),
+    exact.backtracks (возвраты), exact.improvements (улучшения верхней
+    границы) и таймеры этапов exact.bounds, exact.search.
 
     Args:
         graph (networkx.Graph): Граф, который необходимо раскрасить.
+        time_limit (float, optional): Ограничение времени поиска в секундах.
+        initial_coloring (dict, optional): Известная корректная раскраска;
+            используется как верхняя граница, если она лучше жадной.
+
+    Returns:
+        tuple: Раскраска (вершина: цвет) и флаг доказанной оптимальности.
+            При исчерпании времени возвращается лучшая найденная раскраска
+            и флаг False.
+    """
+    compact = CompactGraph.from_networkx(graph)
+    adj = compact.adj
+    n = len(adj)
+    if n == 0:
+        return {}, True
+    started = time.perf_counter()
+    deadline = None if time_limit is None else started + time_limit
+
+    best_colors = dsatur(adj)
+    best = max(best_colors) + 1
+    if initial_coloring is not None and len(set(initial_coloring.values())) < best:
+        renumber = {color: i for i, color in enumerate(sorted(set(initial_coloring.values())))}
+        best_colors = [renumber[initial_coloring[node]] for node in compact.nodes]
+        best = len(renumber)
+    clique = _greedy_clique(adj)
+    lower_bound = len(clique)
+    searched = time.perf_counter()
+    metrics.add_time("exact.bounds", searched - started)
+    if best <= lower_bound:
+        return compact.to_labels(best_colors), True
+
+    colors = [-1] * n
+    # counts[v][c] — число соседей v цвета c, saturation[v] — число различных цветов
+    counts = [[0] * best for _ in range(n)]
+    saturation = [0] * n
+    degree = [len(neighbors) for neighbors in adj]
+
+    def assign(v, color):
+        colors[v] = color
+        for u in adj[v]:
+            row = counts[u]
+            if row[color] == 0:
+                saturation[u] += 1
+            row[color] += 1
+
+    def unassign(v):
+        color = colors[v]
+        colors[v] = -1
+        for u in adj[v]:
+            row = counts[u]
+            row[color] -= 1
+            if row[color] == 0:
+                saturation[u] -= 1
+
+    def select():
+        chosen, key = -1, (-1, -1)
+        for v in range(n):
+            if colors[v] < 0:
+                candidate = (saturation[v], degree[v])
+                if candidate > key:
+                    chosen, key = v, candidate
+        return chosen
+
+    for color, v in enumerate(clique):
+        assign(v, color)
+    colored = len(clique)
+    used = len(clique)
+
+    proven = True
+    steps = backtracks = improvements = 0
+    # Кадр стека: [вершина, цвета-кандидаты, позиция, назначенный цвет, прежнее used]
+    v = select()
+    stack = [[v, [c for c in range(used) if counts[v][c] == 0] + [used], 0, -1, used]]
+    while stack:
+        frame = stack[-1]
+        v, candidates, position, assigned, previous_used = frame
+        if assigned >= 0:
+            unassign(v)
+            colored -= 1
+            used = previous_used
+            frame[3] = -1
+        if position == len(candidates):
+            stack.pop()
+            backtracks += 1
+            continue
+        color = candidates[position]
+        frame[2] = position + 1
+        if max(used, color + 1) >= best:
+            continue
+
+        steps += 1
+        if deadline is not None and steps & 1023 == 0 and time.perf_counter() > deadline:
+            proven = False
+            break
+
+        assign(v, color)
+        frame[3] = color
+        frame[4] = used
+        used = max(used, color + 1)
+        colored += 1
+        if colored == n:
+            best, best_colors = used, colors.copy()
+            improvements += 1
+            if best <= lower_bound:
+                break
+            continue
+        u = select()
+        row = counts[u]
+        limit = min(used, best - 1)
+        candidates = [c for c in range(limit) if row[c] == 0]
+        if used < best - 1:
+            candidates.append(used)
+        if candidates:
+            stack.append([u, candidates, 0, -1, used])
+
+    metrics.count("exact.nodes", steps)
+    metrics.count("exact.backtracks", backtracks)
+    metrics.count("exact.improvements", improvements)
+    metrics.add_time("exact.search", time.perf_counter() - searched)
+    return compact.to_labels(best_colors), proven
+
+
+def exact_coloring(graph, time_limit=None):
+    """
+    Точная раскраска графа минимальным числом цветов (см. exact_search).
+
+    Args:
+        graph (networkx.Graph): Граф, который необходимо раскрасить.
+        time_limit (float, optional): Ограничение времени поиска в секундах.
+            По его исчерпании возвращается лучшая найденная (не обязательно
+            оптимальная) раскраска; флаг оптимальности возвращает exact_search.
 
     Returns:
         dict: Словарь, где ключ — вершина, а значение — назначенный ей цвет (целое число).
@@ -41,82 +302,31 @@ def exact_coloring(graph):
         Exception: Если не удалось найти корректную раскраску графа.
     """
     try:
-        # Получение списка вершин
-        nodes = list(graph.nodes())
-        
-        def is_valid_assignment(node, color, current_assignment):
-            """
-            Проверяет, можно ли назначить вершине 'node' цвет 'color'
-            без конфликта с соседями.
-
-            Args:
-                node: Текущая вершина.
-                color (int): Предполагаемый цвет для вершины.
-                current_assignment (dict): Текущее частичное назначение цветов.
-
-            Returns:
-                bool: True, если назначение допустимо, иначе False.
-            """
-            for neighbor in graph.neighbors(node):
-                if neighbor in current_assignment and current_assignment[neighbor] == color:
-                    return False
-            return True
-        
-        def backtrack(current_assignment, max_colors):
-            """
-            Рекурсивная функция backtracking для назначения цветов вершинам.
-
-            Args:
-                current_assignment (dict): Текущее частичное назначение цветов.
-                max_colors (int): Максимальное число цветов, доступных для назначения.
-
-            Returns:
-                dict or None: Полное назначение, если найдено корректное решение, иначе None.
-            """
-            # Если все вершины раскрашены, возвращаем найденное решение.
-            if len(current_assignment) == len(nodes):
-                return current_assignment
-            
-            # Выбираем следующую незакрашенную вершину.
-            for node in nodes:
-                if node not in current_assignment:
-                    current_node = node
-                    break
-            
-            # Перебор возможных цветов для текущей вершины.
-            for color in range(max_colors):
-                if is_valid_assignment(current_node, color, current_assignment):
-                    current_assignment[current_node] = color  # Назначаем цвет.
-                    result = backtrack(current_assignment, max_colors)
-                    if result is not None:
-                        return result
-                    # Отмена назначения цвета в случае неудачи (backtracking).
-                    del current_assignment[current_node]
-            return None
-        
-        # Итеративный перебор количества цветов от 1 до количества вершин.
-        for num_colors in range(1, len(nodes) + 1):
-            print(num_colors)
-            assignment = {}
-            result = backtrack(assignment, num_colors)
-            if result is not None:
-                # Возвращаем раскраску, использующую минимальное число цветов.
-                return result
-        
-        raise Exception("Не удалось найти корректную раскраску графа.")
-    
+        coloring, _ = exact_search(graph, time_limit)
+        return coloring
     except Exception as error:
         # Обработка исключений с информативным сообщением об ошибке.
         raise Exception(f"Ошибка в функции exact_coloring: {error}")
 
-def greedy_coloring(graph):
+def greedy_coloring(graph, strategies=DEFAULT_STRATEGIES, restarts=0, seed=None, time_limit=None):
     """
-    Реализация точного алгоритма раскраски графа с использованием жадного алгоритма.
+    Жадная раскраска графа: лучшая из последовательных раскрасок по
+    нескольким стратегиям на компактном представлении графа с последующими
+    случайными перезапусками (см. app.algorithms.greedy.best_greedy).
+    По умолчанию — только largest_first и smallest_last за O(n + m) без
+    перезапусков; DSATUR, RLF (app.algorithms.greedy.STRATEGIES) и
+    перезапуски включаются явно.
     
     Args:
         graph (networkx.Graph): Граф, который необходимо раскрасить.
+        strategies (tuple): Стратегии раскраски.
+        restarts (int): Число случайных перезапусков.
+        seed (int, optional): Зерно перезапусков.
+        time_limit (float, optional): Бюджет времени стратегий и перезапусков.
         
     Returns:
         dict: Словарь, где ключ — вершина, а значение — назначенный ей цвет (целое число).
     """
-    return nx.greedy_color(graph, strategy='largest_first')
\ No newline at end of file
+    compact = CompactGraph.from_networkx(graph)
+    colors, _ = best_greedy(compact.adj, strategies, restarts, seed, time_limit)
+    return compact.to_labels(colors)
@@ -0,0 +1,175 @@
+import hashlib
+import mmap
+import os
+import pickle
+from array import array
+
+import numpy as np
+
+from app.algorithms.compact import CompactGraph
+
+# Размер блока при потоковом чтении и хешировании
+CHUNK_SIZE = 1 << 20
+# Тип NumPy, совпадающий с элементом array("l") (массивы CSR в CompactGraph)
+_INDEX_DTYPE = np.dtype(f"i{array('l').itemsize}")
+
+
+def _parse_label(token):
+    try:
+        return int(token)
+    except ValueError:
+        return token.decode("utf-8")
+
+
+def _iter_lines(path):
+    """Строки файла, отображенного в память (mmap); пустой файл — без строк."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield from iter(mapped.readline, b"")
+
+
+def parse_graph_file(path):
+    """
+    Потоково разбирает файл графа в CompactGraph.
+
+    Поддерживаемые форматы (определяются по содержимому):
+    - DIMACS .col: строки "c ..." (комментарии), "p edge n m", "e u v";
+      вершины 1..n из строки "p" сохраняются, включая изолированные
+    - список ребер: строки "u v [вес]", комментарии начинаются с "#" или "%"
+
+    Префиксы DIMACS (c, p, e) распознаются, пока не встретилась строка
+    списка ребер без префикса; после нее c, p и e — обычные метки вершин.
+
+    Файл отображается в память и читается построчно; концы ребер сразу
+    записываются в типизированные массивы индексов (без промежуточных
+    списков кортежей). Петли и повторные ребра отбрасываются при построении
+    CSR.
+
+    Args:
+        path (str): Путь к файлу графа.
+
+    Returns:
+        CompactGraph: Граф в компактном представлении.
+
+    Raises:
+        ValueError: Если строку файла не удалось разобрать.
+    """
+    index = {}
+    nodes = []
+    sources = array("l")
+    targets = array("l")
+
+    def vertex(token):
+        label = _parse_label(token)
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(nodes)
+            nodes.append(label)
+        return i
+
+    edge_list = False
+    for number, line in enumerate(_iter_lines(path), start=1):
+        tokens = line.split()
+        if not tokens or tokens[0][:1] in (b"#", b"%"):
+            continue
+        head = tokens[0]
+        if not edge_list:
+            if head == b"c":
+                continue
+            if head == b"p":
+                if len(tokens) < 3:
+                    raise ValueError(f"Строка {number}: некорректный заголовок DIMACS")
+                for label in range(1, int(tokens[2]) + 1):
+                    vertex(str(label).encode())
+                continue
+            if head == b"e" and len(tokens) >= 3:
+                tokens = tokens[1:]
+            else:
+                edge_list = True
+        if len(tokens) < 2:
+            raise ValueError(f"Строка {number}: ожидалось ребро из двух вершин")
+        sources.append(vertex(tokens[0]))
+        targets.append(vertex(tokens[1]))
+
+    return _build_compact(nodes, sources, targets)
+
+
+def _build_compact(nodes, sources, targets):
+    """Строит CSR из массивов концов ребер (без петель и повторов)."""
+    n = len(nodes)
+    u = np.frombuffer(sources, dtype=_INDEX_DTYPE).astype(np.int64)
+    v = np.frombuffer(targets, dtype=_INDEX_DTYPE).astype(np.int64)
+    keep = u != v
+    low, high = np.minimum(u[keep], v[keep]), np.maximum(u[keep], v[keep])
+    keys = np.unique(low * max(n, 1) + high)
+    low, high = keys // max(n, 1), keys % max(n, 1)
+    # Каждое ребро хранится в списках смежности обоих концов
+    rows = np.concatenate([low, high])
+    columns = np.concatenate([high, low])
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return CompactGraph(nodes,
+                        array("l", indptr.astype(_INDEX_DTYPE).tobytes()),
+                        array("l", columns[order].astype(_INDEX_DTYPE).tobytes()))
+
+
+class GraphLibrary:
+    """
+    Хранилище загруженных графов с адресацией по содержимому.
+
+    Файл сохраняется под именем SHA-256 своего содержимого, разобранный
+    граф — рядом (pickle CompactGraph). Повторная загрузка того же файла
+    не требует разбора.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, digest):
+        return (os.path.join(self.directory, f"{digest}.txt"),
+                os.path.join(self.directory, f"{digest}.graph"))
+
+    def save_upload(self, stream):
+        """
+        Потоково сохраняет загруженный файл, вычисляя хеш содержимого.
+
+        Returns:
+            str: Хеш содержимого (идентификатор графа).
+        """
+        digest = hashlib.sha256()
+        temporary = os.path.join(self.directory, f".upload-{os.getpid()}-{id(stream)}")
+        with open(temporary, "wb") as file:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                file.write(chunk)
+        key = digest.hexdigest()
+        source, _ = self._paths(key)
+        if os.path.exists(source):
+            os.remove(temporary)
+        else:
+            os.replace(temporary, source)
+        return key
+
+    def load(self, digest):
+        """
+        Возвращает граф по хешу содержимого, разбирая файл только при первом
+        обращении.
+
+        Raises:
+            KeyError: Если граф с таким хешем не загружался.
+        """
+        source, parsed = self._paths(digest)
+        if os.path.exists(parsed):
+            with open(parsed, "rb") as file:
+                return pickle.load(file)
+        if not os.path.exists(source):
+            raise KeyError(digest)
+        compact = parse_graph_file(source)
+        temporary = f"{parsed}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(compact, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, parsed)
+        return compact
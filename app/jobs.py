@@ -0,0 +1,182 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(RuntimeError):
+    """Превышено допустимое число незавершенных задач."""
+
+
+class Job:
+    """
+    Задача раскраски: набор независимых подзадач (например, по одной на пресет),
+    выполняемых параллельно на общем пуле.
+    """
+    def __init__(self, futures):
+        self.id = uuid.uuid4().hex
+        self.created = time.time()
+        self.finished = None
+        self.futures = futures
+
+    @property
+    def total(self):
+        return len(self.futures)
+
+    @property
+    def completed(self):
+        return sum(future.done() for future in self.futures)
+
+    @property
+    def status(self):
+        """queued, running, done или failed."""
+        if all(future.done() for future in self.futures):
+            if any(future.exception() is not None for future in self.futures):
+                return "failed"
+            return "done"
+        if any(future.running() or future.done() for future in self.futures):
+            return "running"
+        return "queued"
+
+    @property
+    def error(self):
+        for future in self.futures:
+            if future.done() and future.exception() is not None:
+                return str(future.exception())
+        return None
+
+    def results(self):
+        """Результаты подзадач в порядке отправки (только для status == 'done')."""
+        return [future.result() for future in self.futures]
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "created": self.created,
+            "finished": self.finished,
+        }
+        if data["status"] == "done":
+            data["results"] = self.results()
+        elif data["status"] == "failed":
+            data["error"] = self.error
+        return data
+
+
+class StoredJob:
+    """
+    Задача, выполняемая другим рабочим процессом сервера: состояние читается
+    из хранилища (ResultStore.save_job) и предоставляет интерфейс Job.
+    """
+    def __init__(self, state):
+        self.state = state
+
+    @property
+    def id(self):
+        return self.state["id"]
+
+    @property
+    def status(self):
+        return self.state["status"]
+
+    def results(self):
+        return self.state["results"]
+
+    def to_dict(self):
+        return dict(self.state)
+
+
+class JobQueue:
+    """
+    Очередь задач с ограниченным пулом потоков-исполнителей.
+
+    Завершенные задачи хранятся не дольше ttl секунд и не более max_completed
+    штук (вытесняются самые старые). Незавершенных задач может быть не более
+    max_pending, иначе submit возбуждает QueueFull.
+
+    Если задано хранилище store (ResultStore), состояние задачи сохраняется
+    в нем при постановке, запуске и завершении каждой подзадачи. Тогда get
+    находит и задачи, поставленные другими рабочими процессами сервера
+    (gunicorn с несколькими workers); в памяти процесса задача выполняется
+    по-прежнему. Без хранилища опрос должен попадать в тот же процесс.
+    """
+    def __init__(self, max_workers=4, max_pending=64, max_completed=100, ttl=3600, store=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="coloring-job")
+        self.max_pending = max_pending
+        self.max_completed = max_completed
+        self.ttl = ttl
+        self.store = store
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, tasks):
+        """
+        Ставит задачу в очередь.
+
+        Args:
+            tasks (list): Подзадачи — вызываемые объекты без аргументов.
+
+        Returns:
+            str: Идентификатор задачи.
+        """
+        with self._lock:
+            self._evict()
+            pending = sum(job.finished is None for job in self._jobs.values())
+            if pending >= self.max_pending:
+                raise QueueFull("Слишком много задач в очереди, повторите попытку позже")
+            holder = []
+            job = Job([self.executor.submit(self._run, holder, task) for task in tasks])
+            holder.append(job)
+            self._jobs[job.id] = job
+            state = job.to_dict()
+        if self.store is not None:
+            self.store.delete_jobs(time.time() - self.ttl)
+            self.store.save_job(state)
+        for future in job.futures:
+            future.add_done_callback(lambda _, job=job: self._mark_finished(job))
+        return job.id
+
+    def get(self, job_id):
+        """
+        Задача по идентификатору: Job этого процесса, StoredJob из хранилища
+        или None, если задача неизвестна (или уже удалена).
+        """
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            state = self.store.load_job(job_id)
+            if state is not None:
+                job = StoredJob(state)
+        return job
+
+    def _run(self, holder, task):
+        # Подзадача может начаться до того, как submit создаст Job: ждем его под блокировкой
+        with self._lock:
+            job = holder[0]
+        self._persist(job)
+        return task()
+
+    def _persist(self, job):
+        if self.store is not None:
+            with self._lock:
+                state = job.to_dict()
+            self.store.save_job(state)
+
+    def _mark_finished(self, job):
+        with self._lock:
+            if job.finished is None and all(future.done() for future in job.futures):
+                job.finished = time.time()
+        self._persist(job)
+
+    def _evict(self):
+        now = time.time()
+        completed = [job for job in self._jobs.values() if job.finished is not None]
+        excess = len(completed) - self.max_completed
+        for job in completed:
+            if excess > 0 or now - job.finished > self.ttl:
+                del self._jobs[job.id]
+                excess -= 1
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Профилировщики, включаемые флагом запроса (см. profile)
+PROFILERS = ("cprofile", "tracemalloc")
+# Число строк отчета профилировщика
+PROFILE_TOP = 30
+
+# Счетчики собираются для каждого потока отдельно: в процессе решателя
+# выполняется один алгоритм, а при последовательном запуске решатели разных
+# задач работают в потоках пула задач
+_local = threading.local()
+
+
+class SolverMetrics:
+    """
+    Счетчики и таймеры этапов одного запуска алгоритма.
+
+    Алгоритмы не увеличивают счетчики на каждом шаге горячего цикла: они
+    считают шаги в локальных переменных и добавляют итог один раз за
+    поколение или запуск, поэтому без активного сбора (collect) накладные
+    расходы сводятся к одной проверке.
+    """
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = defaultdict(float)
+
+    def to_dict(self):
+        """Показатели в сериализуемом виде (секунды таймеров округлены до мкс)."""
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: round(seconds, 6) for name, seconds in self.timers.items()},
+        }
+
+
+def current():
+    """Активный сборщик показателей текущего потока или None."""
+    return getattr(_local, "metrics", None)
+
+
+@contextmanager
+def collect():
+    """
+    Включает сбор показателей в текущем потоке.
+
+    Yields:
+        SolverMetrics: Сборщик, получающий счетчики и таймеры алгоритмов.
+    """
+    previous = current()
+    metrics = _local.metrics = SolverMetrics()
+    try:
+        yield metrics
+    finally:
+        _local.metrics = previous
+
+
+def count(name, value=1):
+    """Увеличивает счетчик name активного сборщика (без сборщика ничего не делает)."""
+    metrics = current()
+    if metrics is not None:
+        metrics.counters[name] += value
+
+
+def add_time(name, seconds):
+    """Добавляет время к таймеру этапа name активного сборщика."""
+    metrics = current()
+    if metrics is not None:
+        metrics.timers[name] += seconds
+
+
+@contextmanager
+def phase(name):
+    """Измеряет время блока как этап name (time.perf_counter)."""
+    metrics = current()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timers[name] += time.perf_counter() - start
+
+
+def _cprofile_report(profiler):
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+    return {
+        "kind": "cprofile",
+        "total_time": round(stats.total_tt, 6),
+        "functions": [
+            {"function": f"{filename}:{line}({function})", "calls": calls,
+             "primitive_calls": primitive_calls, "total_time": round(total_time, 6),
+             "cumulative_time": round(cumulative_time, 6)}
+            for (filename, line, function), (primitive_calls, calls, total_time, cumulative_time, _)
+            in rows
+        ],
+    }
+
+
+def _tracemalloc_report(snapshot, current_size, peak_size):
+    return {
+        "kind": "tracemalloc",
+        "current": current_size,
+        "peak": peak_size,
+        "allocations": [
+            {"location": str(statistic.traceback[0]), "size": statistic.size, "count": statistic.count}
+            for statistic in snapshot.statistics("lineno")[:PROFILE_TOP]
+        ],
+    }
+
+
+# cProfile допускает один активный профилировщик на процесс (Python 3.12+),
+# а tracemalloc отслеживает весь процесс: блок профилируется, только если
+# профилировщик этого вида свободен
+_profile_locks = {kind: threading.Lock() for kind in PROFILERS}
+
+
+@contextmanager
+def profile(kind, report):
+    """
+    Профилирует блок и записывает отчет в словарь report.
+
+    cprofile — PROFILE_TOP функций с наибольшим суммарным временем,
+    tracemalloc — пиковый объем памяти и PROFILE_TOP строк с наибольшим
+    объемом выделений. tracemalloc отслеживает весь процесс, поэтому
+    точный отчет получается при запуске алгоритма в отдельном процессе.
+
+    Профилировщик каждого вида одновременно работает только в одном потоке
+    процесса. Если он занят (другим потоком или сторонним инструментом),
+    блок выполняется без профилирования, а отчет содержит kind и error:
+    конфликт профилировщиков не считается ошибкой алгоритма.
+
+    Args:
+        kind (str or None): Один из PROFILERS; None — без профилирования.
+        report (dict): Словарь, дополняемый отчетом после выхода из блока.
+
+    Raises:
+        ValueError: Неизвестный профилировщик.
+    """
+    if kind is None:
+        yield
+        return
+    if kind not in PROFILERS:
+        raise ValueError(f"Неизвестный профилировщик: {kind}")
+    lock = _profile_locks[kind]
+    if not lock.acquire(blocking=False):
+        report.update({"kind": kind, "error": "Профилировщик уже используется другим алгоритмом процесса"})
+        yield
+        return
+    try:
+        if kind == "cprofile":
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as error:
+                # Активен другой профилировщик (sys.setprofile или sys.monitoring)
+                report.update({"kind": kind, "error": str(error)})
+                yield
+                return
+            try:
+                yield
+            finally:
+                profiler.disable()
+                report.update(_cprofile_report(profiler))
+        else:
+            import tracemalloc
+
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                current_size, peak_size = tracemalloc.get_traced_memory()
+                if started:
+                    tracemalloc.stop()
+                report.update(_tracemalloc_report(snapshot, current_size, peak_size))
+    finally:
+        lock.release()
@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+
+from app import metrics
+
+
+# Модули алгоритмов заранее импортируются в процесс forkserver, поэтому
+# процессы решателей стартуют без повторного импорта. networkx и numpy сами
+# модули решателей загружают лениво, но решателям они нужны всегда
+_PRELOAD = ["networkx", "numpy", "app.exact", "app.decompose", "app.portfolio", "app.batch",
+            "app.algorithms.genetic", "app.algorithms.immune", "app.algorithms.tabucol"]
+
+
+def _get_context():
+    """
+    Контекст multiprocessing для процессов решателей.
+
+    Решатели запускаются из потоков пула задач, поэтому fork небезопасен;
+    используется forkserver (или spawn, где он недоступен).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_PRELOAD)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def run_solver(solver, graph, profile=None):
+    """
+    Запускает алгоритм раскраски и измеряет время внутри текущего процесса.
+
+    Во время работы алгоритма собираются его счетчики и таймеры этапов
+    (см. app.metrics); они возвращаются вместе с результатом, поэтому
+    переходят границу процесса решателя.
+
+    Args:
+        profile (str, optional): Профилировщик из metrics.PROFILERS.
+
+    Returns:
+        dict: status ("ok" или "error"), solution (раскраска или None),
+            time (секунды, time.perf_counter), cpu_time (секунды,
+            time.process_time), error (текст ошибки или None), metrics
+            (счетчики и таймеры) и profile (отчет профилировщика или None).
+    """
+    report = {}
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with metrics.collect() as collected:
+        try:
+            with metrics.profile(profile, report):
+                solution, status, error = solver(graph), "ok", None
+        except Exception as exc:
+            solution, status, error = None, "error", str(exc)
+    return {
+        "status": status,
+        "solution": solution,
+        "time": time.perf_counter() - wall_start,
+        "cpu_time": time.process_time() - cpu_start,
+        "error": error,
+        "metrics": collected.to_dict(),
+        "profile": report or None,
+    }
+
+
+def _solver_process(connection, solver, graph, profile):
+    # Своя группа процессов: при превышении лимита времени вместе с решателем
+    # завершаются и его рабочие процессы (пулы decomposed_coloring и островов)
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    connection.send(run_solver(solver, graph, profile))
+    connection.close()
+
+
+def _kill_solver(process):
+    """Завершает процесс решателя вместе с его группой процессов (SIGTERM)."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            return
+        except (ProcessLookupError, PermissionError):
+            # Процесс еще не создал свою группу: дочерних процессов у него нет
+            pass
+    process.terminate()
+
+
+def run_solvers_concurrently(graph, solvers, timeouts=None, profile=None):
+    """
+    Запускает несколько алгоритмов раскраски одновременно в отдельных процессах.
+
+    Время каждого алгоритма измеряется внутри его процесса (см. run_solver).
+    Процесс, не уложившийся в свой лимит времени, принудительно завершается
+    вместе со своими дочерними процессами (_kill_solver), а алгоритм получает
+    статус "timeout".
+
+    Args:
+        graph (networkx.Graph): Граф, который необходимо раскрасить.
+        solvers (dict): Словарь (имя: алгоритм solver(graph) -> dict); алгоритмы
+            должны сериализоваться (функции модулей или functools.partial).
+        timeouts (dict, optional): Лимиты времени в секундах по именам алгоритмов.
+        profile (str, optional): Профилировщик каждого процесса (см. run_solver).
+
+    Returns:
+        dict: Результаты run_solver по именам алгоритмов.
+    """
+    timeouts = timeouts or {}
+    context = _get_context()
+    started = time.monotonic()
+    processes, pending, deadlines = {}, {}, {}
+    for name, solver in solvers.items():
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_solver_process, args=(sender, solver, graph, profile),
+                                  name=f"solver-{name}")
+        process.start()
+        sender.close()
+        processes[name] = process
+        pending[receiver] = name
+        if timeouts.get(name) is not None:
+            deadlines[name] = started + timeouts[name]
+
+    results = {}
+    while pending:
+        active = [deadlines[name] for name in pending.values() if name in deadlines]
+        remaining = max(0.0, min(active) - time.monotonic()) if active else None
+        for receiver in wait(list(pending), timeout=remaining):
+            name = pending.pop(receiver)
+            try:
+                results[name] = receiver.recv()
+            except EOFError:
+                results[name] = {"status": "error", "solution": None, "time": time.monotonic() - started,
+                                 "cpu_time": None, "error": "Процесс алгоритма завершился аварийно",
+                                 "metrics": None, "profile": None}
+            receiver.close()
+        now = time.monotonic()
+        for receiver, name in list(pending.items()):
+            if name in deadlines and now >= deadlines[name]:
+                _kill_solver(processes[name])
+                del pending[receiver]
+                receiver.close()
+                results[name] = {"status": "timeout", "solution": None, "time": timeouts[name],
+                                 "cpu_time": None, "error": f"Превышен лимит времени {timeouts[name]} с",
+                                 "metrics": None, "profile": None}
+
+    for process in processes.values():
+        process.join()
+    return {name: results[name] for name in solvers}
@@ -0,0 +1,72 @@
+import io
+import base64
+
+# matplotlib загружается только при первом построении графика; используется
+# объектный API (Figure) с бэкендом Agg: pyplot не инициализируется, отрисовка
+# безопасна в фоновых потоках и не требует дисплея
+
+
+def _figure():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _png(figure):
+    buf = io.BytesIO()
+    figure.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def generate_bar_chart(data, title, xlabel, ylabel):
+    """
+    Генерирует бар-чарт по данным словаря data и возвращает изображение в формате base64.
+    :param data: словарь (например, {'Exact': 0.01, 'Genetic': 0.51, ...})
+    """
+    figure = _figure()
+    axes = figure.add_subplot()
+    axes.bar(list(data.keys()), list(data.values()), color='skyblue')
+    axes.set_title(title)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
+    return base64.b64encode(_png(figure)).decode("utf-8")
+
+
+def generate_line_chart(history_data, title, xlabel, ylabel):
+    """
+    Генерирует линейный график по накопленным данным из history_data
+    и возвращает изображение в формате base64.
+    :param history_data: словарь вида {'Exact': [v1, v2, ...], ...}
+    """
+    figure = _figure()
+    axes = figure.add_subplot()
+    for algo, values in history_data.items():
+        axes.plot(range(1, len(values) + 1), values, marker='o', label=algo)
+    axes.set_title(title)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
+    axes.legend()
+    return base64.b64encode(_png(figure)).decode("utf-8")
+
+
+def generate_custom_line_chart(series, title, xlabel, ylabel):
+    """
+    Генерирует линейный график с использованием количества вершин по оси X
+    и возвращает изображение PNG.
+
+    Args:
+        series (dict): Словарь (алгоритм: (количества вершин, значения)),
+            см. ResultStore.history.
+    """
+    figure = _figure()
+    axes = figure.add_subplot()
+    for algo, (nodes_counts, values) in series.items():
+        if len(values) > 0:  # Проверяем, что массив значений не пустой
+            axes.plot(nodes_counts, values, marker='o', label=algo)
+    axes.set_title(title)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
+    axes.legend()
+    return _png(figure)
@@ -0,0 +1,170 @@
+import time
+
+from app import metrics
+from app.algorithms.compact import CompactGraph
+from app.algorithms.genetic import genetic_coloring
+from app.algorithms.greedy import GREEDY_RESTARTS, STRATEGIES, best_greedy
+from app.algorithms.immune import immune_coloring
+from app.decompose import reinsert_peeled, split_components
+from app.exact import clique_lower_bound, exact_search, get_count_colors
+
+# Доли оставшегося бюджета времени для этапов портфеля
+GREEDY_SHARE = 0.1
+EXACT_PROBE_SHARE = 0.1
+GENETIC_SHARE = 0.3
+IMMUNE_SHARE = 0.3
+
+
+def _search(graph, deadline, seed, lower_bound, target, record):
+    """
+    Этапы портфеля на одном графе (компоненте связности).
+
+    Args:
+        graph (networkx.Graph): Граф.
+        deadline (float): Момент окончания бюджета (time.perf_counter).
+        seed (int, optional): Зерно эвристических алгоритмов.
+        lower_bound (int): Нижняя граница хроматического числа графа.
+        target (int): Число цветов, улучшать которое не требуется (не меньше
+            lower_bound; для компоненты — наибольшее число цветов уже
+            раскрашенных компонент).
+        record (callable): Учет этапа record(solver, coloring, began).
+
+    Returns:
+        tuple: Лучшая раскраска, доказана ли ее оптимальность, этап, нашедший ее.
+    """
+    def remaining():
+        return max(0.0, deadline - time.perf_counter())
+
+    began = time.perf_counter()
+    compact = CompactGraph.from_networkx(graph)
+    colors, solver = best_greedy(compact.adj, STRATEGIES, GREEDY_RESTARTS, seed, remaining() * GREEDY_SHARE)
+    best = compact.to_labels(colors)
+    record("greedy", best, began)
+    proven = get_count_colors(best) <= lower_bound
+
+    def finished():
+        return proven or get_count_colors(best) <= target or remaining() <= 0
+
+    if not proven and get_count_colors(best) > target:
+        began = time.perf_counter()
+        coloring, proven = exact_search(graph, remaining() * EXACT_PROBE_SHARE, initial_coloring=best)
+        record("exact", coloring, began)
+        if get_count_colors(coloring) < get_count_colors(best):
+            best, solver = coloring, "exact"
+
+    for name, coloring_function, share in (("genetic", genetic_coloring, GENETIC_SHARE),
+                                           ("immune", immune_coloring, IMMUNE_SHARE)):
+        if finished():
+            break
+        began = time.perf_counter()
+        coloring = coloring_function(graph, {"seed": seed, "initial_coloring": best,
+                                             "lower_bound": target,
+                                             "time_limit": remaining() * share})
+        record(name, coloring, began)
+        if get_count_colors(coloring) < get_count_colors(best):
+            best, solver = coloring, name
+
+    if not finished():
+        began = time.perf_counter()
+        coloring, proven = exact_search(graph, remaining(), initial_coloring=best)
+        record("exact", coloring, began)
+        if get_count_colors(coloring) < get_count_colors(best):
+            best, solver = coloring, "exact"
+
+    return best, proven or get_count_colors(best) <= lower_bound, solver
+
+
+def portfolio_search(graph, time_limit=10.0, seed=None):
+    """
+    Портфельная раскраска графа с результатом в любой момент (anytime).
+
+    Сначала граф декомпозируется так же, как в decomposed_coloring: нижняя
+    граница — размер эвристически найденной клики, вершины со степенью меньше
+    нее удаляются (peel_low_degree), а остаток разбивается на компоненты
+    связности. Компоненты решаются по убыванию размера, каждая получает долю
+    оставшегося бюджета, пропорциональную числу вершин, и улучшается только
+    до наибольшего числа цветов уже раскрашенных компонент. Удаленные
+    вершины затем возвращаются (reinsert_peeled) без новых цветов.
+
+    Этапы на компоненте выполняются по возрастанию стоимости, каждый
+    начинает с лучшей найденной раскраски:
+    1. Лучшая из жадных раскрасок (best_greedy: все стратегии и случайные
+       перезапуски, пока не истекла доля GREEDY_SHARE бюджета). Если она
+       достигла нижней границы, раскраска оптимальна и возвращается сразу.
+    2. Короткий запуск точного алгоритма (EXACT_PROBE_SHARE бюджета):
+       небольшие графы решаются на этом этапе.
+    3. Генетический алгоритм с локальным поиском TabuCol (GENETIC_SHARE).
+    4. Иммунный алгоритм (IMMUNE_SHARE).
+    5. Точный алгоритм на оставшееся время с лучшей раскраской в качестве
+       верхней границы.
+    Поиск прекращается, как только раскраска достигает нижней границы или
+    ее оптимальность доказана точным алгоритмом. Время этапов суммируется
+    в таймерах portfolio.<этап> (app.metrics), счетчики этапов собираются
+    самими алгоритмами.
+
+    Args:
+        graph (networkx.Graph): Граф, который необходимо раскрасить.
+        time_limit (float): Общий бюджет времени в секундах.
+        seed (int, optional): Зерно эвристических алгоритмов.
+
+    Returns:
+        dict: coloring — лучшая корректная раскраска, colors — число ее
+            цветов, lower_bound — доказанная нижняя граница, gap — разность
+            colors - lower_bound (0 — оптимальность доказана), proven,
+            solver — этап, нашедший раскраску компоненты с наибольшим числом
+            цветов, stages — список этапов всех компонент (solver, colors,
+            time), time — общее время.
+    """
+    start = time.perf_counter()
+    deadline = start + time_limit
+    stages = []
+
+    def record(solver, coloring, began):
+        elapsed = time.perf_counter() - began
+        metrics.add_time(f"portfolio.{solver}", elapsed)
+        stages.append({"solver": solver, "colors": get_count_colors(coloring),
+                       "time": round(elapsed, 4)})
+
+    began = time.perf_counter()
+    lower_bound = max(1, clique_lower_bound(graph)) if graph.number_of_nodes() else 0
+    components, removed = split_components(graph, lower_bound)
+    components.sort(key=len, reverse=True)
+    metrics.add_time("portfolio.decompose", time.perf_counter() - began)
+
+    coloring = {}
+    # Наибольшее число цветов среди раскрашенных компонент и доказана ли его оптимальность
+    colors, proven, solver = 0, False, "greedy"
+    unsolved = sum(map(len, components))
+    for component in components:
+        now = time.perf_counter()
+        budget = max(0.0, deadline - now) * len(component) / unsolved
+        unsolved -= len(component)
+        if len(component) == graph.number_of_nodes():
+            component_bound = lower_bound
+        else:
+            component_bound = max(1, clique_lower_bound(component))
+        best, component_proven, component_solver = _search(component, now + budget, seed, component_bound,
+                                                           max(lower_bound, colors), record)
+        coloring.update(best)
+        count = get_count_colors(best)
+        if count > colors:
+            colors, proven, solver = count, component_proven, component_solver
+        elif count == colors:
+            proven = proven or component_proven
+    reinsert_peeled(graph, coloring, removed)
+
+    # Удаленные вершины не добавляют цветов сверх max(colors, lower_bound)
+    proven = (proven and get_count_colors(coloring) == colors) or get_count_colors(coloring) <= lower_bound
+    colors = get_count_colors(coloring)
+    if proven:
+        lower_bound = colors
+    return {
+        "coloring": coloring,
+        "colors": colors,
+        "lower_bound": lower_bound,
+        "gap": colors - lower_bound,
+        "proven": proven,
+        "solver": solver,
+        "stages": stages,
+        "time": round(time.perf_counter() - start, 4),
+    }
@@ -0,0 +1,167 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.algorithms.compact import CompactGraph
+
+# Графы не больше этого размера раскладываются nx.spring_layout
+SPRING_LAYOUT_MAX_NODES = 300
+# Графы больше этого размера не отрисовываются
+MAX_RENDER_NODES = 5000
+# Подписи вершин выводятся только для небольших графов
+LABELS_MAX_NODES = 32
+
+
+def fast_layout(compact, iterations=50, seed=0, chunk=256, samples=256):
+    """
+    Векторизованная укладка Фрюхтермана — Рейнгольда на NumPy.
+
+    Отталкивание считается блоками по chunk вершин. Для графов больше
+    4 * samples вершин оно оценивается по случайной выборке из samples вершин
+    на каждой итерации (с масштабированием), что снижает стоимость итерации
+    с O(n^2) до O(n * samples). Притяжение считается по массиву ребер CSR
+    за один проход.
+
+    Returns:
+        numpy.ndarray: Координаты вершин (n, 2) в порядке compact.nodes.
+    """
+    n = compact.num_nodes
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, 2))
+    if n < 2:
+        return positions
+    indptr = np.asarray(compact.indptr, dtype=np.int64)
+    sources = np.repeat(np.arange(n), np.diff(indptr))
+    targets = np.asarray(compact.indices, dtype=np.int64)
+    k = 1.0 / np.sqrt(n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+        if n > 4 * samples:
+            others = positions[rng.choice(n, size=samples, replace=False)]
+            scale = n / samples
+        else:
+            others, scale = positions, 1.0
+        for start in range(0, n, chunk):
+            delta = positions[start:start + chunk, None, :] - others[None, :, :]
+            distance2 = np.maximum((delta ** 2).sum(axis=-1), 1e-9)
+            displacement[start:start + chunk] += scale * (delta * (k * k / distance2)[..., None]).sum(axis=1)
+        delta = positions[sources] - positions[targets]
+        distance = np.sqrt((delta ** 2).sum(axis=-1))[:, None]
+        np.add.at(displacement, sources, -delta * distance / k)
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=-1)), 1e-9)[:, None]
+        positions += displacement / length * np.minimum(length, temperature)
+        temperature -= cooling
+    return positions
+
+
+def compute_layout(graph, compact):
+    """Укладка графа: spring_layout для небольших графов, fast_layout для крупных."""
+    if compact.num_nodes <= SPRING_LAYOUT_MAX_NODES:
+        import networkx as nx
+        layout = nx.spring_layout(graph, seed=0)
+        return np.array([layout[node] for node in compact.nodes]).reshape(-1, 2)
+    return fast_layout(compact)
+
+
+def render_coloring(compact, positions, coloring, path):
+    """
+    Отрисовывает раскраску в файл (формат по расширению: png или svg).
+
+    Используется объектный API matplotlib без pyplot, поэтому отрисовка
+    безопасна в фоновых потоках. Ребра рисуются одной LineCollection,
+    вершины — одним scatter.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+
+    n = compact.num_nodes
+    indptr = np.asarray(compact.indptr, dtype=np.int64)
+    sources = np.repeat(np.arange(n), np.diff(indptr))
+    targets = np.asarray(compact.indices, dtype=np.int64)
+    forward = sources < targets
+    segments = np.stack([positions[sources[forward]], positions[targets[forward]]], axis=1)
+    colors = [coloring[node] for node in compact.nodes]
+
+    figure = Figure(figsize=(8, 6))
+    axes = figure.add_subplot()
+    axes.set_axis_off()
+    large = n > LABELS_MAX_NODES
+    axes.add_collection(LineCollection(segments, colors="black",
+                                       linewidths=0.2 if large else 1.0,
+                                       alpha=0.3 if large else 1.0, zorder=1))
+    axes.scatter(positions[:, 0], positions[:, 1], c=colors, cmap="jet",
+                 s=max(2.0, min(300.0, 30000.0 / max(n, 1))), zorder=2)
+    if not large:
+        for node, (x, y) in zip(compact.nodes, positions):
+            axes.annotate(str(node), (x, y), ha="center", va="center", fontsize=10, zorder=3)
+    axes.autoscale_view()
+    figure.savefig(path)
+
+
+class GraphRenderer:
+    """
+    Фоновая отрисовка раскрасок.
+
+    Укладка вычисляется один раз на граф и используется для всех алгоритмов
+    запуска. Изображения сохраняются в отдельный каталог запуска
+    (directory/<run_id>/<алгоритм>.<формат>), поэтому одновременные
+    пользователи не перезаписывают файлы друг друга. Хранятся каталоги
+    последних keep_runs запусков.
+    """
+    def __init__(self, directory, formats=("png",), max_workers=1, keep_runs=50):
+        self.directory = directory
+        self.formats = formats
+        self.keep_runs = keep_runs
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-render")
+        self._runs = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def submit(self, run_id, graph, solutions):
+        """
+        Ставит отрисовку раскрасок запуска в очередь.
+
+        Args:
+            run_id (int): Идентификатор запуска.
+            graph (networkx.Graph): Граф.
+            solutions (dict): Раскраски по именам алгоритмов (None пропускаются).
+
+        Returns:
+            bool: False, если граф слишком большой для отрисовки.
+        """
+        if graph.number_of_nodes() > MAX_RENDER_NODES:
+            return False
+        solutions = {name: solution for name, solution in solutions.items() if solution is not None}
+        self.executor.submit(self._render, run_id, graph, solutions)
+        return True
+
+    def path(self, run_id, algorithm, fmt="png"):
+        """Путь к изображению или None, если оно еще не готово или удалено."""
+        path = os.path.join(self.directory, str(run_id), f"{algorithm.lower()}.{fmt}")
+        return path if os.path.exists(path) else None
+
+    def _render(self, run_id, graph, solutions):
+        compact = CompactGraph.from_networkx(graph)
+        positions = compute_layout(graph, compact)
+        run_dir = os.path.join(self.directory, str(run_id))
+        os.makedirs(run_dir, exist_ok=True)
+        for name, solution in solutions.items():
+            for fmt in self.formats:
+                # Запись во временный файл и переименование: файл появляется целиком
+                target = os.path.join(run_dir, f"{name.lower()}.{fmt}")
+                temporary = os.path.join(run_dir, f".{name.lower()}.tmp.{fmt}")
+                render_coloring(compact, positions, solution, temporary)
+                os.replace(temporary, target)
+        self._forget_old_runs(run_dir)
+
+    def _forget_old_runs(self, run_dir):
+        with self._lock:
+            self._runs.append(run_dir)
+            stale, self._runs = self._runs[:-self.keep_runs], self._runs[-self.keep_runs:]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
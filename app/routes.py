@@ -1,74 +1,72 @@
 import os
-import time
 import json
-from flask import Blueprint, request, render_template, send_file
+import logging
+import time
+from functools import lru_cache, partial
+from flask import Blueprint, request, render_template, send_file, redirect, url_for, jsonify, Response
 
 from app.algorithms.genetic import genetic_coloring
 from app.algorithms.immune import immune_coloring
-from app.exact import exact_coloring, compare_solutions, get_count_colors, null_coloring, greedy_coloring
-from app.utils import generate_line_chart
+from app.algorithms.compact import canonical_nodes, graph_fingerprint
+from app.exact import (clique_lower_bound, count_conflicts, edge_array, get_count_colors, greedy_coloring,
+                       solution_accuracy)
+from app.portfolio import portfolio_search
+from app.batch import iter_batch, parse_batch
+from app.decompose import decomposed_coloring
+from app.jobs import JobQueue, QueueFull
+from app.metrics import PROFILERS
+from app.parallel import run_solver, run_solvers_concurrently
+from app.storage import ResultStore
+from app.charts import ChartCache
+from app.rendering import GraphRenderer
+from app.ingest import GraphLibrary
 import networkx as nx
 
 main = Blueprint('main', __name__)
+logger = logging.getLogger(__name__)
+
+# Хранилище истории результатов (SQLite, общее для всех рабочих процессов)
+DB_PATH = os.environ.get('GAAAIS_DB', os.path.join(os.getcwd(), 'results.db'))
+store = ResultStore(DB_PATH)
+# Графики истории строятся по требованию и кэшируются до новых результатов
+charts = ChartCache(store)
+
+# Очередь задач раскраски: POST на / ставит задачу и сразу возвращает ее идентификатор
+# (состояние задач хранится в store, поэтому опрос обслуживает любой рабочий процесс)
+jobs = JobQueue(max_workers=4, store=store)
 
-# Глобальные переменные для истории результатов
-global_history_timings = {}
-global_history_accuracy = {}
-global_colors_chart = {}
-# Глобальная переменная для хранения количества вершин в каждом запуске
-global_nodes_count = []
+# Лимит времени (секунды) на каждый алгоритм при параллельном запуске
+SOLVER_TIMEOUT = 120
+# Бюджет времени портфельного решателя (эталон вместо точного алгоритма):
+# по его исчерпании возвращается лучшая найденная раскраска
+PORTFOLIO_TIME_LIMIT = 30
 
-# Директория для сохранения графов (png)
+# Директория для сохранения графов: отрисовка выполняется в фоне, по каталогу на запуск
 GRAPH_DIR = os.path.join(os.getcwd(), 'graphs')
-os.makedirs(GRAPH_DIR, exist_ok=True)
+GRAPH_FORMATS = tuple(os.environ.get('GAAAIS_GRAPH_FORMATS', 'png').split(','))
+renderer = GraphRenderer(GRAPH_DIR, formats=GRAPH_FORMATS)
 
-def generate_random_graph(nodes_count):
-    """Генерирует случайный граф с заданным количеством узлов."""
-    prob = 0.3
-    return nx.gnp_random_graph(nodes_count, prob)
+# Загруженные графы (DIMACS .col, списки ребер), адресуемые хешем содержимого
+UPLOAD_DIR = os.path.join(os.getcwd(), 'uploads')
+graph_library = GraphLibrary(UPLOAD_DIR)
 
-def draw_graph(graph, coloring, filename):
-    """Отрисовывает граф с раскраской и сохраняет его в файл.
-    
-    Ограничение: графы с более чем 32 вершинами не отрисовываются 
-    из-за высокой ресурсоёмкости и низкой информативности визуализации.
-    """
-    # Если в графе больше 32 вершин, не рисуем его
-    if len(graph.nodes) > 32:
-        print(f">>> Граф с {len(graph.nodes)} вершинами слишком большой для отрисовки")
-        return
-
-    import matplotlib.pyplot as plt
-    colors = [coloring[node] for node in graph.nodes]
-    plt.figure(figsize=(8, 6))
-    nx.draw(graph, node_color=colors, with_labels=True, cmap=plt.cm.jet)
-    file_path = os.path.join(GRAPH_DIR, filename)
-    plt.savefig(file_path)
-    plt.close()
-
-def generate_custom_line_chart(history_data, nodes_counts, title, xlabel, ylabel):
+@lru_cache(maxsize=32)
+def _seeded_random_graph(nodes_count, seed, prob):
+    return nx.gnp_random_graph(nodes_count, prob, seed=seed)
+
+def generate_random_graph(nodes_count, seed=None, prob=0.3):
     """
-    Генерирует линейный график с использованием количества вершин по оси X.
+    Генерирует случайный граф с заданным количеством узлов.
+
+    Графы с заданным зерном воспроизводимы и кэшируются (LRU): повторный
+    запрос возвращает копию уже построенного графа.
     """
-    import matplotlib.pyplot as plt
-    import io
-    import base64
-    
-    plt.figure()
-    for algo, values in history_data.items():
-        if len(values) > 0:  # Проверяем, что массив значений не пустой
-            plt.plot(nodes_counts[-len(values):], values, marker='o', label=algo)
-    plt.title(title)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.legend()
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    plt.close()
-    buf.seek(0)
-    return base64.b64encode(buf.getvalue()).decode("utf-8")
-
-def run_coloring_algorithms(nodes_count, use_greedy=False):
+    if seed is None:
+        return nx.gnp_random_graph(nodes_count, prob)
+    return _seeded_random_graph(nodes_count, seed, prob).copy()
+
+def run_coloring_algorithms(nodes_count, use_greedy=False, concurrent=True, timeout=SOLVER_TIMEOUT, graph=None,
+                            seed=None, profile=None):
     """
     Запускает алгоритмы раскраски графа с заданным количеством вершин.
     Возвращает результаты и обновляет глобальные данные истории.
@@ -76,88 +74,174 @@ def run_coloring_algorithms(nodes_count, use_greedy=False):
     Args:
         nodes_count (int): Количество вершин в графе.
         use_greedy (bool): Использовать жадный алгоритм вместо точного.
+        concurrent (bool): Запускать алгоритмы одновременно в отдельных процессах.
+        timeout (float): Лимит времени каждого алгоритма в параллельном режиме;
+            алгоритм, превысивший его, прерывается, и вместо его результатов
+            возвращается None.
+        graph (networkx.Graph, optional): Готовый граф вместо случайного.
+        seed (int, optional): Зерно случайного графа.
+        profile (str, optional): Профилировщик алгоритмов (см. app.metrics.PROFILERS).
+    
+    Решения сохраняются в хранилище по отпечатку графа (graph_fingerprint).
+    Для уже встречавшегося графа доказанно оптимальная раскраска точного
+    алгоритма берется из кэша без повторного решения, а лучшая известная
+    раскраска используется как начальная для генетического алгоритма.
+    
+    Показатели запуска — время этапов (phases) и счетчики, таймеры и отчеты
+    профилировщика каждого алгоритма (solvers) — сохраняются вместе
+    с результатами и доступны по адресу /runs/<run_id>/metrics.
+    
+    Returns:
+        tuple: Время, точность и число цветов по алгоритмам, идентификатор
+            запуска, число конфликтов по алгоритмам (0 — раскраска корректна).
     """
-    # Вывод информации о количестве вершин в текущей задаче
-    print(f">>> Обработка графа с {nodes_count} вершинами...")
+    logger.info("Обработка графа с %d вершинами", nodes_count)
+    phases = {}
+    started = time.perf_counter()
     
-    graph = generate_random_graph(nodes_count)
+    if graph is None:
+        graph = generate_random_graph(nodes_count, seed)
+    fingerprint = graph_fingerprint(graph)
+    nodes = canonical_nodes(graph)
     
-    # Пустые параметры для алгоритмов
+    # Параметры алгоритмов: лучшая известная раскраска ускоряет генетический алгоритм
     genetic_params = {}
     immune_params = {}
+    known = store.best_solution(fingerprint, nodes)
+    if known is not None:
+        genetic_params["initial_coloring"] = known[0]
+        if known[1]:
+            # Хроматическое число известно: генетический алгоритм останавливается, достигнув его
+            genetic_params["lower_bound"] = get_count_colors(known[0])
     
-    solutions = {}
-    timings = {}
-    
-    # Выбор алгоритма раскраски (точный или жадный)
-    coloring_algorithm = greedy_coloring if use_greedy else exact_coloring
+    # Эталонный алгоритм: жадный или портфель (границы, эвристики, точный
+    # алгоритм в пределах бюджета времени) вместо блокирующего точного
     algorithm_name = "Greedy" if use_greedy else "Exact"
+    if use_greedy:
+        reference_solver = partial(decomposed_coloring, solver=greedy_coloring)
+    else:
+        time_limit = PORTFOLIO_TIME_LIMIT if not timeout else min(PORTFOLIO_TIME_LIMIT, timeout / 2)
+        reference_solver = partial(portfolio_search, time_limit=time_limit, seed=seed)
     
-    # Запуск выбранного алгоритма
-    start_time = time.time()
-    exact_solution = coloring_algorithm(graph)
-    timings[algorithm_name] = round(time.time() - start_time, 4)
-    solutions[algorithm_name] = exact_solution
-
-    # Генетический алгоритм
-    start_time = time.time()
-    genetic_solution = genetic_coloring(graph, genetic_params)
-    timings['Genetic'] = round(time.time() - start_time, 4)
-    solutions['Genetic'] = genetic_solution
-
-    # Алгоритм иммунной сети
-    start_time = time.time()
-    immune_solution = immune_coloring(graph, immune_params)
-    timings['Immune'] = round(time.time() - start_time, 4)
-    solutions['Immune'] = immune_solution
-
-    accuracy = {
-        algorithm_name: 100,
-        'Genetic': compare_solutions(exact_solution, genetic_solution),
-        'Immune': compare_solutions(exact_solution, immune_solution)
+    solvers = {
+        algorithm_name: reference_solver,
+        'Genetic': partial(decomposed_coloring, solver=partial(genetic_coloring, params=genetic_params)),
+        'Immune': partial(immune_coloring, params=immune_params),
+    }
+    
+    # Доказанно оптимальная раскраска уже известна: точный алгоритм не запускается
+    cached = {}
+    if not use_greedy:
+        exact_known = store.best_solution(fingerprint, nodes, algorithm_name)
+        if exact_known is not None and exact_known[1]:
+            del solvers[algorithm_name]
+            # Время не измерялось (None): такой запуск не учитывается в истории времени
+            cached[algorithm_name] = {"status": "cached", "solution": exact_known[0],
+                                      "time": None, "cpu_time": None, "error": None}
+    
+    # Время и счетчики измеряются внутри процесса каждого алгоритма
+    phases["prepare"] = time.perf_counter() - started
+    started = time.perf_counter()
+    if concurrent:
+        results = run_solvers_concurrently(graph, solvers, {name: timeout for name in solvers}, profile)
+    else:
+        results = {name: run_solver(solver, graph, profile) for name, solver in solvers.items()}
+    results = {**cached, **results}
+    phases["solve"] = time.perf_counter() - started
+    started = time.perf_counter()
+    
+    # Портфель возвращает раскраску вместе с нижней границей и признаком оптимальности
+    reference_proven = not use_greedy and results[algorithm_name]["status"] == "cached"
+    lower_bound = None
+    if not use_greedy and results[algorithm_name]["status"] == "ok":
+        report = results[algorithm_name]["solution"]
+        results[algorithm_name]["solution"] = report["coloring"]
+        reference_proven = report["proven"]
+        lower_bound = report["lower_bound"]
+        if not reference_proven:
+            logger.info("Оптимальность не доказана: %d цветов, нижняя граница %d",
+                        report["colors"], report["lower_bound"])
+    
+    for name, result in results.items():
+        if result["status"] == "error":
+            raise RuntimeError(f"Ошибка алгоритма {name}: {result['error']}")
+        if result["status"] == "timeout":
+            logger.warning("Алгоритм %s прерван: %s", name, result["error"])
+    
+    timings = {name: None if result["time"] is None else round(result["time"], 4)
+               for name, result in results.items()}
+    solutions = {name: result["solution"] for name, result in results.items()}
+    
+    # Проверка корректности каждого решения (один векторный проход по ребрам)
+    edges = edge_array(graph)
+    conflicts = {
+        name: None if solution is None else count_conflicts(graph, solution, edges)
+        for name, solution in solutions.items()
     }
+    for name, count in conflicts.items():
+        if count:
+            logger.warning("Алгоритм %s вернул некорректную раскраску: %d конфликтов", name, count)
     
     colors = {
-        algorithm_name: get_count_colors(exact_solution),
-        'Genetic': get_count_colors(genetic_solution),
-        'Immune': get_count_colors(immune_solution)
+        name: None if solution is None else get_count_colors(solution)
+        for name, solution in solutions.items()
     }
     
-    # Сохранение графов для каждого алгоритма
-    draw_graph(graph, exact_solution, f'{algorithm_name.lower()}_graph.png')
-    draw_graph(graph, genetic_solution, 'genetic_graph.png')
-    draw_graph(graph, immune_solution, 'immune_graph.png')
-    
-    # Добавление текущих результатов в историю
-    for algo in timings:
-        if algo not in global_history_timings:
-            global_history_timings[algo] = []
-            global_history_accuracy[algo] = []
-            global_colors_chart[algo] = []
-        
-        global_history_timings[algo].append(timings[algo])
-        global_history_accuracy[algo].append(accuracy[algo])
-        global_colors_chart[algo].append(colors[algo])
+    # Точность — относительно нижней границы хроматического числа: доказанно
+    # оптимальной раскраски эталона, границы портфеля или размера клики
+    if reference_proven and not conflicts[algorithm_name]:
+        lower_bound = colors[algorithm_name]
+    elif lower_bound is None:
+        lower_bound = clique_lower_bound(graph)
+    accuracy = {
+        name: None if solution is None
+        else solution_accuracy(colors[name], lower_bound, conflicts[name])
+        for name, solution in solutions.items()
+    }
     
-    # Добавляем количество вершин в историю
-    global_nodes_count.append(nodes_count)
+    phases["validate"] = time.perf_counter() - started
+    run_metrics = {
+        "phases": {phase: round(seconds, 6) for phase, seconds in phases.items()},
+        "solvers": {
+            name: {"status": result["status"], "time": result["time"], "cpu_time": result["cpu_time"],
+                   **(result.get("metrics") or {"counters": {}, "timers": {}}),
+                   "profile": result.get("profile")}
+            for name, result in results.items()
+        },
+    }
     
-    return timings, accuracy, colors
+    # Добавление текущих результатов в историю и в кэш решений (только корректных)
+    run_id = store.add_run(nodes_count, timings, accuracy, colors, conflicts, run_metrics)
+    for name, result in results.items():
+        if result["status"] == "ok" and conflicts[name] == 0:
+            store.save_solution(fingerprint, name, nodes, result["solution"],
+                                proven=name == algorithm_name and reference_proven)
+    
+    # Отрисовка графов для каждого алгоритма (в фоне, с общей укладкой)
+    if not renderer.submit(run_id, graph, solutions):
+        logger.info("Граф с %d вершинами слишком большой для отрисовки", nodes_count)
+    
+    return timings, accuracy, colors, run_id, conflicts
 
 @main.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         run_mode = request.form.get('run_mode', 'single')
         use_greedy = request.form.get('use_greedy') == 'true'
+        concurrent = request.form.get('concurrent') == 'true'
+        seed = request.form.get('seed', '').strip()
+        seed = int(seed) if seed else None
+        profile = request.form.get('profile') or None
+        if profile is not None and profile not in PROFILERS:
+            return "Неизвестный профилировщик", 400
         
         if use_greedy:
-            print(">>> Используется жадный алгоритм вместо точного")
+            logger.info("Используется жадный алгоритм вместо точного")
         
         if run_mode == 'single':
             # Режим одиночного запуска
-            nodes_count = int(request.form.get('nodes_count', 10))
-            print(f">>> Режим одиночного запуска с {nodes_count} вершинами")
-            timings, accuracy, colors = run_coloring_algorithms(nodes_count, use_greedy)
+            nodes_counts = [int(request.form.get('nodes_count', 10))]
+            logger.info("Режим одиночного запуска с %d вершинами", nodes_counts[0])
         else:
             # Режим с предустановленными значениями вершин
             node_presets = request.form.getlist('node_preset')
@@ -166,58 +250,151 @@ def index():
             if not node_presets:
                 node_presets = ['10', '15', '20']
                 
-            print(f">>> Режим пресетов. Выбрано {len(node_presets)} графов с вершинами: {', '.join(node_presets)}")
-            
-            # Запускаем алгоритмы для каждого выбранного количества вершин
-            latest_results = None
-            for preset in node_presets:
-                nodes_count = int(preset)
-                latest_results = run_coloring_algorithms(nodes_count, use_greedy)
-            
-            # Используем результаты последнего запуска для отображения
-            if latest_results:
-                timings, accuracy, colors = latest_results
-            else:
-                # Если что-то пошло не так, вернемся на начальную страницу
-                return render_template('index.html')
+            logger.info("Режим пресетов. Выбрано %d графов с вершинами: %s",
+                        len(node_presets), ', '.join(node_presets))
+            nodes_counts = [int(preset) for preset in node_presets]
         
-        # Генерация графиков истории с использованием количества вершин по оси X
-        history_timings_chart = generate_custom_line_chart(
-            global_history_timings, 
-            global_nodes_count, 
-            "Execution Time History", 
-            "Number of Nodes", 
-            "Time (s)"
-        )
-        history_accuracy_chart = generate_custom_line_chart(
-            global_history_accuracy, 
-            global_nodes_count, 
-            "Accuracy History", 
-            "Number of Nodes", 
-            "Accuracy (%)"
-        )
-        history_colors_chart = generate_custom_line_chart(
-            global_colors_chart, 
-            global_nodes_count, 
-            "Colors History", 
-            "Number of Nodes", 
-            "Count"
-        )
-        
-        return render_template('index.html',
-                               timings=timings,
-                               accuracy=accuracy,
-                               colors=colors,
-                               history_timings_chart=history_timings_chart,
-                               history_accuracy_chart=history_accuracy_chart,
-                               history_colors_chart=history_colors_chart)
+        # Каждый граф — отдельная подзадача, пресеты выполняются параллельно
+        tasks = [partial(run_coloring_algorithms, nodes_count, use_greedy, concurrent, seed=seed, profile=profile)
+                 for nodes_count in nodes_counts]
+        try:
+            job_id = jobs.submit(tasks)
+        except QueueFull as error:
+            return str(error), 503
+        return redirect(url_for('main.job_page', job_id=job_id))
     
     return render_template('index.html')
 
-@main.route('/graph_image/<algorithm>')
-def graph_image(algorithm):
-    image_path = os.path.join(GRAPH_DIR, f'{algorithm}_graph.png')
+def run_uploaded_graph(graph_id, use_greedy=False, concurrent=True, profile=None):
+    """Раскрашивает загруженный граф (разбор файла выполняется один раз, см. GraphLibrary)."""
+    compact = graph_library.load(graph_id)
+    return run_coloring_algorithms(compact.num_nodes, use_greedy, concurrent, graph=compact.to_networkx(),
+                                   profile=profile)
+
+@main.route('/upload', methods=['POST'])
+def upload():
+    """Загрузка графа из файла (DIMACS .col или список ребер) и постановка задачи раскраски."""
+    graph_file = request.files.get('graph_file')
+    if graph_file is None or graph_file.filename == '':
+        return "Файл графа не выбран", 400
+    use_greedy = request.form.get('use_greedy') == 'true'
+    concurrent = request.form.get('concurrent') == 'true'
+    profile = request.form.get('profile') or None
+    if profile is not None and profile not in PROFILERS:
+        return "Неизвестный профилировщик", 400
+    
+    graph_id = graph_library.save_upload(graph_file.stream)
+    logger.info("Загружен граф %s", graph_id)
+    try:
+        job_id = jobs.submit([partial(run_uploaded_graph, graph_id, use_greedy, concurrent, profile)])
+    except QueueFull as error:
+        return str(error), 503
+    return redirect(url_for('main.job_page', job_id=job_id))
+
+@main.route('/jobs/<job_id>')
+def job_page(job_id):
+    """Страница задачи: обновляется, пока задача выполняется, затем показывает результаты."""
+    job = jobs.get(job_id)
+    if job is None:
+        return "Задача не найдена (возможно, результаты уже удалены)", 404
+    
+    status = job.status
+    if status != 'done':
+        return render_template('index.html',
+                               job=job.to_dict(),
+                               job_pending=status in ('queued', 'running'))
+    
+    # Используем результаты последнего графа для отображения
+    timings, accuracy, colors, run_id, conflicts = job.results()[-1]
+    
+    # Графики истории загружаются отдельными запросами (/charts/...)
+    return render_template('index.html',
+                           timings=timings,
+                           accuracy=accuracy,
+                           colors=colors,
+                           conflicts=conflicts,
+                           run_id=run_id,
+                           graph_format=GRAPH_FORMATS[0],
+                           history_revision=store.revision())
+
+@main.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    """Состояние задачи в формате JSON (для опроса)."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"id": job_id, "status": "unknown"}), 404
+    return jsonify(job.to_dict())
+
+@main.route('/graph_image/<int:run_id>/<algorithm>.<fmt>')
+def graph_image(run_id, algorithm, fmt):
+    image_path = renderer.path(run_id, algorithm, fmt)
     # Проверка существования файла перед отправкой
-    if not os.path.exists(image_path):
-        return "Изображение недоступно (возможно, граф слишком большой)", 404
-    return send_file(image_path, mimetype='image/png')
+    if image_path is None:
+        return "Изображение недоступно (граф еще отрисовывается или слишком большой)", 404
+    mimetype = 'image/svg+xml' if fmt == 'svg' else 'image/png'
+    return send_file(image_path, mimetype=mimetype)
+
+@main.route('/charts/<metric>.png')
+def chart_image(metric):
+    """График истории показателя (PNG) с поддержкой условных запросов по ETag."""
+    try:
+        etag, image = charts.png(metric)
+    except KeyError:
+        return "Неизвестный показатель", 404
+    response = Response(image, mimetype='image/png')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@main.route('/charts/<metric>.json')
+def chart_series(metric):
+    """
+    Прореженные ряды истории показателя для построения графика на клиенте.
+    Параметр max_points ограничивает число точек каждого ряда.
+    """
+    max_points = request.args.get('max_points', 200, type=int)
+    try:
+        etag, data = charts.series(metric, max_points)
+    except KeyError:
+        return jsonify({"error": "unknown metric"}), 404
+    response = jsonify({"metric": metric, "series": data})
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@main.route('/runs/<int:run_id>/metrics')
+def run_metrics(run_id):
+    """Показатели запуска в формате JSON: время этапов, счетчики и отчеты профилировщика алгоритмов."""
+    runs = store.run_metrics(after=run_id - 1, limit=1)
+    if not runs or runs[0]["run_id"] != run_id:
+        return jsonify({"error": "unknown run"}), 404
+    return jsonify(runs[0])
+
+@main.route('/metrics')
+def metrics_feed():
+    """
+    Показатели запусков для сбора системой мониторинга (JSON).
+    Параметр after — идентификатор последнего полученного запуска, limit —
+    максимальное число запусков в ответе; last — значение after для
+    следующего запроса.
+    """
+    after = request.args.get('after', 0, type=int)
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    runs = store.run_metrics(after, limit)
+    return jsonify({"runs": runs, "last": runs[-1]["run_id"] if runs else after})
+
+@main.route('/api/batch', methods=['POST'])
+def batch_coloring():
+    """
+    Пакетная раскраска графов (JSON, см. app.batch.parse_batch).
+
+    Графы раскрашиваются на общем пуле процессов без отрисовки и сохранения
+    истории; результаты передаются потоком NDJSON — по строке на граф по мере
+    готовности.
+    """
+    try:
+        batch = parse_batch(request.get_json(silent=True))
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    lines = (json.dumps(line) + "\n" for line in iter_batch(batch))
+    return Response(lines, mimetype='application/x-ndjson')
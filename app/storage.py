@@ -0,0 +1,239 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Показатели, по которым строится история
+METRICS = ("time", "accuracy", "colors", "conflicts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    nodes_count INTEGER NOT NULL,
+    metrics TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    algorithm TEXT NOT NULL,
+    nodes_count INTEGER NOT NULL,
+    created REAL NOT NULL,
+    time REAL,
+    accuracy REAL,
+    colors INTEGER,
+    conflicts INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_algorithm_nodes_created
+    ON results (algorithm, nodes_count, created);
+CREATE TABLE IF NOT EXISTS solutions (
+    fingerprint TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    colors INTEGER NOT NULL,
+    proven INTEGER NOT NULL,
+    coloring TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (fingerprint, algorithm)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    finished REAL,
+    completed INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+
+class ResultStore:
+    """
+    Хранилище результатов запусков во встроенной базе SQLite.
+
+    Заменяет историю в памяти процесса: данные переживают перезапуск и общие
+    для всех рабочих процессов сервера (режим WAL). Каждый поток использует
+    собственное соединение. Результаты одного запуска записываются одной
+    транзакцией (executemany), история агрегируется запросами SQL, поэтому
+    объем памяти не зависит от числа накопленных запусков.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+            # Базы, созданные до появления столбца conflicts
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(results)")}
+            if "conflicts" not in columns:
+                connection.execute("ALTER TABLE results ADD COLUMN conflicts INTEGER")
+            # Базы, созданные до появления показателей запусков
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+            if "metrics" not in columns:
+                connection.execute("ALTER TABLE runs ADD COLUMN metrics TEXT")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def add_run(self, nodes_count, timings, accuracy, colors, conflicts=None, metrics=None):
+        """
+        Сохраняет результаты одного запуска.
+
+        Args:
+            nodes_count (int): Количество вершин графа.
+            timings, accuracy, colors, conflicts (dict): Показатели по именам
+                алгоритмов (None — показатель отсутствует).
+            metrics (dict, optional): Счетчики, таймеры этапов и отчеты
+                профилировщика запуска (сохраняются в JSON, см. run_metrics).
+
+        Returns:
+            int: Идентификатор запуска.
+        """
+        created = time.time()
+        conflicts = conflicts or {}
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (created, nodes_count, metrics) VALUES (?, ?, ?)",
+                (created, nodes_count, None if metrics is None else json.dumps(metrics)))
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO results (run_id, algorithm, nodes_count, created, time, accuracy, colors, conflicts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, algorithm, nodes_count, created, timings.get(algorithm),
+                  accuracy.get(algorithm), colors.get(algorithm), conflicts.get(algorithm))
+                 for algorithm in timings])
+        return run_id
+
+    def save_solution(self, fingerprint, algorithm, nodes, coloring, proven=False):
+        """
+        Сохраняет раскраску графа, если она лучше известной для этого алгоритма
+        (меньше цветов либо столько же, но с доказанной оптимальностью).
+
+        Args:
+            fingerprint (str): Отпечаток графа (graph_fingerprint).
+            algorithm (str): Имя алгоритма.
+            nodes (list): Вершины в каноническом порядке (canonical_nodes).
+            coloring (dict): Раскраска (вершина: цвет).
+            proven (bool): Доказана ли оптимальность раскраски.
+        """
+        colors = len(set(coloring.values()))
+        encoded = json.dumps([coloring[node] for node in nodes])
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO solutions (fingerprint, algorithm, colors, proven, coloring, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (fingerprint, algorithm) DO UPDATE SET "
+                "colors = excluded.colors, proven = excluded.proven, "
+                "coloring = excluded.coloring, updated = excluded.updated "
+                "WHERE excluded.colors < solutions.colors "
+                "OR (excluded.colors = solutions.colors AND excluded.proven > solutions.proven)",
+                (fingerprint, algorithm, colors, int(proven), encoded, time.time()))
+
+    def best_solution(self, fingerprint, nodes, algorithm=None):
+        """
+        Лучшая известная раскраска графа.
+
+        Args:
+            fingerprint (str): Отпечаток графа.
+            nodes (list): Вершины в каноническом порядке.
+            algorithm (str, optional): Ограничить поиск одним алгоритмом.
+
+        Returns:
+            tuple or None: Раскраска (вершина: цвет) и флаг доказанной
+                оптимальности, либо None, если раскраска неизвестна.
+        """
+        query = "SELECT coloring, proven FROM solutions WHERE fingerprint = ?"
+        args = [fingerprint]
+        if algorithm is not None:
+            query += " AND algorithm = ?"
+            args.append(algorithm)
+        row = self._connection().execute(
+            query + " ORDER BY colors, proven DESC LIMIT 1", args).fetchone()
+        if row is None:
+            return None
+        return dict(zip(nodes, json.loads(row[0]))), bool(row[1])
+
+    def run_metrics(self, after=0, limit=100):
+        """
+        Показатели запусков с идентификатором больше after (по возрастанию).
+
+        Позволяет забирать показатели инкрементально: следующий запрос
+        передает в after идентификатор последнего полученного запуска.
+
+        Args:
+            after (int): Идентификатор последнего уже полученного запуска.
+            limit (int): Максимальное число запусков.
+
+        Returns:
+            list: Словари run_id, created, nodes_count и сохраненные показатели
+                (см. add_run); запуски без показателей пропускаются.
+        """
+        rows = self._connection().execute(
+            "SELECT id, created, nodes_count, metrics FROM runs "
+            "WHERE id > ? AND metrics IS NOT NULL ORDER BY id LIMIT ?", (after, limit)).fetchall()
+        return [{"run_id": run_id, "created": created, "nodes_count": nodes_count, **json.loads(metrics)}
+                for run_id, created, nodes_count, metrics in rows]
+
+    def save_job(self, state):
+        """
+        Сохраняет состояние задачи (Job.to_dict), чтобы ее мог опросить любой
+        рабочий процесс сервера.
+
+        Более старое состояние (с меньшим числом завершенных подзадач) не
+        перезаписывает более новое: снимки пишутся из разных потоков.
+
+        Args:
+            state (dict): Состояние задачи с ключами id, created, finished,
+                completed и результатами либо ошибкой.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, created, finished, completed, state) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET finished = excluded.finished, "
+                "completed = excluded.completed, state = excluded.state "
+                "WHERE excluded.completed >= jobs.completed",
+                (state["id"], state["created"], state["finished"], state["completed"], json.dumps(state)))
+
+    def load_job(self, job_id):
+        """Сохраненное состояние задачи (см. save_job) или None."""
+        row = self._connection().execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def delete_jobs(self, before):
+        """Удаляет задачи, завершенные (или созданные, если не завершены) раньше момента before."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM jobs WHERE COALESCE(finished, created) < ?", (before,))
+
+    def revision(self):
+        """Идентификатор последнего запуска (0, если запусков не было)."""
+        row = self._connection().execute("SELECT COALESCE(MAX(id), 0) FROM runs").fetchone()
+        return row[0]
+
+    def history(self, metric):
+        """
+        Средние значения показателя по алгоритмам и количеству вершин.
+
+        Args:
+            metric (str): Один из METRICS.
+
+        Returns:
+            dict: Словарь (алгоритм: (список количеств вершин, список средних)),
+                точки упорядочены по количеству вершин.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Неизвестный показатель: {metric}")
+        rows = self._connection().execute(
+            f"SELECT algorithm, nodes_count, AVG({metric}) FROM results "
+            f"WHERE {metric} IS NOT NULL "
+            f"GROUP BY algorithm, nodes_count ORDER BY algorithm, nodes_count").fetchall()
+        series = {}
+        for algorithm, nodes_count, value in rows:
+            xs, ys = series.setdefault(algorithm, ([], []))
+            xs.append(nodes_count)
+            ys.append(value)
+        return series
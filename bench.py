@@ -0,0 +1,293 @@
+"""
+Офлайн-бенчмарк алгоритмов раскраски графов.
+
+Примеры:
+    python bench.py --families gnp --sizes 50 100 --densities 0.1 0.3 0.5
+    python bench.py --families dimacs bipartite planar --repeats 10 --json out.json --csv out.csv
+    python bench.py --import-time --import-budget-ms 100
+    python bench.py --tabucol-moves 100000 --sizes 250 1000 --densities 0.05 0.5
+"""
+import argparse
+import csv
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+from app.algorithms.compact import CompactGraph
+from app.algorithms.genetic import genetic_coloring
+from app.algorithms.greedy import best_greedy
+from app.algorithms.immune import immune_coloring
+from app.algorithms.tabucol import TabuCol
+from app.exact import count_conflicts, edge_array, exact_coloring, get_count_colors, greedy_coloring
+
+
+FAMILIES = ("gnp", "dimacs", "bipartite", "planar")
+ALGORITHMS = ("exact", "greedy", "genetic", "immune")
+
+# Путь импорта рабочих процессов решателей: без Flask и matplotlib
+SOLVER_MODULES = ("app.exact", "app.algorithms.genetic", "app.algorithms.immune", "app.portfolio")
+FORBIDDEN_MODULES = ("flask", "matplotlib")
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, *[name for name in {forbidden!r} if name in sys.modules])
+"""
+
+
+def queen_graph(size):
+    """Граф ферзей size x size (семейство queenN_N из DIMACS)."""
+    graph = nx.Graph()
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    graph.add_nodes_from(range(len(cells)))
+    for i, (r1, c1) in enumerate(cells):
+        for j in range(i + 1, len(cells)):
+            r2, c2 = cells[j]
+            if r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2):
+                graph.add_edge(i, j)
+    return graph
+
+
+def planar_graph(size, seed):
+    """Планарный граф: решетка size x size со случайными диагоналями в клетках."""
+    rng = random.Random(seed)
+    graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(size, size), ordering="sorted")
+    for row in range(size - 1):
+        for col in range(size - 1):
+            top_left = row * size + col
+            if rng.random() < 0.5:
+                graph.add_edge(top_left, top_left + size + 1)
+            else:
+                graph.add_edge(top_left + 1, top_left + size)
+    return graph
+
+
+def generate_instances(families, sizes, densities, seeds):
+    """
+    Генерирует воспроизводимый набор тестовых графов.
+
+    Returns:
+        list: Кортежи (имя экземпляра, семейство, граф).
+    """
+    instances = []
+    for family in families:
+        if family == "dimacs":
+            # mycielK из DIMACS соответствует mycielski_graph(K + 1) в NetworkX
+            for k in (3, 4, 5, 6):
+                instances.append((f"myciel{k}", family, nx.mycielski_graph(k + 1)))
+            for size in (5, 6, 7):
+                instances.append((f"queen{size}_{size}", family, queen_graph(size)))
+            continue
+        for n in sizes:
+            for seed in seeds:
+                if family == "gnp":
+                    for p in densities:
+                        instances.append((f"gnp_n{n}_p{p}_s{seed}", family, nx.gnp_random_graph(n, p, seed=seed)))
+                elif family == "bipartite":
+                    graph = nx.bipartite.random_graph(n // 2, n - n // 2, 0.3, seed=seed)
+                    instances.append((f"bipartite_n{n}_s{seed}", family, graph))
+                elif family == "planar":
+                    side = max(2, round(n ** 0.5))
+                    instances.append((f"planar_n{side * side}_s{seed}", family, planar_graph(side, seed)))
+    return instances
+
+
+def make_solver(name, exact_time_limit, generations, ga_mode="generational"):
+    """Возвращает функцию solver(graph, seed) -> раскраска для алгоритма name."""
+    if name == "exact":
+        return lambda graph, seed: exact_coloring(graph, time_limit=exact_time_limit)
+    if name == "greedy":
+        return lambda graph, seed: greedy_coloring(graph)
+    if name == "genetic":
+        return lambda graph, seed: genetic_coloring(graph, {"seed": seed, "generations": generations,
+                                                                   "mode": ga_mode})
+    if name == "immune":
+        return lambda graph, seed: immune_coloring(graph, {"seed": seed})
+    raise ValueError(f"Неизвестный алгоритм: {name}")
+
+
+def percentile(values, fraction):
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def benchmark(solver, graph, warmup, repeats):
+    """
+    Замеряет алгоритм на одном графе.
+
+    Время измеряется без tracemalloc; пиковая память — отдельным запуском
+    под tracemalloc, чтобы трассировка не искажала время. Каждая раскраска
+    проверяется на корректность (число конфликтов вне замера времени).
+    """
+    edges = edge_array(graph)
+    for seed in range(warmup):
+        solver(graph, seed)
+    times, colors, conflicts = [], [], []
+    for seed in range(repeats):
+        start = time.perf_counter()
+        coloring = solver(graph, seed)
+        times.append(time.perf_counter() - start)
+        colors.append(get_count_colors(coloring))
+        conflicts.append(count_conflicts(graph, coloring, edges))
+
+    tracemalloc.start()
+    solver(graph, 0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(times),
+        "p95_s": percentile(times, 0.95),
+        "min_s": min(times),
+        "colors_min": min(colors),
+        "colors_median": statistics.median(colors),
+        "conflicts_max": max(conflicts),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def tabucol_speed(graph, moves, seed=0):
+    """
+    Скорость локального поиска TabuCol (ходов в секунду).
+
+    Поиск ведется тремя четвертями цветов жадной раскраски: конфликты обычно
+    остаются до исчерпания бюджета moves, и замеряется сам ход, а не
+    построение начальной раскраски.
+    """
+    compact = CompactGraph.from_networkx(graph)
+    colors, _ = best_greedy(compact.adj)
+    k = max(2, (max(colors, default=0) + 1) * 3 // 4)
+    tabu = TabuCol(compact, seed=seed)
+    start = time.perf_counter()
+    _, conflicts = tabu.search(tabu.reduce(colors, k), k, moves)
+    elapsed = time.perf_counter() - start
+    return {"k": k, "moves": tabu.moves, "seconds": round(elapsed, 4),
+            "moves_per_s": round(tabu.moves / elapsed) if elapsed else None, "conflicts": conflicts}
+
+
+def import_time(module, repeats=5):
+    """
+    Время импорта модуля в свежем интерпретаторе (медиана по repeats запускам)
+    и список загруженных при этом запрещенных модулей (FORBIDDEN_MODULES).
+    """
+    times, loaded = [], set()
+    probe = _IMPORT_PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", probe], check=True,
+                                capture_output=True, text=True).stdout.split()
+        times.append(float(output[0]))
+        loaded.update(output[1:])
+    return {"module": module, "import_ms": round(statistics.median(times) * 1000, 2),
+            "forbidden": sorted(loaded)}
+
+
+def check_import_times(budget_ms=None):
+    """
+    Замеряет время импорта модулей решателей (SOLVER_MODULES).
+
+    Returns:
+        bool: True, если ни один модуль не загружает Flask или matplotlib
+            и не превышает budget_ms.
+    """
+    ok = True
+    for module in SOLVER_MODULES:
+        record = import_time(module)
+        failed = record["forbidden"] or (budget_ms is not None and record["import_ms"] > budget_ms)
+        ok = ok and not failed
+        print(f"{module:<24} import={record['import_ms']:.1f}ms "
+              f"forbidden={','.join(record['forbidden']) or '-'}{' FAIL' if failed else ''}", flush=True)
+    return ok
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк алгоритмов раскраски графов")
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=["gnp"],
+                        help="семейства графов")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[20, 50, 100],
+                        help="число вершин (для gnp, bipartite, planar)")
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.1, 0.3, 0.5],
+                        help="вероятности ребра для G(n, p)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0], help="зерна генерации графов")
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--warmup", type=int, default=1, help="число прогревочных запусков")
+    parser.add_argument("--repeats", type=int, default=5, help="число замеряемых запусков")
+    parser.add_argument("--exact-time-limit", type=float, default=10.0,
+                        help="лимит времени точного алгоритма, с")
+    parser.add_argument("--generations", type=int, default=100, help="число поколений ГА")
+    parser.add_argument("--ga-mode", choices=("generational", "steady_state"), default="generational",
+                        help="режим эволюции ГА")
+    parser.add_argument("--import-time", action="store_true",
+                        help="замерить время импорта модулей решателей вместо бенчмарка")
+    parser.add_argument("--import-budget-ms", type=float,
+                        help="допустимое время импорта модуля решателя, мс")
+    parser.add_argument("--tabucol-moves", type=int,
+                        help="замерить скорость TabuCol (ходов в секунду) с этим бюджетом ходов")
+    parser.add_argument("--json", help="файл для результатов в JSON")
+    parser.add_argument("--csv", help="файл для результатов в CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.import_time:
+        sys.exit(0 if check_import_times(args.import_budget_ms) else 1)
+    instances = generate_instances(args.families, args.sizes, args.densities, args.seeds)
+    records = []
+    for instance, family, graph in instances:
+        if args.tabucol_moves:
+            record = {"instance": instance, "family": family, "nodes": graph.number_of_nodes(),
+                      "edges": graph.number_of_edges(), "algorithm": "tabucol",
+                      **tabucol_speed(graph, args.tabucol_moves)}
+            records.append(record)
+            print(f"{instance:<24} tabucol  k={record['k']} moves={record['moves']} "
+                  f"moves/s={record['moves_per_s']} conflicts={record['conflicts']}", flush=True)
+            continue
+        for algorithm in args.algorithms:
+            solver = make_solver(algorithm, args.exact_time_limit, args.generations, args.ga_mode)
+            stats = benchmark(solver, graph, args.warmup, args.repeats)
+            record = {
+                "instance": instance,
+                "family": family,
+                "nodes": graph.number_of_nodes(),
+                "edges": graph.number_of_edges(),
+                "algorithm": algorithm,
+                "repeats": args.repeats,
+                **stats,
+            }
+            records.append(record)
+            print(f"{instance:<24} {algorithm:<8} median={record['median_s']:.4f}s "
+                  f"p95={record['p95_s']:.4f}s colors={record['colors_min']} "
+                  f"conflicts={record['conflicts_max']} "
+                  f"peak={record['peak_memory_kib']}KiB", flush=True)
+
+    if args.json:
+        meta = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "networkx": nx.__version__,
+            "timestamp": time.time(),
+            "argv": sys.argv[1:] if argv is None else list(argv),
+        }
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"meta": meta, "results": records}, file, ensure_ascii=False, indent=2)
+    if args.csv and records:
+        with open(args.csv, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+
+
+if __name__ == "__main__":
+    main()
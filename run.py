@@ -1,5 +1,9 @@
+import logging
+
 from app import create_app
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
 app = create_app()
 
 if __name__ == '__main__':
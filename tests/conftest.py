@@ -0,0 +1,35 @@
+import networkx as nx
+import pytest
+
+
+def is_proper(graph, coloring):
+    """Раскраска покрывает все вершины и концы каждого ребра (кроме петель) различны."""
+    return set(coloring) == set(graph.nodes) and all(
+        coloring[u] != coloring[v] for u, v in graph.edges if u != v)
+
+
+def small_graphs():
+    """Небольшие графы с известной структурой и случайные графы разной плотности."""
+    graphs = [
+        nx.empty_graph(0),
+        nx.empty_graph(4),
+        nx.complete_graph(5),
+        nx.cycle_graph(7),
+        nx.cycle_graph(8),
+        nx.petersen_graph(),
+        nx.wheel_graph(6),
+        nx.complete_bipartite_graph(3, 4),
+        nx.relabel_nodes(nx.cycle_graph(5), lambda v: f"v{v}"),
+    ]
+    graphs += [nx.gnp_random_graph(9, p, seed=seed) for seed in range(4) for p in (0.3, 0.6)]
+    return graphs
+
+
+@pytest.fixture(params=small_graphs(), ids=lambda graph: f"n{graph.number_of_nodes()}m{graph.number_of_edges()}")
+def small_graph(request):
+    return request.param
+
+
+@pytest.fixture
+def random_graph():
+    return nx.gnp_random_graph(60, 0.3, seed=7)
@@ -0,0 +1,84 @@
+import pytest
+
+from app.batch import (DEFAULT_SOLVERS, MAX_BATCH_EDGES, MAX_BATCH_GRAPHS, MAX_GENERATED_NODES, MAX_GRAPH_EDGES,
+                       build_graph, color_graph, parse_batch)
+from tests.conftest import is_proper
+
+
+def test_parse_batch_fills_defaults():
+    batch = parse_batch({"graphs": [{"edges": [[0, 1]]}], "solvers": ["greedy", "greedy"], "time_limit": 2})
+    assert batch["solvers"] == ["greedy"]
+    assert batch["time_limit"] == 2.0
+    assert batch["seed"] is None
+    assert batch["include_coloring"] is True
+    assert parse_batch({"graphs": [{"edges": []}]})["solvers"] == list(DEFAULT_SOLVERS)
+
+
+@pytest.mark.parametrize("payload, message", [
+    ([], "Ожидается объект JSON"),
+    ({}, "Поле graphs должно быть непустым списком"),
+    ({"graphs": []}, "Поле graphs должно быть непустым списком"),
+    ({"graphs": [{"edges": []}] * (MAX_BATCH_GRAPHS + 1)}, f"Не более {MAX_BATCH_GRAPHS} графов"),
+    ({"graphs": [[0, 1]]}, "Граф 0: ожидается объект"),
+    ({"graphs": [{"nodes": 3}]}, "Граф 0: требуется список ребер"),
+    ({"graphs": [{"edges": [[0, 1, 2]]}]}, "Граф 0: ребро задается парой вершин"),
+    ({"graphs": [{"edges": [], "nodes": MAX_GENERATED_NODES + 1}]}, "Граф 0: nodes должно быть целым"),
+    ({"graphs": [{"edges": []}, {"generator": "ba", "n": 10}]}, "Граф 1: неизвестный генератор ba"),
+    ({"graphs": [{"generator": "gnp", "n": MAX_GENERATED_NODES + 1}]}, "Граф 0: n должно быть целым"),
+    ({"graphs": [{"generator": "gnp", "n": True}]}, "Граф 0: n должно быть целым"),
+    ({"graphs": [{"generator": "gnp", "n": 10, "p": 1.5}]}, "Граф 0: p должно быть числом от 0 до 1"),
+    ({"graphs": [{"generator": "gnm", "n": 10}]}, "Граф 0: для генератора gnm требуется целое m от 0 до 45"),
+    ({"graphs": [{"generator": "gnm", "n": 10, "m": 46}]}, "Граф 0: для генератора gnm требуется целое m"),
+    ({"graphs": [{"edges": []}], "solvers": []}, "Поле solvers должно быть непустым списком"),
+    ({"graphs": [{"edges": []}], "solvers": ["greedy", "dsatur"]}, "Неизвестные алгоритмы: dsatur"),
+    ({"graphs": [{"edges": []}], "time_limit": 0}, "time_limit должно быть числом"),
+    ({"graphs": [{"edges": []}], "time_limit": 61}, "time_limit должно быть числом"),
+    ({"graphs": [{"edges": []}], "time_limit": "1"}, "time_limit должно быть числом"),
+])
+def test_parse_batch_rejects_invalid_payload(payload, message):
+    with pytest.raises(ValueError, match=message):
+        parse_batch(payload)
+
+
+def test_parse_batch_limits_edges_per_graph():
+    # Для gnp ограничение проверяется по ожидаемому числу ребер, граф не строится
+    n = MAX_GENERATED_NODES
+    with pytest.raises(ValueError, match=f"Граф 0: не более {MAX_GRAPH_EDGES} ребер"):
+        parse_batch({"graphs": [{"generator": "gnp", "n": n, "p": 0.5}]})
+    with pytest.raises(ValueError, match=f"Граф 0: не более {MAX_GRAPH_EDGES} ребер"):
+        parse_batch({"graphs": [{"generator": "gnm", "n": n, "m": MAX_GRAPH_EDGES + 1}]})
+    parse_batch({"graphs": [{"generator": "gnm", "n": n, "m": MAX_GRAPH_EDGES}]})
+
+
+def test_parse_batch_limits_edges_per_batch():
+    spec = {"generator": "gnm", "n": MAX_GENERATED_NODES, "m": MAX_GRAPH_EDGES}
+    count = MAX_BATCH_EDGES // MAX_GRAPH_EDGES
+    parse_batch({"graphs": [spec] * count})
+    with pytest.raises(ValueError, match=f"Не более {MAX_BATCH_EDGES} ребер в одном запросе"):
+        parse_batch({"graphs": [spec] * (count + 1)})
+
+
+def test_build_graph_from_edges_keeps_isolated_nodes():
+    graph = build_graph({"edges": [[0, 1], [1, 2]], "nodes": 5})
+    assert sorted(graph.nodes) == [0, 1, 2, 3, 4]
+    assert graph.number_of_edges() == 2
+    assert sorted(build_graph({"edges": [["a", "b"]], "nodes": ["c"]}).nodes) == ["a", "b", "c"]
+
+
+def test_build_graph_generators_are_seeded():
+    gnm = build_graph({"generator": "gnm", "n": 30, "m": 40, "seed": 1})
+    assert (gnm.number_of_nodes(), gnm.number_of_edges()) == (30, 40)
+    gnp = {"generator": "gnp", "n": 30, "p": 0.2, "seed": 1}
+    assert sorted(build_graph(gnp).edges) == sorted(build_graph(gnp).edges)
+
+
+def test_color_graph_reports_results():
+    spec = {"edges": [[0, 1], [1, 2], [2, 0], [2, 3]]}
+    report = color_graph(spec, ["greedy", "exact"], time_limit=1)
+    assert (report["nodes"], report["edges"], report["lower_bound"]) == (4, 4, 3)
+    for entry in report["results"].values():
+        assert entry["status"] == "ok"
+        assert (entry["colors"], entry["conflicts"], entry["accuracy"]) == (3, 0, 100)
+        assert entry["proven"]
+        assert is_proper(build_graph(spec), entry["coloring"])
+    assert "coloring" not in color_graph(spec, ["greedy"], 1, include_coloring=False)["results"]["greedy"]
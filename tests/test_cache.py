@@ -0,0 +1,37 @@
+import pytest
+
+from app.algorithms.cache import FitnessCache, chromosome_key
+from app.algorithms.genetic import GeneticAlgorithm
+
+
+def test_fitness_cache_evicts_least_recently_used():
+    cache = FitnessCache(2)
+    cache.get_or_compute(b"a", lambda: 1.0)
+    cache.get_or_compute(b"b", lambda: 2.0)
+    cache.get_or_compute(b"a", lambda: pytest.fail("значение a должно быть в кэше"))
+    cache.get_or_compute(b"c", lambda: 3.0)
+    # b использовался давнее a и вытеснен
+    assert cache.get_or_compute(b"b", lambda: -2.0) == -2.0
+    info = cache.info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 4, 2, 2)
+
+
+def test_fitness_cache_of_size_zero_stores_nothing():
+    cache = FitnessCache(0)
+    assert cache.get_or_compute(b"a", lambda: 1.0) == 1.0
+    assert cache.info().currsize == 0
+
+
+def test_chromosome_key_depends_on_order():
+    assert chromosome_key([0, 1, 2]) == chromosome_key([0, 1, 2])
+    assert chromosome_key([0, 1, 2]) != chromosome_key([2, 1, 0])
+
+
+@pytest.mark.parametrize("mode", ["generational", "steady_state"])
+def test_default_cache_holds_every_key_of_a_run(random_graph, mode):
+    ga = GeneticAlgorithm(random_graph, population_size=10, generations=20, seed=1, mode=mode,
+                          local_search_iterations=100, local_search_interval=5)
+    ga.solve()
+    info = ga.cache_info()
+    # Ничего не вытеснено: каждая различная перестановка декодирована один раз
+    assert info.currsize == info.misses <= info.maxsize
@@ -0,0 +1,40 @@
+import pickle
+
+import networkx as nx
+
+from app.algorithms.compact import CompactGraph, graph_fingerprint
+
+
+def test_compact_graph_adjacency_matches_csr():
+    graph = nx.relabel_nodes(nx.gnp_random_graph(30, 0.3, seed=2), lambda v: f"v{v}")
+    graph.add_edge("v0", "v0")
+    compact = CompactGraph.from_networkx(graph)
+    rebuilt = CompactGraph(compact.nodes, compact.indptr, compact.indices)
+    assert compact.adj == rebuilt.adj
+    assert compact.num_edges == graph.number_of_edges() - 1
+
+
+def test_compact_graph_round_trips_through_networkx():
+    graph = nx.relabel_nodes(nx.gnp_random_graph(30, 0.3, seed=2), lambda v: f"v{v}")
+    graph.add_node("isolated")
+    restored = CompactGraph.from_networkx(graph).to_networkx()
+    assert set(restored.nodes) == set(graph.nodes)
+    assert {frozenset(edge) for edge in restored.edges} == {frozenset(edge) for edge in graph.edges}
+
+
+def test_compact_graph_survives_pickling():
+    compact = CompactGraph.from_networkx(nx.cycle_graph(5))
+    restored = pickle.loads(pickle.dumps(compact))
+    assert restored.nodes == compact.nodes
+    assert restored.adj == compact.adj
+
+
+def test_graph_fingerprint_ignores_insertion_order():
+    graph = nx.gnp_random_graph(20, 0.3, seed=3)
+    shuffled = nx.Graph()
+    shuffled.add_nodes_from(reversed(list(graph.nodes)))
+    shuffled.add_edges_from((v, u) for u, v in reversed(list(graph.edges)))
+    assert graph_fingerprint(shuffled) == graph_fingerprint(graph)
+    shuffled.remove_edge(*next(iter(graph.edges)))
+    assert graph_fingerprint(shuffled) != graph_fingerprint(graph)
+    assert graph_fingerprint(nx.relabel_nodes(graph, str)) != graph_fingerprint(graph)
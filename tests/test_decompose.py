@@ -0,0 +1,39 @@
+from functools import partial
+
+import networkx as nx
+import pytest
+
+from app.decompose import decomposed_coloring, peel_low_degree, reinsert_peeled, split_components
+from app.exact import exact_search, get_count_colors, greedy_coloring
+from tests.conftest import is_proper
+
+
+def test_peeled_vertices_reinsert_without_new_colors(random_graph):
+    lower_bound = 6
+    graph = random_graph.copy()
+    # Висячий путь и треугольник гарантированно удаляются при lower_bound = 6
+    nx.add_path(graph, [0, 100, 101, 102])
+    graph.add_edges_from([(1, 103), (103, 104), (104, 1)])
+    core, removed = peel_low_degree(graph, lower_bound)
+    assert {100, 101, 102, 103, 104} <= set(removed)
+    coloring, _ = exact_search(graph.subgraph(core).copy(), time_limit=1)
+    core_colors = get_count_colors(coloring)
+    reinsert_peeled(graph, coloring, removed)
+    assert is_proper(graph, coloring)
+    assert get_count_colors(coloring) <= max(lower_bound, core_colors)
+
+
+def test_split_components_peels_before_splitting():
+    graph = nx.disjoint_union(nx.complete_graph(4), nx.path_graph(3))
+    components, removed = split_components(graph, 3)
+    assert [sorted(component) for component in components] == [[0, 1, 2, 3]]
+    assert sorted(removed) == [4, 5, 6]
+
+
+@pytest.mark.parametrize("solver", [greedy_coloring, partial(greedy_coloring, strategies=("dsatur", "rlf"))],
+                         ids=["default", "dsatur_rlf"])
+def test_decomposed_coloring_is_proper(solver):
+    # Три компоненты не меньше PARALLEL_MIN_SIZE раскрашиваются в пуле процессов
+    graph = nx.disjoint_union_all([nx.gnp_random_graph(40, 0.3, seed=seed) for seed in range(3)])
+    graph.add_edges_from([(200, 201), (201, 202)])
+    assert is_proper(graph, decomposed_coloring(graph, solver, max_workers=2))
@@ -0,0 +1,104 @@
+from itertools import product
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from app.algorithms.compact import CompactGraph
+from app.exact import (clique_lower_bound, compare_solutions, count_conflicts, edge_array, exact_coloring,
+                       exact_search, get_count_colors, greedy_coloring, solution_accuracy)
+from tests.conftest import is_proper
+
+
+def brute_force_chromatic_number(graph):
+    """Хроматическое число полным перебором раскрасок k = 1, 2, ... цветами."""
+    nodes = list(graph.nodes)
+    if not nodes:
+        return 0
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = [(index[u], index[v]) for u, v in graph.edges if u != v]
+    for k in range(1, len(nodes) + 1):
+        # Первая вершина без ограничения общности получает цвет 0
+        for rest in product(range(k), repeat=len(nodes) - 1):
+            colors = (0,) + rest
+            if all(colors[u] != colors[v] for u, v in edges):
+                return k
+    return len(nodes)
+
+
+def test_exact_search_matches_brute_force(small_graph):
+    coloring, proven = exact_search(small_graph)
+    assert proven
+    assert is_proper(small_graph, coloring)
+    assert get_count_colors(coloring) == brute_force_chromatic_number(small_graph)
+
+
+def test_exact_search_keeps_better_initial_coloring():
+    graph = nx.petersen_graph()
+    optimal, _ = exact_search(graph)
+    coloring, proven = exact_search(graph, time_limit=0, initial_coloring=optimal)
+    assert is_proper(graph, coloring)
+    assert get_count_colors(coloring) == 3
+
+
+def test_exact_coloring_returns_optimal_coloring():
+    graph = nx.cycle_graph(9)
+    coloring = exact_coloring(graph)
+    assert is_proper(graph, coloring)
+    assert get_count_colors(coloring) == 3
+
+
+def test_clique_lower_bound_is_a_lower_bound(small_graph):
+    assert clique_lower_bound(small_graph) <= brute_force_chromatic_number(small_graph)
+
+
+def test_exact_search_returns_proper_coloring_when_time_runs_out(random_graph):
+    coloring, proven = exact_search(random_graph, time_limit=0)
+    assert is_proper(random_graph, coloring)
+    assert not proven or get_count_colors(coloring) == clique_lower_bound(random_graph)
+
+
+def test_greedy_coloring_is_proper(small_graph):
+    assert is_proper(small_graph, greedy_coloring(small_graph))
+
+
+def test_edge_array_lists_each_edge_once_without_loops():
+    graph = nx.relabel_nodes(nx.gnp_random_graph(30, 0.3, seed=1), lambda v: f"v{v}")
+    graph.add_edge("v3", "v3")
+    index = {node: i for i, node in enumerate(graph.nodes)}
+    expected = sorted(tuple(sorted((index[u], index[v]))) for u, v in graph.edges if u != v)
+    edges = edge_array(graph)
+    assert edges.shape == (len(expected), 2)
+    assert np.all(edges[:, 0] < edges[:, 1])
+    assert sorted(map(tuple, edges.tolist())) == expected
+    assert np.array_equal(edge_array(CompactGraph.from_networkx(graph)), edges)
+
+
+def test_edge_array_of_graph_without_edges():
+    assert edge_array(nx.empty_graph(3)).shape == (0, 2)
+    assert edge_array(nx.Graph()).shape == (0, 2)
+
+
+def test_count_conflicts_counts_conflicting_edges_and_uncolored_nodes():
+    graph = nx.path_graph(4)
+    edges = edge_array(graph)
+    assert count_conflicts(graph, {0: 0, 1: 1, 2: 0, 3: 1}, edges) == 0
+    assert count_conflicts(graph, {0: 0, 1: 0, 2: 0, 3: 1}, edges) == 2
+    assert count_conflicts(graph, {0: 0, 1: 1, 2: 0}) == 1
+
+
+def test_compare_solutions_rejects_invalid_coloring():
+    graph = nx.cycle_graph(5)
+    exact, _ = exact_search(graph)
+    assert compare_solutions(exact, {node: node % 2 for node in graph}, graph) == 0
+    assert compare_solutions(exact, {node: node for node in graph}, graph) == 60.0
+
+
+@pytest.mark.parametrize("colors, lower_bound, conflicts, expected", [
+    (4, 4, 0, 100),
+    (5, 4, 0, 80.0),
+    (4, 4, 1, 0),
+    (0, 0, 0, 100),
+])
+def test_solution_accuracy(colors, lower_bound, conflicts, expected):
+    assert solution_accuracy(colors, lower_bound, conflicts) == expected
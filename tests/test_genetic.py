@@ -0,0 +1,125 @@
+import random
+
+import networkx as nx
+import pytest
+
+from app.algorithms.genetic import GeneticAlgorithm, genetic_coloring
+from tests.conftest import is_proper
+
+
+def reference_decode(graph, chromosome):
+    """Декодирование хромосомы по определению: проверка смежности с текущим цветовым классом."""
+    coloring, color_class, color = {}, [], 0
+    for node in chromosome:
+        if any(graph.has_edge(node, other) for other in color_class):
+            color += 1
+            color_class = []
+        coloring[node] = color
+        color_class.append(node)
+    return coloring
+
+
+@pytest.fixture
+def ga(random_graph):
+    return GeneticAlgorithm(random_graph, population_size=10, generations=5, seed=1)
+
+
+@pytest.fixture
+def chromosomes(ga):
+    rng = random.Random(3)
+    shuffled = [rng.sample(ga.nodes, len(ga.nodes)) for _ in range(10)]
+    return ga.initial_population() + shuffled
+
+
+def test_decode_chromosome_matches_reference(ga, random_graph, chromosomes):
+    for chromosome in chromosomes:
+        assert ga.decode_chromosome(chromosome) == reference_decode(random_graph, chromosome)
+
+
+def test_count_colors_matches_decode_chromosome(ga, chromosomes):
+    for chromosome in chromosomes:
+        decoded = ga.decode_chromosome(chromosome)
+        assert ga.count_colors(chromosome) == len(set(decoded.values()))
+    assert ga.count_colors([]) == 0
+
+
+def test_decoded_chromosomes_are_proper(ga, random_graph):
+    population = ga.initial_population()
+    for _ in range(3):
+        population = ga.evolve(population)
+    for chromosome in population:
+        assert is_proper(random_graph, ga.decode_chromosome(chromosome))
+
+
+def test_genetic_coloring_is_reproducible(random_graph):
+    params = {"generations": 10, "population_size": 10, "seed": 5}
+    assert genetic_coloring(random_graph, params) == genetic_coloring(random_graph, params)
+
+
+def test_genetic_algorithm_stops_at_lower_bound():
+    graph = nx.complete_bipartite_graph(10, 10)
+    ga = GeneticAlgorithm(graph, population_size=10, generations=100, seed=1, lower_bound=2)
+    coloring = ga.solve()
+    assert len(set(coloring.values())) == 2
+    assert ga.stop_reason == "lower_bound"
+
+
+def test_genetic_algorithm_stops_on_stagnation(random_graph):
+    ga = GeneticAlgorithm(random_graph, population_size=10, generations=1000, seed=1, patience=3)
+    states = list(ga.run())
+    assert ga.stop_reason == "stagnation"
+    assert len(states) < 1000
+    assert all(later.best_colors <= earlier.best_colors for earlier, later in zip(states, states[1:]))
+
+
+def test_progress_callback_cancels_search(random_graph):
+    ga = GeneticAlgorithm(random_graph, population_size=10, generations=100, seed=1)
+    seen = []
+    coloring = ga.solve(lambda state: seen.append(state.generation) or len(seen) < 3)
+    assert seen == [0, 1, 2]
+    assert ga.stop_reason == "cancelled"
+    assert is_proper(random_graph, coloring)
+
+
+def test_steady_state_keeps_elite_and_evaluates_offspring_once(random_graph):
+    ga = GeneticAlgorithm(random_graph, population_size=10, generations=20, seed=2, mode="steady_state",
+                          offspring=4)
+    population = ga.initial_population()
+    fitnesses = [ga.fitness(chromosome) for chromosome in population]
+    for _ in range(20):
+        best = min(fitnesses)
+        misses = ga.cache.misses
+        population, fitnesses = ga.evolve_steady(population, fitnesses)
+        assert len(population) == 10
+        assert min(fitnesses) <= best
+        assert fitnesses == [ga.fitness(chromosome) for chromosome in population]
+        # Не больше двух декодирований на потомка: до и после мутации
+        assert ga.cache.misses - misses <= 2 * ga.offspring
+    assert is_proper(random_graph, ga.decode_chromosome(population[0]))
+
+
+def test_steady_state_coloring_is_proper(random_graph):
+    coloring = genetic_coloring(random_graph, {"generations": 10, "population_size": 10, "seed": 1,
+                                               "mode": "steady_state"})
+    assert is_proper(random_graph, coloring)
+
+
+def test_unknown_mode_is_rejected(random_graph):
+    with pytest.raises(ValueError, match="Неизвестный режим"):
+        GeneticAlgorithm(random_graph, population_size=10, generations=1, mode="unknown")
+
+
+def test_memetic_step_reduces_colors(random_graph):
+    ga = GeneticAlgorithm(random_graph, population_size=10, generations=1, seed=3, local_search_iterations=2000)
+    chromosome = ga.initial_population()[0]
+    refined = ga.memetic_step(chromosome)
+    assert ga.count_colors(refined) < ga.count_colors(chromosome)
+    assert is_proper(random_graph, ga.decode_chromosome(refined))
+
+
+@pytest.mark.parametrize("params", [{"local_search_iterations": 0}, {"local_search_iterations": 200,
+                                                                     "local_search_interval": 2}],
+                         ids=["plain", "memetic"])
+def test_genetic_coloring_with_local_search_is_proper(random_graph, params):
+    coloring = genetic_coloring(random_graph, {"generations": 6, "population_size": 10, "seed": 1, **params})
+    assert is_proper(random_graph, coloring)
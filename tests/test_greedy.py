@@ -0,0 +1,55 @@
+import random
+
+import networkx as nx
+import pytest
+
+from app.algorithms.compact import CompactGraph
+from app.algorithms.greedy import (STRATEGIES, best_greedy, dsatur, first_fit, iterated_greedy,
+                                   largest_first_order, rlf, smallest_last_order)
+
+
+def is_proper_colors(adj, colors):
+    return all(colors[v] >= 0 and colors[u] != colors[v] for v, neighbors in enumerate(adj) for u in neighbors)
+
+
+@pytest.fixture
+def adj():
+    return CompactGraph.from_networkx(nx.gnp_random_graph(80, 0.2, seed=3)).adj
+
+
+@pytest.mark.parametrize("build", [
+    lambda adj: first_fit(adj, largest_first_order(adj)),
+    lambda adj: first_fit(adj, smallest_last_order(adj)),
+    dsatur,
+    rlf,
+], ids=STRATEGIES)
+def test_strategies_are_proper(adj, build):
+    assert is_proper_colors(adj, build(adj))
+
+
+def test_smallest_last_order_uses_at_most_degeneracy_plus_one_colors(adj):
+    graph = nx.Graph((v, u) for v, neighbors in enumerate(adj) for u in neighbors)
+    degeneracy = max(nx.core_number(graph).values())
+    assert max(first_fit(adj, smallest_last_order(adj))) + 1 <= degeneracy + 1
+
+
+def test_iterated_greedy_never_adds_colors(adj):
+    colors = first_fit(adj, range(len(adj)))
+    improved = iterated_greedy(adj, colors, 30, random.Random(1))
+    assert is_proper_colors(adj, improved)
+    assert max(improved) <= max(colors)
+
+
+def test_best_greedy_returns_best_strategy(adj):
+    colors, strategy = best_greedy(adj, STRATEGIES, restarts=10, seed=1)
+    assert is_proper_colors(adj, colors)
+    assert strategy in STRATEGIES + ("restarts",)
+    for single in STRATEGIES:
+        assert max(colors) <= max(best_greedy(adj, (single,))[0])
+
+
+def test_best_greedy_rejects_unknown_or_empty_strategies(adj):
+    with pytest.raises(ValueError):
+        best_greedy(adj, ("largest_first", "unknown"))
+    with pytest.raises(ValueError):
+        best_greedy(adj, ())
@@ -0,0 +1,23 @@
+import pytest
+
+from app.algorithms.immune import immune_coloring
+from app.exact import exact_search, get_count_colors
+from tests.conftest import is_proper
+
+
+@pytest.mark.parametrize("params", [{}, {"local_search_iterations": 0}], ids=["memetic", "plain"])
+def test_immune_coloring_is_proper(random_graph, params):
+    coloring = immune_coloring(random_graph, {"generations": 10, "seed": 1, **params})
+    assert is_proper(random_graph, coloring)
+
+
+def test_immune_coloring_does_not_worsen_initial_coloring(random_graph):
+    initial, _ = exact_search(random_graph, time_limit=0.5)
+    coloring = immune_coloring(random_graph, {"generations": 5, "seed": 1, "initial_coloring": initial})
+    assert is_proper(random_graph, coloring)
+    assert get_count_colors(coloring) <= get_count_colors(initial)
+
+
+def test_immune_coloring_is_reproducible(random_graph):
+    params = {"generations": 5, "seed": 4}
+    assert immune_coloring(random_graph, params) == immune_coloring(random_graph, params)
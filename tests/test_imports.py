@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import bench
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("flask", "matplotlib", "networkx")
+# Бюджет импорта модуля решателя: с запасом выше текущих 20-60 мс, но меньше
+# импорта networkx или Flask (около 200 мс), который бюджет и должен поймать
+IMPORT_BUDGET_MS = 200
+
+_PROBE = """
+import json, sys
+{statements}
+print(json.dumps([name for name in {modules!r} if name in sys.modules]))
+"""
+
+
+def loaded_after(statements, cwd=ROOT):
+    """Тяжелые модули, загруженные в чистом интерпретаторе после выполнения statements."""
+    env = {**os.environ, "PYTHONPATH": ROOT, "GAAAIS_DB": os.path.join(str(cwd), "results.db")}
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(statements=statements, modules=HEAVY_MODULES)],
+                            cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("module", [
+    "app",
+    "app.exact",
+    "app.decompose",
+    "app.portfolio",
+    "app.parallel",
+    "app.batch",
+    "app.charts",
+    "app.rendering",
+    "app.algorithms.genetic",
+    "app.algorithms.immune",
+    "app.algorithms.tabucol",
+])
+def test_import_does_not_load_heavy_modules(module):
+    assert loaded_after(f"import {module}") == []
+
+
+def test_networkx_is_loaded_on_first_use():
+    assert loaded_after("from app.exact import greedy_coloring\n"
+                        "import networkx\n"
+                        "greedy_coloring(networkx.path_graph(3))") == ["networkx"]
+
+
+def test_create_app_loads_flask_but_not_matplotlib(tmp_path):
+    loaded = loaded_after("from app import create_app\ncreate_app()", cwd=tmp_path)
+    assert "flask" in loaded
+    assert "matplotlib" not in loaded
+
+
+@pytest.mark.parametrize("module", ["app.algorithms", *bench.SOLVER_MODULES])
+def test_solver_import_fits_time_budget(module, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", ROOT)
+    record = bench.import_time(module, repeats=3)
+    assert record["forbidden"] == []
+    assert record["import_ms"] < IMPORT_BUDGET_MS
@@ -0,0 +1,64 @@
+import io
+import os
+
+import pytest
+
+from app.ingest import GraphLibrary, parse_graph_file
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def edges(compact):
+    return {frozenset((compact.nodes[v], compact.nodes[u]))
+            for v, neighbors in enumerate(compact.adj) for u in neighbors}
+
+
+def test_dimacs_keeps_isolated_vertices_and_drops_loops_and_duplicates(tmp_path):
+    path = write(tmp_path, "graph.col", "c пример\np edge 5 4\ne 1 2\ne 2 3\ne 3 2\ne 4 4\n")
+    compact = parse_graph_file(path)
+    assert compact.nodes == [1, 2, 3, 4, 5]
+    assert edges(compact) == {frozenset((1, 2)), frozenset((2, 3))}
+    assert compact.num_edges == 2
+
+
+def test_edge_list_with_comments_weights_and_labels(tmp_path):
+    path = write(tmp_path, "graph.txt", "# список ребер\n% еще комментарий\na b 1.5\nb c\n\nc a 2\n")
+    compact = parse_graph_file(path)
+    assert sorted(compact.nodes) == ["a", "b", "c"]
+    assert edges(compact) == {frozenset("ab"), frozenset("bc"), frozenset("ca")}
+
+
+def test_empty_file(tmp_path):
+    compact = parse_graph_file(write(tmp_path, "empty.txt", ""))
+    assert compact.num_nodes == 0
+    assert compact.num_edges == 0
+
+
+@pytest.mark.parametrize("text, line", [("1 2\n3\n", 2), ("p edge\n", 1)], ids=["edge", "header"])
+def test_malformed_line_is_reported(tmp_path, text, line):
+    with pytest.raises(ValueError, match=f"Строка {line}"):
+        parse_graph_file(write(tmp_path, "bad.txt", text))
+
+
+def test_parsed_graph_round_trips_through_networkx(tmp_path):
+    compact = parse_graph_file(write(tmp_path, "graph.txt", "1 2\n2 3\n3 1\n3 4\n"))
+    graph = compact.to_networkx()
+    assert sorted(graph.nodes) == [1, 2, 3, 4]
+    assert graph.number_of_edges() == 4
+
+
+def test_library_deduplicates_uploads_and_caches_parsed_graph(tmp_path):
+    library = GraphLibrary(str(tmp_path / "uploads"))
+    digest = library.save_upload(io.BytesIO(b"1 2\n2 3\n"))
+    assert library.save_upload(io.BytesIO(b"1 2\n2 3\n")) == digest
+    assert library.load(digest).num_edges == 2
+    # Повторная загрузка читает разобранный граф, не исходный файл
+    os.remove(os.path.join(library.directory, f"{digest}.txt"))
+    assert library.load(digest).nodes == [1, 2, 3]
+    assert sorted(os.listdir(library.directory)) == [f"{digest}.graph"]
+    with pytest.raises(KeyError):
+        library.load("0" * 64)
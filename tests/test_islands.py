@@ -0,0 +1,25 @@
+import networkx as nx
+import pytest
+
+from app.algorithms.genetic import genetic_coloring
+from tests.conftest import is_proper
+
+ISLANDS = {"islands": 2, "migration_interval": 5, "workers": 2, "generations": 10, "population_size": 10}
+
+
+def test_island_coloring_is_proper(random_graph):
+    coloring = genetic_coloring(random_graph, {**ISLANDS, "seed": 1})
+    assert is_proper(random_graph, coloring)
+
+
+def test_island_coloring_with_local_search_is_reproducible():
+    # На этом графе TabuCol улучшает раскраску, поэтому результат зависит от его зерна
+    graph = nx.gnp_random_graph(50, 0.5, seed=3)
+    params = {**ISLANDS, "seed": 3, "local_search_iterations": 200, "local_search_interval": 5}
+    runs = [genetic_coloring(graph, params) for _ in range(3)]
+    assert runs[1] == runs[0] and runs[2] == runs[0]
+
+
+def test_island_coloring_rejects_other_engines(random_graph):
+    with pytest.raises(RuntimeError, match="не поддерживает движок"):
+        genetic_coloring(random_graph, {"islands": 2, "engine": "numpy"})
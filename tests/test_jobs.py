@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from app.jobs import JobQueue
+from app.storage import ResultStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.db"))
+
+
+def wait(queue, job_id, timeout=10):
+    """Ждет завершения задачи (состояние сохраняется в обратных вызовах после future.result)."""
+    deadline = time.monotonic() + timeout
+    while queue.get(job_id).status in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_job_state_is_visible_to_another_worker(store):
+    # Две очереди с общим хранилищем моделируют два рабочих процесса сервера
+    owner, other = JobQueue(max_workers=2, store=store), JobQueue(max_workers=1, store=store)
+    job_id = owner.submit([lambda: ({"Exact": 0.5}, 1), lambda: ({"Exact": 0.25}, 2)])
+    wait(other, job_id)
+    job = other.get(job_id)
+    assert job.status == "done"
+    assert job.results() == [[{"Exact": 0.5}, 1], [{"Exact": 0.25}, 2]]
+    assert job.to_dict()["completed"] == 2
+
+
+def test_running_job_is_visible_to_another_worker(store):
+    owner, other = JobQueue(max_workers=1, store=store), JobQueue(store=store)
+    started, release = threading.Event(), threading.Event()
+
+    def task():
+        started.set()
+        release.wait(10)
+        return 1
+
+    job_id = owner.submit([task])
+    started.wait(10)
+    assert other.get(job_id).status == "running"
+    release.set()
+    wait(other, job_id)
+    assert other.get(job_id).to_dict()["results"] == [1]
+
+
+def test_failed_job_error_is_stored(store):
+    def task():
+        raise ValueError("нет решения")
+
+    owner, other = JobQueue(store=store), JobQueue(store=store)
+    job_id = owner.submit([task])
+    wait(other, job_id)
+    state = other.get(job_id).to_dict()
+    assert (state["status"], state["error"]) == ("failed", "нет решения")
+
+
+def test_job_without_store_is_local():
+    owner, other = JobQueue(), JobQueue()
+    job_id = owner.submit([lambda: 1])
+    wait(owner, job_id)
+    assert other.get(job_id) is None
+
+
+def test_stale_job_state_does_not_overwrite_newer(store):
+    state = {"id": "a", "created": 1.0, "finished": None, "completed": 1, "total": 2, "status": "running"}
+    store.save_job(state)
+    store.save_job({**state, "completed": 0, "status": "queued"})
+    assert store.load_job("a")["status"] == "running"
+    store.delete_jobs(before=2.0)
+    assert store.load_job("a") is None
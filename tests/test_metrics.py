@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from app import metrics
+from app.algorithms.genetic import genetic_coloring
+from app.parallel import run_solver
+
+
+def test_collect_gathers_counters_and_phases():
+    metrics.count("ignored")
+    with metrics.collect() as collected:
+        metrics.count("steps", 2)
+        metrics.count("steps")
+        with metrics.phase("solve"):
+            pass
+        with metrics.collect() as inner:
+            metrics.count("inner")
+        assert metrics.current() is collected
+    assert metrics.current() is None
+    data = collected.to_dict()
+    assert data["counters"] == {"steps": 3}
+    assert set(data["timers"]) == {"solve"}
+    assert inner.to_dict()["counters"] == {"inner": 1}
+
+
+@pytest.mark.parametrize("kind, key", [("cprofile", "functions"), ("tracemalloc", "allocations")])
+def test_profile_reports(kind, key):
+    report = {}
+    with metrics.profile(kind, report):
+        sum(list(range(10000)))
+    assert report["kind"] == kind
+    assert report[key]
+
+
+def test_profile_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Неизвестный профилировщик"):
+        with metrics.profile("perf", {}):
+            pass
+
+
+def test_busy_profiler_runs_block_unprofiled():
+    entered, release = threading.Event(), threading.Event()
+
+    def hold():
+        with metrics.profile("cprofile", {}):
+            entered.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait(10)
+    report, ran = {}, False
+    try:
+        with metrics.profile("cprofile", report):
+            ran = True
+    finally:
+        release.set()
+        holder.join()
+    assert ran
+    assert report["kind"] == "cprofile" and "error" in report
+
+
+def test_run_solver_returns_solver_metrics(random_graph):
+    result = run_solver(lambda graph: genetic_coloring(graph, {"generations": 3, "population_size": 6, "seed": 1}),
+                        random_graph, profile="cprofile")
+    assert result["status"] == "ok"
+    assert result["metrics"]["counters"]["genetic.generations"] == 3
+    assert "genetic.evolution" in result["metrics"]["timers"]
+    assert result["profile"]["kind"] == "cprofile"
@@ -0,0 +1,40 @@
+import networkx as nx
+import pytest
+
+from app.exact import exact_search, get_count_colors
+from app.portfolio import portfolio_search
+from tests.conftest import is_proper
+
+
+def test_portfolio_search_reports_bounds(random_graph):
+    report = portfolio_search(random_graph, time_limit=2, seed=1)
+    assert is_proper(random_graph, report["coloring"])
+    assert report["colors"] == get_count_colors(report["coloring"])
+    assert report["gap"] == report["colors"] - report["lower_bound"] >= 0
+    assert report["proven"] == (report["gap"] == 0)
+    assert report["stages"][0]["solver"] == "greedy"
+
+
+def test_portfolio_search_decomposes_components():
+    dense = nx.gnp_random_graph(30, 0.3, seed=1)
+    optimal, proven = exact_search(dense)
+    assert proven
+    graph = nx.disjoint_union_all([nx.complete_graph(5), dense, nx.path_graph(10), nx.cycle_graph(7)])
+    report = portfolio_search(graph, time_limit=2, seed=1)
+    assert is_proper(graph, report["coloring"])
+    assert report["colors"] == max(5, get_count_colors(optimal))
+    assert report["proven"]
+
+
+def test_portfolio_search_returns_best_coloring_when_budget_is_spent():
+    graph = nx.gnp_random_graph(120, 0.5, seed=2)
+    report = portfolio_search(graph, time_limit=0.05, seed=2)
+    assert is_proper(graph, report["coloring"])
+    assert report["gap"] == report["colors"] - report["lower_bound"]
+
+
+@pytest.mark.parametrize("graph", [nx.Graph(), nx.empty_graph(3), nx.path_graph(6)], ids=["empty", "isolated", "path"])
+def test_portfolio_search_trivial_graphs(graph):
+    report = portfolio_search(graph, time_limit=1)
+    assert is_proper(graph, report["coloring"])
+    assert report["proven"]
@@ -0,0 +1,40 @@
+import importlib
+import os
+
+import pytest
+
+from app.storage import ResultStore
+
+
+@pytest.fixture(scope="module")
+def routes(tmp_path_factory):
+    # При импорте app.routes создает базу и каталоги в текущем каталоге
+    directory = tmp_path_factory.mktemp("app")
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setenv("GAAAIS_DB", str(directory / "results.db"))
+            return importlib.import_module("app.routes")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def store(routes, tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.db"))
+    monkeypatch.setattr(routes, "store", store)
+    monkeypatch.setattr(routes.renderer, "submit", lambda run_id, graph, solutions: True)
+    return store
+
+
+def test_cached_exact_solution_is_not_timed(routes, store):
+    first, _, colors, _, _ = routes.run_coloring_algorithms(8, concurrent=False, seed=1)
+    second, accuracy, cached_colors, _, conflicts = routes.run_coloring_algorithms(8, concurrent=False, seed=1)
+    assert second["Exact"] is None
+    assert (cached_colors["Exact"], conflicts["Exact"], accuracy["Exact"]) == (colors["Exact"], 0, 100)
+    # Запуск из кэша не занижает среднее время точного алгоритма
+    assert store.history("time")["Exact"] == ([8], [first["Exact"]])
+    assert store.history("colors")["Exact"] == ([8], [colors["Exact"]])
+    metrics = store.run_metrics()[-1]["solvers"]["Exact"]
+    assert (metrics["status"], metrics["time"]) == ("cached", None)
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+from app.storage import ResultStore
+
+# Схема до появления столбцов results.conflicts и runs.metrics
+_OLD_SCHEMA = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    nodes_count INTEGER NOT NULL
+);
+CREATE TABLE results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    algorithm TEXT NOT NULL,
+    nodes_count INTEGER NOT NULL,
+    created REAL NOT NULL,
+    time REAL,
+    accuracy REAL,
+    colors INTEGER
+);
+INSERT INTO runs (created, nodes_count) VALUES (1.0, 10);
+INSERT INTO results VALUES (1, 'Genetic', 10, 1.0, 0.5, 75.0, 4);
+"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.db"))
+
+
+def test_history_averages_by_algorithm_and_nodes(store):
+    store.add_run(10, {"Exact": 0.1, "Genetic": 0.4}, {"Exact": 100, "Genetic": 75}, {"Exact": 3, "Genetic": 4})
+    store.add_run(10, {"Exact": 0.3, "Genetic": None}, {"Exact": 100, "Genetic": 100}, {"Exact": 3, "Genetic": 3})
+    store.add_run(5, {"Exact": 0.2}, {"Exact": 100}, {"Exact": 2})
+    assert store.history("colors") == {"Exact": ([5, 10], [2.0, 3.0]), "Genetic": ([10], [3.5])}
+    # Отсутствующие значения не участвуют в среднем
+    assert store.history("time")["Genetic"] == ([10], [0.4])
+    assert store.revision() == 3
+
+
+def test_migration_is_idempotent(tmp_path):
+    path = str(tmp_path / "results.db")
+    ResultStore(path).add_run(5, {"Exact": 0.1}, {"Exact": 100}, {"Exact": 2})
+    store = ResultStore(path)
+    assert store.revision() == 1
+    assert store.history("accuracy") == {"Exact": ([5], [100.0])}
+
+
+def test_best_solution_prefers_fewer_colors_then_proven(store):
+    nodes = [0, 1, 2]
+    store.save_solution("abc", "Genetic", nodes, {0: 0, 1: 1, 2: 2})
+    store.save_solution("abc", "Genetic", nodes, {0: 0, 1: 1, 2: 0})
+    store.save_solution("abc", "Genetic", nodes, {0: 0, 1: 1, 2: 2})
+    assert store.best_solution("abc", nodes) == ({0: 0, 1: 1, 2: 0}, False)
+    store.save_solution("abc", "Exact", nodes, {0: 1, 1: 0, 2: 1}, proven=True)
+    assert store.best_solution("abc", nodes) == ({0: 1, 1: 0, 2: 1}, True)
+    assert store.best_solution("abc", nodes, "Genetic") == ({0: 0, 1: 1, 2: 0}, False)
+    assert store.best_solution("missing", nodes) is None
+
+
+def test_database_without_conflicts_is_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as connection:
+        connection.executescript(_OLD_SCHEMA)
+    store = ResultStore(path)
+    # Старые данные сохраняются, у старых запусков число конфликтов неизвестно
+    assert store.history("colors") == {"Genetic": ([10], [4.0])}
+    assert store.history("conflicts") == {}
+    store.add_run(10, {"Genetic": 0.2}, {"Genetic": 0}, {"Genetic": 3}, {"Genetic": 2})
+    assert store.history("conflicts") == {"Genetic": ([10], [2.0])}
+    assert store.history("accuracy") == {"Genetic": ([10], [37.5])}
+
+
+def test_run_metrics_are_paginated(store):
+    for nodes_count in range(5):
+        store.add_run(nodes_count, {"Exact": 0.1}, {"Exact": 100}, {"Exact": 1}, {"Exact": 0},
+                      {"phases": {"solve": 0.1}, "solvers": {}})
+    store.add_run(9, {"Exact": 0.1}, {"Exact": 100}, {"Exact": 1})
+    first = store.run_metrics(limit=3)
+    assert [run["run_id"] for run in first] == [1, 2, 3]
+    assert first[0]["phases"] == {"solve": 0.1}
+    # Запуски без показателей пропускаются
+    assert [run["run_id"] for run in store.run_metrics(after=first[-1]["run_id"])] == [4, 5]
+    assert store.revision() == 6
+
+
+def test_database_without_run_metrics_is_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as connection:
+        connection.executescript(_OLD_SCHEMA)
+    store = ResultStore(path)
+    assert store.run_metrics() == []
+    run_id = store.add_run(10, {"Genetic": 0.2}, {"Genetic": 100}, {"Genetic": 3}, {"Genetic": 0},
+                           {"phases": {"solve": 0.2}})
+    assert run_id == 2
+    [run] = store.run_metrics()
+    assert (run["run_id"], run["nodes_count"], run["phases"]) == (2, 10, {"solve": 0.2})
+
+
+def test_history_rejects_unknown_metric(store):
+    with pytest.raises(ValueError):
+        store.history("unknown")
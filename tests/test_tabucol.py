@@ -0,0 +1,55 @@
+import networkx as nx
+import pytest
+
+from app.algorithms.compact import CompactGraph
+from app.algorithms.greedy import best_greedy
+from app.algorithms.tabucol import TabuCol
+from tests.conftest import is_proper
+
+
+def count_conflicts(compact, colors):
+    return sum(colors[u] == colors[v] for v, neighbors in enumerate(compact.adj) for u in neighbors if u > v)
+
+
+def test_tabucol_minimize_keeps_coloring_proper(random_graph):
+    compact = CompactGraph.from_networkx(random_graph)
+    colors, _ = best_greedy(compact.adj)
+    improved = TabuCol(compact, seed=1).minimize(colors, max_iterations=2000)
+    assert is_proper(random_graph, compact.to_labels(improved))
+    assert max(improved) <= max(colors)
+
+
+@pytest.mark.parametrize("tenure", [1, 10, 1000], ids=["short", "default", "all_tabu"])
+def test_tabucol_search_reports_conflicts(random_graph, tenure):
+    compact = CompactGraph.from_networkx(random_graph)
+    colors, _ = best_greedy(compact.adj)
+    k = max(colors) - 1
+    tabu = TabuCol(compact, seed=1, tenure=tenure)
+    found, conflicts = tabu.search(tabu.reduce(colors, k), k, 500)
+    assert max(found) < k
+    assert conflicts == count_conflicts(compact, found)
+    assert 0 < tabu.moves <= 500
+
+
+def test_tabucol_search_keeps_best_coloring_when_conflicts_remain():
+    # K5 тремя цветами: не меньше двух конфликтных ребер при любой раскраске
+    compact = CompactGraph.from_networkx(nx.complete_graph(5))
+    found, conflicts = TabuCol(compact, seed=2).search([0, 0, 0, 1, 2], 3, 200)
+    assert conflicts == count_conflicts(compact, found) == 2
+
+
+@pytest.mark.parametrize("k", [1, 2])
+def test_tabucol_search_with_too_few_colors(k):
+    compact = CompactGraph.from_networkx(nx.path_graph(4))
+    tabu = TabuCol(compact, seed=3)
+    found, conflicts = tabu.search([0] * 4, k, 100)
+    assert conflicts == count_conflicts(compact, found) == (3 if k == 1 else 0)
+
+
+def test_tabucol_search_stops_at_deadline():
+    graph = nx.gnp_random_graph(200, 0.5, seed=4)
+    compact = CompactGraph.from_networkx(graph)
+    colors, _ = best_greedy(compact.adj)
+    tabu = TabuCol(compact, seed=4)
+    tabu.search(tabu.reduce(colors, max(colors) // 2), max(colors) // 2, 10 ** 9, deadline=0)
+    assert tabu.moves == 0
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.algorithms.genetic import genetic_coloring
+from app.algorithms.vectorized import VectorizedGeneticAlgorithm
+from tests.conftest import is_proper
+
+
+@pytest.fixture
+def vga(random_graph):
+    return VectorizedGeneticAlgorithm(random_graph, population_size=12, generations=1, seed=2)
+
+
+def is_permutation_batch(population, n):
+    return bool(np.all(np.sort(population, axis=1) == np.arange(n)))
+
+
+def test_count_colors_batch_matches_count_colors(vga):
+    population = np.vstack([vga.initial_population_array(),
+                            np.random.default_rng(1).permuted(np.tile(np.arange(vga.num_nodes), (8, 1)), axis=1)])
+    nodes = vga.compact.nodes
+    expected = [vga.count_colors([nodes[i] for i in row]) for row in population]
+    assert vga.count_colors_batch(population).tolist() == expected
+
+
+def test_crossover_and_mutation_keep_permutations(vga):
+    population = vga.initial_population_array()
+    first, second = vga.selection_batch(vga.count_colors_batch(population), len(population))
+    children = vga.crossover_batch(population[first], population[second])
+    assert is_permutation_batch(children, vga.num_nodes)
+    vga.mutate_batch(children, np.ones(len(children)))
+    assert is_permutation_batch(children, vga.num_nodes)
+
+
+def test_numpy_engine_is_proper(random_graph):
+    coloring = genetic_coloring(random_graph, {"engine": "numpy", "generations": 10, "population_size": 10,
+                                               "seed": 1})
+    assert is_proper(random_graph, coloring)
+
+
+def test_unknown_engine_is_rejected(random_graph):
+    with pytest.raises(RuntimeError, match="Неизвестный движок"):
+        genetic_coloring(random_graph, {"engine": "gpu", "generations": 1})